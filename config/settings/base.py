@@ -119,6 +119,7 @@ DJANGO_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -354,3 +355,28 @@ FEEDBACK_URL = env(
     "FEEDBACK_URL",
     default="https://github.com/MilBia/Suchar-Overflow/issues/new",
 )
+
+# ACHIEVEMENTS
+# ------------------------------------------------------------------------------
+# When enabled, achievement checks are queued on commit and evaluated by the
+# run_achievement_worker command instead of inside the triggering request.
+ACHIEVEMENTS_ASYNC = env.bool("DJANGO_ACHIEVEMENTS_ASYNC", default=False)
+# Seconds a queued check waits for further events from the same user, which
+# are folded into it instead of being evaluated separately.
+ACHIEVEMENTS_COALESCE_WINDOW = env.float(
+    "DJANGO_ACHIEVEMENTS_COALESCE_WINDOW",
+    default=2.0,
+)
+# Record per-rule wall time and query counts of the achievement engine,
+# exposed at /api/achievements/metrics and by diagnose_achievements --stats.
+ACHIEVEMENTS_INSTRUMENTATION = env.bool(
+    "DJANGO_ACHIEVEMENTS_INSTRUMENTATION",
+    default=True,
+)
+
+# SUCHARY
+# ------------------------------------------------------------------------------
+# When enabled, votes are still written in the request, but the suchary's vote
+# tallies are counted in Redis and written to the database in batches by the
+# scheduler (suchary/vote_buffer.py). Requires the Redis cache.
+SUCHARY_VOTE_BUFFER = env.bool("DJANGO_SUCHARY_VOTE_BUFFER", default=False)
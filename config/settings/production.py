@@ -141,3 +141,8 @@ LOGGING = {
 # ------------------------------------------------------------------------------
 COMPRESS_ENABLED = True
 COMPRESS_OFFLINE = True
+
+# ACHIEVEMENTS
+# ------------------------------------------------------------------------------
+# Served by the achievement-worker service in docker-compose.production.yml.
+ACHIEVEMENTS_ASYNC = env.bool("DJANGO_ACHIEVEMENTS_ASYNC", default=True)
@@ -2,11 +2,15 @@ from django import forms
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
+from django.utils.translation import gettext_lazy as _
 from modeltranslation.admin import TabbedTranslationAdmin
 
+from .backfill import backfill_achievements
 from .models import Achievement
+from .models import AchievementCheck
 from .models import SchedulerRun
 from .models import UserAchievement
+from .models import UserMetrics
 
 
 class AchievementAdminForm(forms.ModelForm):
@@ -55,6 +59,7 @@ class AchievementAdmin(TabbedTranslationAdmin):
     )
     list_filter = ("tier", "theme", "category", "event_type", "metric", "is_secret")
     search_fields = ("name", "slug", "description", "theme")
+    actions = ("award_to_qualifying_users",)
 
     fieldsets = (
         (
@@ -87,6 +92,15 @@ class AchievementAdmin(TabbedTranslationAdmin):
             )
         return "-"
 
+    @admin.action(description=_("Award to users who already qualify"))
+    def award_to_qualifying_users(self, request, queryset):
+        awarded = backfill_achievements(queryset)
+        self.message_user(
+            request,
+            _("Awarded %(count)d achievements to users who already qualified.")
+            % {"count": sum(awarded.values())},
+        )
+
     def save_model(self, request, obj, form, change):
         if not change and form.cleaned_data.get("generate_tiers"):
             thresholds_str = form.cleaned_data.get("tier_thresholds", "")
@@ -142,6 +156,44 @@ class UserAchievementAdmin(admin.ModelAdmin):
     readonly_fields = ("awarded_at",)
 
 
+@admin.register(UserMetrics)
+class UserMetricsAdmin(admin.ModelAdmin):
+    list_display = (
+        "user",
+        "suchar_count",
+        "vote_cast_count",
+        "funny_received",
+        "dry_received",
+    )
+    search_fields = ("user__username",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AchievementCheck)
+class AchievementCheckAdmin(admin.ModelAdmin):
+    list_display = (
+        "user",
+        "event_type",
+        "created_at",
+        "not_before",
+        "coalesced_count",
+        "attempts",
+    )
+    list_filter = ("event_type",)
+    search_fields = ("user__username",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(SchedulerRun)
 class SchedulerRunAdmin(admin.ModelAdmin):
     list_display = ("job_id", "ran_at")
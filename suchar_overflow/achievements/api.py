@@ -1,10 +1,15 @@
 from django.core.cache import cache
+from django.http import HttpResponse
 from django.utils.translation import gettext as _
 from ninja import Router
 from ninja import Schema
 from ninja.errors import HttpError
 from ninja.security import django_auth
 
+from suchar_overflow import conditional
+
+from . import instrumentation
+from .catalog import get_catalog
 from .models import Achievement
 from .models import UserAchievement
 
@@ -67,10 +72,12 @@ def list_unseen_achievements(request):
 
 @router.post("/mark-seen", auth=django_auth)
 def mark_achievements_seen(request):
-    UserAchievement.objects.filter(
+    seen = UserAchievement.objects.filter(
         user=request.user,
         is_seen=False,
     ).update(is_seen=True)
+    if seen:
+        conditional.touch_user(request.user.pk)
     return {"ok": True}
 
 
@@ -89,10 +96,9 @@ def record_frontend_event(request, payload: FrontendEventSchema):
     if payload.event_slug not in VALID_FRONTEND_SLUGS:
         raise HttpError(400, "Invalid achievement slug")
 
-    try:
-        achievement = Achievement.objects.get(slug=payload.event_slug)
-    except Achievement.DoesNotExist as exc:
-        raise HttpError(404, "Achievement not found") from exc
+    achievement = get_catalog().by_slug.get(payload.event_slug)
+    if achievement is None:
+        raise HttpError(404, "Achievement not found")
 
     already_owned = UserAchievement.objects.filter(
         user=request.user,
@@ -105,3 +111,14 @@ def record_frontend_event(request, payload: FrontendEventSchema):
         cache.set(cache_key, value=True, timeout=30 * 24 * 60 * 60)
 
     return {"ok": True}
+
+
+@router.get("/metrics", auth=django_auth, include_in_schema=False)
+def rule_metrics(request):
+    """Per-rule engine histograms in the Prometheus text format (staff only)."""
+    if not request.user.is_staff:
+        raise HttpError(403, "Staff only")
+    return HttpResponse(
+        instrumentation.render_prometheus(instrumentation.snapshot()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,8 +1,11 @@
+import functools
 import logging
 import sys
 import threading
 
 from django.apps import AppConfig
+from django.db import close_old_connections
+from django.db import connection
 from django.utils.translation import gettext_lazy as _
 
 logger = logging.getLogger(__name__)
@@ -16,10 +19,32 @@ _NO_SCHEDULER = frozenset(
         "check",
         "shell",
         "createsuperuser",
+        # Dedicated worker process; the web process owns the scheduler.
+        "run_achievement_worker",
+        "benchmark_achievements",
     },
 )
 
 
+def with_fresh_connections(job):
+    """Wrap a scheduled ``job`` in ``close_old_connections()``, as Django
+    wraps each request, so a connection the database dropped or one past
+    ``CONN_MAX_AGE`` isn't reused by the scheduler thread forever.
+    """
+
+    @functools.wraps(job)
+    def run(*args, **kwargs):
+        if not connection.in_atomic_block:
+            close_old_connections()
+        try:
+            return job(*args, **kwargs)
+        finally:
+            if not connection.in_atomic_block:
+                close_old_connections()
+
+    return run
+
+
 class AchievementsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "suchar_overflow.achievements"
@@ -94,6 +119,8 @@ class AchievementsConfig(AppConfig):
         from apscheduler.schedulers.background import BackgroundScheduler
 
         from suchar_overflow.achievements.tasks import award_best_suchar
+        from suchar_overflow.suchary import timeline
+        from suchar_overflow.suchary import vote_buffer
 
         # A transient failure here (e.g. a DB hiccup during startup) must not
         # prevent the recurring job below from being registered.
@@ -120,4 +147,23 @@ class AchievementsConfig(AppConfig):
             minute=5,
             id="award-best-suchar-month",
         )
+        # Warms the suchar list when scheduled suchary go public.
+        scheduler.add_job(
+            with_fresh_connections(timeline.tick),
+            "interval",
+            seconds=timeline.TICK_SECONDS,
+            id="suchary-publication-tick",
+            coalesce=True,
+            max_instances=1,
+        )
+        # Writes the vote tallies buffered in Redis (vote_buffer.py).
+        if vote_buffer.enabled():
+            scheduler.add_job(
+                with_fresh_connections(vote_buffer.flush),
+                "interval",
+                seconds=vote_buffer.FLUSH_INTERVAL,
+                id="suchary-vote-flush",
+                coalesce=True,
+                max_instances=1,
+            )
         scheduler.start()
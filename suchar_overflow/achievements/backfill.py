@@ -0,0 +1,89 @@
+"""Retroactive awarding of achievements to every user who already qualifies.
+
+The engine only looks at one user at a time, on that user's next event, so a
+newly added achievement (or tier ladder) would otherwise stay unawarded until
+each user happens to act again. Here each metric is evaluated for all users
+at once through its rule's ``values_by_user`` — one grouped query per metric,
+however many tiers share it — and the missing ``UserAchievement`` rows are
+inserted in chunks.
+"""
+
+from collections import defaultdict
+from itertools import batched
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+
+from suchar_overflow import conditional
+
+from . import targets
+from .engine import PENDING_FLAG_TIMEOUT
+from .engine import AchievementEngine
+from .models import Achievement
+from .models import UserAchievement
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def backfill_achievements(
+    achievements: Iterable[Achievement],
+    *,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """Award ``achievements`` to every qualifying user who lacks them.
+
+    Returns ``{slug: users awarded}``. Periodic achievements and metrics with
+    no rule behind them (frontend events) are skipped and left out of the
+    result. With ``dry_run`` the counts are reported but nothing is written.
+    """
+    by_metric: dict[str, list[Achievement]] = defaultdict(list)
+    for achievement in achievements:
+        if (
+            achievement.category != Achievement.Category.PERIODIC
+            and AchievementEngine.rule_for(achievement.metric) is not None
+        ):
+            by_metric[achievement.metric].append(achievement)
+
+    awarded: dict[str, int] = {}
+    awarded_users: set[int] = set()
+    for metric, tiers in by_metric.items():
+        rule_cls = AchievementEngine.rule_for(metric)
+        lowest = min(achievement.threshold for achievement in tiers)
+        values = dict(rule_cls.values_by_user(lowest))
+
+        existing = set(
+            UserAchievement.objects.filter(achievement__in=tiers).values_list(
+                "achievement_id",
+                "user_id",
+            ),
+        )
+        new_awards = []
+        for achievement in tiers:
+            qualifying = [
+                user_id
+                for user_id, value in values.items()
+                if value >= achievement.threshold
+                and (achievement.id, user_id) not in existing
+            ]
+            awarded[achievement.slug] = len(qualifying)
+            awarded_users.update(qualifying)
+            new_awards.extend(
+                UserAchievement(user_id=user_id, achievement=achievement)
+                for user_id in qualifying
+            )
+
+        if not dry_run:
+            for chunk in batched(new_awards, batch_size, strict=False):
+                UserAchievement.objects.bulk_create(chunk, ignore_conflicts=True)
+
+    if awarded_users and not dry_run:
+        cache.set_many(
+            {f"achievements_pending:{user_id}": True for user_id in awarded_users},
+            timeout=PENDING_FLAG_TIMEOUT,
+        )
+        targets.invalidate_many(awarded_users)
+        conditional.touch_users(awarded_users)
+
+    return awarded
@@ -0,0 +1,331 @@
+"""Synthetic-data benchmark of the achievement engine.
+
+Each scale seeds users, suchary and votes whose activity follows a power law
+(a few prolific authors and voters, a long tail of occasional ones), then
+times ``check_achievements`` for every event type, ``compute`` of every rule
+and the backfill path, counting SQL queries alongside the wall time. All of
+it runs inside a transaction that is rolled back, so the database is left as
+it was, against a private in-memory cache, so the awards and list versions
+of the synthetic users never reach the shared one.
+
+Results are plain JSON (see ``run``) and ``compare`` diffs two of them, so an
+engine change can be judged against the numbers of the commit before it.
+Driven by ``manage.py benchmark_achievements``.
+"""
+
+import datetime
+import random
+import statistics
+import time
+import uuid
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from itertools import batched
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db import transaction
+from django.db.models import F
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from suchar_overflow.suchary import tallies
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Vote
+
+from .backfill import backfill_achievements
+from .engine import AchievementEngine
+from .instrumentation import QueryCounter
+from .metrics import rebuild_user_metrics
+from .models import Achievement
+
+User = get_user_model()
+
+# Vote counts seeded per scale, by default all three.
+SCALES = (1_000, 100_000, 1_000_000)
+BATCH_SIZE = 10_000
+# Exponent of the Zipf-like activity weights: 1 / rank ** s.
+POWER_LAW_EXPONENT = 1.1
+VOTES_PER_USER = 50
+VOTES_PER_SUCHAR = 10
+
+
+@dataclass
+class Dataset:
+    user_ids: list[int]
+    suchar_ids: list[int]
+    vote_ids: array
+
+
+def _power_law_weights(count: int) -> list[float]:
+    return [1 / (rank + 1) ** POWER_LAW_EXPONENT for rank in range(count)]
+
+
+def seed(votes: int, rng: random.Random) -> Dataset:
+    """Insert a synthetic population holding ``votes`` votes.
+
+    Rows are bulk inserted, bypassing the signals, so the per-suchar tallies
+    and the users' metrics are recomputed from the tables afterwards.
+    """
+    token = uuid.uuid4().hex[:8]
+    user_count = max(20, votes // VOTES_PER_USER)
+    suchar_count = max(50, votes // VOTES_PER_SUCHAR)
+
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"bench-{token}-{index}",
+                email=f"bench-{token}-{index}@example.com",
+                password="!",  # noqa: S106
+            )
+            for index in range(user_count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    user_ids = [user.pk for user in users]
+    user_weights = _power_law_weights(user_count)
+
+    now = timezone.now()
+    authors = rng.choices(user_ids, weights=user_weights, k=suchar_count)
+    suchar_ids = []
+    for chunk in batched(authors, BATCH_SIZE, strict=False):
+        created = Suchar.objects.bulk_create(
+            [
+                Suchar(
+                    text="Benchmark suchar",
+                    author_id=author_id,
+                    published_at=now
+                    - datetime.timedelta(minutes=rng.randrange(365 * 24 * 60)),
+                )
+                for author_id in chunk
+            ],
+        )
+        suchar_ids.extend(suchar.pk for suchar in created)
+    # auto_now_add overrode created_at; spread it like the publication dates.
+    Suchar.objects.filter(pk__in=suchar_ids).update(created_at=F("published_at"))
+
+    suchar_weights = _power_law_weights(suchar_count)
+    seen: set[tuple[int, int]] = set()
+    vote_ids = array("q")
+    while len(seen) < votes:
+        wanted = min(BATCH_SIZE, votes - len(seen))
+        voters = rng.choices(user_ids, weights=user_weights, k=wanted)
+        targets = rng.choices(suchar_ids, weights=suchar_weights, k=wanted)
+        batch = []
+        for voter_id, suchar_id in zip(voters, targets, strict=True):
+            if (voter_id, suchar_id) in seen:
+                continue
+            seen.add((voter_id, suchar_id))
+            roll = rng.random()
+            batch.append(
+                Vote(
+                    user_id=voter_id,
+                    suchar_id=suchar_id,
+                    is_funny=roll < 0.7,  # noqa: PLR2004
+                    is_dry=roll >= 0.6,  # noqa: PLR2004
+                ),
+            )
+        vote_ids.extend(vote.pk for vote in Vote.objects.bulk_create(batch))
+
+    tallies.recount(Suchar.objects.filter(pk__in=suchar_ids))
+    for chunk in batched(user_ids, BATCH_SIZE, strict=False):
+        rebuild_user_metrics(list(chunk))
+    return Dataset(user_ids, suchar_ids, vote_ids)
+
+
+def _summary(durations: list[float], queries: list[int]) -> dict:
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, len(ordered) * 95 // 100)]
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "mean_queries": round(statistics.fmean(queries), 2),
+    }
+
+
+@contextmanager
+def _measure(durations: list[float], queries: list[int]):
+    counter = QueryCounter()
+    start = time.perf_counter()
+    with connection.execute_wrapper(counter):
+        yield
+    durations.append(time.perf_counter() - start)
+    queries.append(counter.queries)
+
+
+def _time_calls(calls) -> dict:
+    durations: list[float] = []
+    queries: list[int] = []
+    for call in calls:
+        with _measure(durations, queries):
+            call()
+    return _summary(durations, queries)
+
+
+def _sample_votes(dataset: Dataset, samples: int, rng: random.Random) -> list[Vote]:
+    picked = rng.sample(list(dataset.vote_ids), min(samples, len(dataset.vote_ids)))
+    return list(
+        Vote.objects.filter(pk__in=picked).select_related("user", "suchar__author"),
+    )
+
+
+def _sample_suchary(dataset, samples, rng) -> list[Suchar]:
+    picked = rng.sample(dataset.suchar_ids, min(samples, len(dataset.suchar_ids)))
+    return list(Suchar.objects.filter(pk__in=picked).select_related("author"))
+
+
+def _time_events(votes, suchary) -> dict:
+    """Time the engine per event type, after one warm-up pass.
+
+    The warm-up grants whatever the seeded state already qualifies for and
+    fills the per-user target index, so the timed pass measures the steady
+    state a live event sees.
+    """
+    calls = {
+        Achievement.EventType.SUCHAR_POSTED: [
+            (suchar.author, suchar) for suchar in suchary
+        ],
+        Achievement.EventType.VOTE_CAST: [(vote.user, vote) for vote in votes],
+        Achievement.EventType.VOTE_RECEIVED: [
+            (vote.suchar.author, vote) for vote in votes
+        ],
+        Achievement.EventType.FRONTEND: [(vote.user, None) for vote in votes],
+    }
+    results = {}
+    for event_type, pairs in calls.items():
+        for user, instance in pairs:
+            AchievementEngine.check_achievements(user, event_type, instance)
+        results[event_type] = _time_calls(
+            partial(AchievementEngine.check_achievements, user, event_type, instance)
+            for user, instance in pairs
+        )
+    return results
+
+
+def _time_rules(votes) -> dict:
+    AchievementEngine.register_rules()
+    authors = [vote.suchar.author for vote in votes]
+    return {
+        rule_cls.__name__: _time_calls(
+            partial(rule_cls.compute, user) for user in authors
+        )
+        for rule_cls in sorted(
+            AchievementEngine._rules.values(),  # noqa: SLF001
+            key=lambda rule_cls: rule_cls.__name__,
+        )
+    }
+
+
+def _consume(values_by_user, min_value) -> None:
+    for _ in values_by_user(min_value):
+        pass
+
+
+def _time_backfill() -> dict:
+    achievements = list(Achievement.objects.order_by("metric", "threshold"))
+    metrics = sorted({achievement.metric for achievement in achievements})
+    per_metric = {}
+    for metric in metrics:
+        rule_cls = AchievementEngine.rule_for(metric)
+        if rule_cls is None:
+            continue
+        lowest = min(a.threshold for a in achievements if a.metric == metric)
+        per_metric[metric] = _time_calls(
+            [partial(_consume, rule_cls.values_by_user, lowest)],
+        )
+    return {
+        "backfill_achievements": _time_calls(
+            [partial(backfill_achievements, achievements, dry_run=True)],
+        ),
+        "values_by_user": per_metric,
+    }
+
+
+def _private_caches() -> dict:
+    """A fresh locmem cache, so the cache writes of a run die with it."""
+    return {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": f"achievements-benchmark-{uuid.uuid4().hex}",
+        },
+    }
+
+
+def run_scale(votes: int, *, samples: int, seed_value: int) -> dict:
+    """Seed ``votes`` votes, time everything and roll the data back."""
+    rng = random.Random(seed_value)  # noqa: S311
+    result: dict = {}
+    with (
+        override_settings(CACHES=_private_caches(), SUCHARY_VOTE_BUFFER=False),
+        transaction.atomic(),
+    ):
+        start = time.perf_counter()
+        dataset = seed(votes, rng)
+        result["dataset"] = {
+            "users": len(dataset.user_ids),
+            "suchary": len(dataset.suchar_ids),
+            "votes": len(dataset.vote_ids),
+            "seed_seconds": round(time.perf_counter() - start, 2),
+        }
+        sampled_votes = _sample_votes(dataset, samples, rng)
+        sampled_suchary = _sample_suchary(dataset, samples, rng)
+        result["check_achievements"] = _time_events(sampled_votes, sampled_suchary)
+        result["rules"] = _time_rules(sampled_votes)
+        result["backfill"] = _time_backfill()
+        transaction.set_rollback(True)
+    return result
+
+
+def run(scales=SCALES, *, samples: int = 200, seed_value: int = 0, label: str = ""):
+    """Benchmark every scale and return the JSON-serialisable results."""
+    # Keep the synthetic runs out of the production rule histograms.
+    with override_settings(ACHIEVEMENTS_INSTRUMENTATION=False):
+        return {
+            "meta": {
+                "label": label,
+                "created_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "samples": samples,
+                "seed": seed_value,
+            },
+            "scales": {
+                str(votes): run_scale(votes, samples=samples, seed_value=seed_value)
+                for votes in scales
+            },
+        }
+
+
+def _flatten(results: dict) -> dict[str, float]:
+    flat = {}
+
+    def walk(prefix, node):
+        if "mean_ms" in node:
+            flat[prefix] = node["mean_ms"]
+            return
+        for key, value in node.items():
+            if isinstance(value, dict):
+                walk(f"{prefix}/{key}" if prefix else key, value)
+
+    for votes, scale in results["scales"].items():
+        for section in ("check_achievements", "rules", "backfill"):
+            walk(f"{votes}/{section}", scale.get(section, {}))
+    return flat
+
+
+def compare(baseline: dict, current: dict) -> list[tuple[str, float, float, float]]:
+    """Return ``(timing, baseline ms, current ms, relative change)`` for every
+    mean timing present in both results, worst regressions first.
+    """
+    before = _flatten(baseline)
+    after = _flatten(current)
+    rows = [
+        (key, before[key], after[key], (after[key] - before[key]) / before[key])
+        for key in before.keys() & after.keys()
+        if before[key] > 0
+    ]
+    return sorted(rows, key=lambda row: row[3], reverse=True)
@@ -0,0 +1,125 @@
+"""Per-process, versioned snapshot of the Achievement table.
+
+The catalog only changes when an admin edits it, yet every engine run,
+achievement page and frontend event used to query it. Each process keeps an
+indexed copy and revalidates it against a version key in the shared cache —
+one cache GET, no SQL. Saving or deleting an Achievement bumps the key (see
+``signals.py``), so every worker reloads on its next access.
+"""
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from modeltranslation.utils import build_localized_fieldname
+
+from .models import Achievement
+
+VERSION_KEY = "achievements:catalog_version"
+
+
+def _series_key(achievement: Achievement) -> tuple[str, str]:
+    # Keyed by the default-language theme so the grouping doesn't depend on
+    # whichever language happened to be active when the catalog was loaded.
+    theme_field = build_localized_fieldname(
+        "theme",
+        settings.MODELTRANSLATION_DEFAULT_LANGUAGE,
+    )
+    return getattr(achievement, theme_field) or achievement.theme, achievement.metric
+
+
+@dataclass(frozen=True)
+class AchievementCatalog:
+    version: str
+    # Ordered by (theme, tier, id).
+    achievements: tuple[Achievement, ...]
+    by_slug: dict[str, Achievement]
+    by_event_type: dict[str, tuple[Achievement, ...]]
+    by_metric: dict[str, tuple[Achievement, ...]]
+    # Tiered themed series, keyed by (theme, metric), each ordered by tier.
+    series: dict[tuple[str, str], tuple[Achievement, ...]]
+
+    @classmethod
+    def build(cls, version: str, achievements: list[Achievement]):
+        by_event_type = defaultdict(list)
+        by_metric = defaultdict(list)
+        series = defaultdict(list)
+        for achievement in achievements:
+            by_event_type[achievement.event_type].append(achievement)
+            by_metric[achievement.metric].append(achievement)
+            if achievement.theme and achievement.tier != Achievement.Tier.NONE:
+                series[_series_key(achievement)].append(achievement)
+        return cls(
+            version=version,
+            achievements=tuple(achievements),
+            by_slug={achievement.slug: achievement for achievement in achievements},
+            by_event_type={key: tuple(v) for key, v in by_event_type.items()},
+            by_metric={key: tuple(v) for key, v in by_metric.items()},
+            series={key: tuple(v) for key, v in series.items()},
+        )
+
+    def for_event(self, event_type: str) -> tuple[Achievement, ...]:
+        """Achievements the engine may award automatically for ``event_type``."""
+        return tuple(
+            achievement
+            for achievement in self.by_event_type.get(event_type, ())
+            if achievement.category != Achievement.Category.PERIODIC
+        )
+
+
+_catalog: AchievementCatalog | None = None
+
+
+def _queryset():
+    return Achievement.objects.order_by("theme", "tier", "id")
+
+
+def get_catalog() -> AchievementCatalog:
+    global _catalog  # noqa: PLW0603
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # First access since the cache was flushed: claim a fresh version so
+        # every process drops whatever it had loaded before.
+        version = uuid.uuid4().hex
+        if not cache.add(VERSION_KEY, version, timeout=None):
+            version = cache.get(VERSION_KEY) or version
+    catalog = _catalog
+    if catalog is None or catalog.version != version:
+        catalog = AchievementCatalog.build(version, list(_queryset()))
+        _catalog = catalog
+    return catalog
+
+
+async def aget_catalog() -> AchievementCatalog:
+    global _catalog  # noqa: PLW0603
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not await cache.aadd(VERSION_KEY, version, timeout=None):
+            version = await cache.aget(VERSION_KEY) or version
+    catalog = _catalog
+    if catalog is None or catalog.version != version:
+        catalog = AchievementCatalog.build(
+            version,
+            [achievement async for achievement in _queryset()],
+        )
+        _catalog = catalog
+    return catalog
+
+
+def invalidate() -> None:
+    """Make every process reload the catalog on its next access.
+
+    Bumped immediately so this process (still inside the admin's transaction)
+    sees its own change, and again on commit so a worker that reloaded in
+    between — and could only see the old rows — reloads once more.
+    """
+
+    def _bump():
+        cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+    _bump()
+    transaction.on_commit(_bump)
@@ -1,144 +1,141 @@
+from collections import defaultdict
+
 from django.core.cache import cache
-from django.db.models import Case
-from django.db.models import Count
 from django.db.models import F
-from django.db.models import IntegerField
-from django.db.models import Q
-from django.db.models import Sum
-from django.db.models import When
-from django.db.models.functions import ExtractHour
-from django.utils import timezone
 
+from suchar_overflow import conditional
 from suchar_overflow.suchary.models import Suchar
-from suchar_overflow.suchary.models import Vote
 
+from . import instrumentation
+from . import targets
+from .catalog import aget_catalog
+from .catalog import get_catalog
+from .metrics import aget_metrics
+from .metrics import get_metrics
+from .metrics import is_night_post
 from .models import Achievement
 from .models import UserAchievement
+from .models import UserMetrics
+
+# How long the "new achievement" flag waits for the user's next page load.
+PENDING_FLAG_TIMEOUT = 60 * 60 * 24 * 30
 
 
 class AchievementRule:
     metric: Achievement.Metric | None = None
+    # UserMetrics attribute holding this metric's value, for rules backed by
+    # an incremental counter. The engine reads these straight off one
+    # metrics row instead of calling compute() per rule.
+    counter: str | None = None
 
     @classmethod
-    def evaluate(cls, user, threshold, instance=None):
-        raise NotImplementedError
+    def applies(cls, user, instance=None):
+        """Whether this event can unlock anything for the metric at all,
+        whatever the threshold (e.g. not a Night Owl check on a daytime post).
+        """
+        return True
 
+    @classmethod
+    def compute(cls, user, instance=None):
+        """Return the user's current value for this metric, or ``None`` if
+        the event doesn't apply to it (see ``applies``).
+        """
+        if cls.counter is None:
+            raise NotImplementedError
+        if not cls.applies(user, instance):
+            return None
+        return getattr(get_metrics(user), cls.counter)
 
-class SucharCountRule(AchievementRule):
-    metric = Achievement.Metric.COUNT_SUCHAR
+    @classmethod
+    async def acompute(cls, user, instance=None):
+        """Async ``compute``, on the async ORM."""
+        if cls.counter is None:
+            raise NotImplementedError
+        if not cls.applies(user, instance):
+            return None
+        return getattr(await aget_metrics(user), cls.counter)
 
     @classmethod
     def evaluate(cls, user, threshold, instance=None):
-        return user.suchary.count() >= threshold
+        value = cls.compute(user, instance)
+        return value is not None and value >= threshold
+
+    @classmethod
+    def values_by_user(cls, min_value):
+        """Yield ``(user_id, value)`` for every user whose value is at least
+        ``min_value``, computed for all users at once (see ``backfill.py``).
+        """
+        if cls.counter is None:
+            raise NotImplementedError
+        return (
+            UserMetrics.objects.annotate(value=F(cls.counter))
+            .filter(value__gte=min_value)
+            .values_list("user_id", "value")
+            .iterator()
+        )
+
+
+class SucharCountRule(AchievementRule):
+    metric = Achievement.Metric.COUNT_SUCHAR
+    counter = "suchar_count"
 
 
 class VoteFunnyCountRule(AchievementRule):
     metric = Achievement.Metric.COUNT_VOTE_FUNNY
-
-    @classmethod
-    def evaluate(cls, user, threshold, instance=None):
-        return user.suchar_votes.filter(is_funny=True).count() >= threshold
+    counter = "vote_funny_count"
 
 
 class VoteDryCountRule(AchievementRule):
     metric = Achievement.Metric.COUNT_VOTE_DRY
-
-    @classmethod
-    def evaluate(cls, user, threshold, instance=None):
-        return user.suchar_votes.filter(is_dry=True).count() >= threshold
+    counter = "vote_dry_count"
 
 
 class VoteCastCountRule(AchievementRule):
     metric = Achievement.Metric.COUNT_VOTE_CAST
-
-    @classmethod
-    def evaluate(cls, user, threshold, instance=None):
-        return user.suchar_votes.count() >= threshold
+    counter = "vote_cast_count"
 
 
 class SumScoreRule(AchievementRule):
     metric = Achievement.Metric.SUM_SCORE
+    counter = "score_received"
 
     @classmethod
-    def evaluate(cls, user, threshold, instance=None):
-        total_score = (
-            Vote.objects.filter(suchar__author=user).aggregate(
-                score=Sum(
-                    Case(
-                        When(is_funny=True, then=1),
-                        When(is_dry=True, then=-1),
-                        default=0,
-                        output_field=IntegerField(),
-                    ),
-                ),
-            )["score"]
-            or 0
+    def values_by_user(cls, min_value):
+        # score_received is a property, not a column.
+        return (
+            UserMetrics.objects.annotate(value=F("funny_received") - F("dry_received"))
+            .filter(value__gte=min_value)
+            .values_list("user_id", "value")
+            .iterator()
         )
-        return total_score >= threshold
 
 
 class NightOwlRule(AchievementRule):
     metric = Achievement.Metric.NIGHT_OWL
+    counter = "night_suchar_count"
 
     @classmethod
-    def evaluate(cls, user, threshold, instance=None):
-        if not (isinstance(instance, Suchar) and instance.author == user):
-            return False
-        hour = instance.created_at.astimezone(timezone.get_current_timezone()).hour
-        max_night_hour = 4
-        if not (0 <= hour <= max_night_hour):
-            return False
-        tz = timezone.get_current_timezone()
-        night_count = (
-            Suchar.objects.filter(author=user)
-            .annotate(local_hour=ExtractHour("created_at", tzinfo=tz))
-            .filter(local_hour__lte=max_night_hour)
-            .count()
+    def applies(cls, user, instance=None):
+        # Only the user's own night post can unlock Night Owl.
+        return (
+            isinstance(instance, Suchar)
+            and instance.author_id == user.pk
+            and is_night_post(instance)
         )
-        return night_count >= threshold
 
 
 class PolarizerRule(AchievementRule):
     metric = Achievement.Metric.POLARIZER
-
-    @classmethod
-    def evaluate(cls, user, threshold, instance=None):
-        return (
-            Suchar.objects.filter(author=user)
-            .annotate(
-                funny_count=Count("votes", filter=Q(votes__is_funny=True)),
-                dry_count=Count("votes", filter=Q(votes__is_dry=True)),
-            )
-            .filter(funny_count=F("dry_count"), funny_count__gte=threshold)
-            .exists()
-        )
+    # The best balance any of the user's suchary reached, recorded at vote
+    # time (metrics.record_balance): a queued or coalesced check runs after
+    # later votes that may have broken it again.
+    counter = "balanced_best"
 
 
 class StreakLoginRule(AchievementRule):
     metric = Achievement.Metric.STREAK_LOGIN
-
-    @classmethod
-    def evaluate(cls, user, threshold, instance=None):
-        # .dates() truncates to day in the DB and returns distinct date objects,
-        # avoiding loading every suchar datetime into Python memory.
-        dates = set(
-            Suchar.objects.filter(author=user).dates("created_at", "day"),
-        )
-
-        if not dates:
-            return False
-
-        sorted_dates = sorted(dates, reverse=True)
-        streak = 1
-        for i in range(len(sorted_dates) - 1):
-            if (sorted_dates[i] - sorted_dates[i + 1]).days == 1:
-                streak += 1
-                if streak >= threshold:
-                    return True
-            else:
-                break
-
-        return streak >= threshold
+    # Maintained per new suchar by metrics.record_active_day.
+    counter = "streak_current"
 
 
 class AchievementEngine:
@@ -151,36 +148,168 @@ class AchievementEngine:
                 if rule_cls.metric:
                     cls._rules[rule_cls.metric] = rule_cls
 
+    @classmethod
+    def rule_for(cls, metric) -> type[AchievementRule] | None:
+        cls.register_rules()
+        return cls._rules.get(metric)
+
+    @staticmethod
+    def _candidates_by_metric(catalog, event_type):
+        by_metric: dict[str, list[Achievement]] = defaultdict(list)
+        for achievement in catalog.for_event(event_type):
+            by_metric[achievement.metric].append(achievement)
+        return by_metric
+
+    @staticmethod
+    def _reachable(achievements, value, target, probe):
+        """The ``achievements`` a metric at ``value`` unlocks, recording the
+        outcome on the instrumentation ``probe``.
+        """
+        if value is None:
+            return []
+        if value < target:
+            probe.outcome = instrumentation.NOT_YET
+            return []
+        probe.outcome = instrumentation.AWARDED
+        return [
+            achievement
+            for achievement in achievements
+            if value >= achievement.threshold
+        ]
+
     @staticmethod
     def check_achievements(user, event_type, instance=None):
         """
         Checks and awards achievements for a given user and event type.
+
+        Candidates are grouped by metric so each metric is computed once per
+        event, however many tiers share it. A metric whose value is still
+        below the user's next unmet threshold (see ``targets.py``) is dropped
+        right there; only when one can actually fire are the user's existing
+        awards loaded, and all new awards are written in a single INSERT.
+        Each metric's evaluation is timed per rule (see ``instrumentation.py``).
         """
         AchievementEngine.register_rules()
 
-        existing_ids = UserAchievement.objects.filter(user=user).values_list(
-            "achievement_id",
-            flat=True,
+        catalog = get_catalog()
+        by_metric = AchievementEngine._candidates_by_metric(catalog, event_type)
+        if not by_metric:
+            return
+
+        next_target = targets.next_targets(user, catalog)
+        metrics = None
+        reachable = []
+        for metric, achievements in by_metric.items():
+            rule_cls = AchievementEngine._rules.get(metric)
+            if rule_cls is None:
+                continue
+            with instrumentation.observe(rule_cls.__name__, event_type) as probe:
+                if metric not in next_target or not rule_cls.applies(user, instance):
+                    continue
+                if rule_cls.counter:
+                    # One UserMetrics read serves every counter-backed rule.
+                    metrics = metrics or get_metrics(user)
+                    value = getattr(metrics, rule_cls.counter)
+                else:
+                    value = rule_cls.compute(user, instance)
+                reachable += AchievementEngine._reachable(
+                    achievements,
+                    value,
+                    next_target[metric],
+                    probe,
+                )
+
+        instrumentation.flush()
+        if not reachable:
+            return
+
+        existing_ids = set(
+            UserAchievement.objects.filter(
+                user=user,
+                achievement_id__in=[achievement.id for achievement in reachable],
+            ).values_list("achievement_id", flat=True),
         )
-
-        candidates = (
-            Achievement.objects.filter(
-                event_type=event_type,
+        new_awards = [
+            UserAchievement(user=user, achievement=achievement)
+            for achievement in reachable
+            if achievement.id not in existing_ids
+        ]
+
+        if new_awards:
+            UserAchievement.objects.bulk_create(new_awards, ignore_conflicts=True)
+            targets.invalidate(user.pk)
+            conditional.touch_user(user.pk)
+            cache.set(
+                f"achievements_pending:{user.pk}",
+                value=True,
+                timeout=PENDING_FLAG_TIMEOUT,
             )
-            .exclude(category=Achievement.Category.PERIODIC)
-            .exclude(id__in=existing_ids)
-        )
 
-        awarded = False
-        for achievement in candidates:
-            rule_cls = AchievementEngine._rules.get(achievement.metric)
-            if rule_cls and rule_cls.evaluate(user, achievement.threshold, instance):
-                UserAchievement.objects.create(user=user, achievement=achievement)
-                awarded = True
+    @staticmethod
+    async def acheck_achievements(user, event_type, instance=None):
+        """Async ``check_achievements``, on the async ORM and cache API.
 
-        if awarded:
-            cache.set(
+        Lets async views evaluate rules without holding a thread from the
+        sync executor pool (see ``outbox.adeferred``).
+        """
+        AchievementEngine.register_rules()
+
+        catalog = await aget_catalog()
+        by_metric = AchievementEngine._candidates_by_metric(catalog, event_type)
+        if not by_metric:
+            return
+
+        next_target = await targets.anext_targets(user, catalog)
+        metrics = None
+        reachable = []
+        for metric, achievements in by_metric.items():
+            rule_cls = AchievementEngine._rules.get(metric)
+            if rule_cls is None:
+                continue
+            async with instrumentation.aobserve(
+                rule_cls.__name__,
+                event_type,
+            ) as probe:
+                if metric not in next_target or not rule_cls.applies(user, instance):
+                    continue
+                if rule_cls.counter:
+                    metrics = metrics or await aget_metrics(user)
+                    value = getattr(metrics, rule_cls.counter)
+                else:
+                    value = await rule_cls.acompute(user, instance)
+                reachable += AchievementEngine._reachable(
+                    achievements,
+                    value,
+                    next_target[metric],
+                    probe,
+                )
+
+        await instrumentation.aflush()
+        if not reachable:
+            return
+
+        existing_ids = {
+            achievement_id
+            async for achievement_id in UserAchievement.objects.filter(
+                user=user,
+                achievement_id__in=[achievement.id for achievement in reachable],
+            ).values_list("achievement_id", flat=True)
+        }
+        new_awards = [
+            UserAchievement(user=user, achievement=achievement)
+            for achievement in reachable
+            if achievement.id not in existing_ids
+        ]
+
+        if new_awards:
+            await UserAchievement.objects.abulk_create(
+                new_awards,
+                ignore_conflicts=True,
+            )
+            await targets.ainvalidate(user.pk)
+            await conditional.atouch_user(user.pk)
+            await cache.aset(
                 f"achievements_pending:{user.pk}",
                 value=True,
-                timeout=60 * 60 * 24 * 30,
+                timeout=PENDING_FLAG_TIMEOUT,
             )
@@ -0,0 +1,333 @@
+"""Per-rule timing and query counts for the achievement engine.
+
+Every metric the engine evaluates is observed with its rule, the event type
+and the outcome — ``awarded`` (a new threshold was reached), ``not_yet``
+(computed, still below the next threshold) or ``skipped`` (nothing left to
+unlock, or the event doesn't apply) — recording its wall time and the number
+of SQL queries it ran into two histograms.
+
+Observations are collected per process and merged into the shared cache
+with ``cache.incr`` at most every ``FLUSH_INTERVAL`` seconds, so the web
+processes and the worker all add up to one set of counters. ``snapshot()``
+reads them back for the ``/api/achievements/metrics`` endpoint (Prometheus
+text format) and ``manage.py diagnose_achievements --stats``.
+
+The async engine's queries run on the ``sync_to_async`` thread, not on the
+event loop's connection, so ``aobserve`` counts them there: for the length
+of its block it wraps that thread's connection with a counter of the
+queries run in the coroutine's context (contextvars follow
+``sync_to_async`` calls), as other coroutines may share the connection.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .models import Achievement
+
+AWARDED = "awarded"
+NOT_YET = "not_yet"
+SKIPPED = "skipped"
+OUTCOMES = (AWARDED, NOT_YET, SKIPPED)
+
+# Upper bounds of the histogram buckets; one more bucket catches the rest.
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25)
+
+FLUSH_INTERVAL = 10
+KEY_PREFIX = "achievements:rule_stats"
+
+
+def _bucket(bounds, value) -> int:
+    for index, bound in enumerate(bounds):
+        if value <= bound:
+            return index
+    return len(bounds)
+
+
+@dataclass
+class RuleStats:
+    """Histograms of one (rule, event type, outcome) combination."""
+
+    count: int = 0
+    duration_sum: float = 0.0
+    queries_sum: int = 0
+    duration_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(DURATION_BUCKETS) + 1),
+    )
+    query_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(QUERY_BUCKETS) + 1),
+    )
+
+    def observe(self, duration: float, queries: int) -> None:
+        self.count += 1
+        self.duration_sum += duration
+        self.queries_sum += queries
+        self.duration_buckets[_bucket(DURATION_BUCKETS, duration)] += 1
+        self.query_buckets[_bucket(QUERY_BUCKETS, queries)] += 1
+
+    def duration_quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile, in seconds."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(DURATION_BUCKETS, self.duration_buckets, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_counters(self) -> dict[str, int]:
+        counters = {
+            "count": self.count,
+            "duration_us": round(self.duration_sum * 1_000_000),
+            "queries": self.queries_sum,
+        }
+        counters.update(
+            {f"d{index}": count for index, count in enumerate(self.duration_buckets)},
+        )
+        counters.update(
+            {f"q{index}": count for index, count in enumerate(self.query_buckets)},
+        )
+        return counters
+
+    @classmethod
+    def from_counters(cls, counters: dict[str, int]) -> RuleStats:
+        return cls(
+            count=counters.get("count", 0),
+            duration_sum=counters.get("duration_us", 0) / 1_000_000,
+            queries_sum=counters.get("queries", 0),
+            duration_buckets=[
+                counters.get(f"d{index}", 0)
+                for index in range(len(DURATION_BUCKETS) + 1)
+            ],
+            query_buckets=[
+                counters.get(f"q{index}", 0) for index in range(len(QUERY_BUCKETS) + 1)
+            ],
+        )
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` hook counting the queries it sees."""
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+# The counter of the ``aobserve`` block the current context is in.
+_context_counter: ContextVar[QueryCounter | None] = ContextVar(
+    "achievement_query_counter",
+    default=None,
+)
+
+
+class ContextQueryCounter(QueryCounter):
+    """``QueryCounter`` of the queries run in the context it is current in."""
+
+    def __call__(self, execute, sql, params, many, context):
+        if _context_counter.get() is self:
+            self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def _wrap_connection(counter):
+    # Run on the ORM thread: ``connection`` is the one of the calling thread.
+    wrapper = connection.execute_wrapper(counter)
+    wrapper.__enter__()
+    return wrapper
+
+
+@dataclass
+class Probe:
+    """Handed to the engine so it can report the outcome of the rule."""
+
+    outcome: str = SKIPPED
+
+
+_lock = threading.Lock()
+_pending: dict[tuple[str, str, str], RuleStats] = defaultdict(RuleStats)
+_last_flush = time.monotonic()
+
+
+@contextmanager
+def observe(rule: str, event_type: str):
+    """Time the enclosed evaluation of ``rule`` and count its queries.
+
+    The block sets ``probe.outcome``; leaving it early (``continue``) records
+    it as is. Evaluations that raise are not recorded.
+    """
+    probe = Probe()
+    if not settings.ACHIEVEMENTS_INSTRUMENTATION:
+        yield probe
+        return
+    counter = QueryCounter()
+    start = time.perf_counter()
+    with connection.execute_wrapper(counter):
+        yield probe
+    duration = time.perf_counter() - start
+    with _lock:
+        _pending[rule, event_type, probe.outcome].observe(duration, counter.queries)
+
+
+@asynccontextmanager
+async def aobserve(rule: str, event_type: str):
+    """Async ``observe``, counting the queries the block runs via the async ORM."""
+    probe = Probe()
+    if not settings.ACHIEVEMENTS_INSTRUMENTATION:
+        yield probe
+        return
+    counter = ContextQueryCounter()
+    token = _context_counter.set(counter)
+    wrapper = await sync_to_async(_wrap_connection)(counter)
+    try:
+        start = time.perf_counter()
+        yield probe
+        duration = time.perf_counter() - start
+    finally:
+        await sync_to_async(wrapper.__exit__)(None, None, None)
+        _context_counter.reset(token)
+    with _lock:
+        _pending[rule, event_type, probe.outcome].observe(duration, counter.queries)
+
+
+def _take_pending(*, force: bool) -> dict[str, int]:
+    """Counter deltas by cache key, if it is time to flush them."""
+    global _last_flush  # noqa: PLW0603
+    with _lock:
+        if not _pending or (
+            not force and time.monotonic() - _last_flush < FLUSH_INTERVAL
+        ):
+            return {}
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    return {
+        _key(*labels, name): delta
+        for labels, stats in pending.items()
+        for name, delta in stats.to_counters().items()
+        if delta
+    }
+
+
+def flush(*, force: bool = False) -> None:
+    """Add this process's observations to the shared counters in the cache."""
+    for key, delta in _take_pending(force=force).items():
+        _incr(key, delta)
+
+
+async def aflush(*, force: bool = False) -> None:
+    """Async ``flush``, on the async cache API."""
+    for key, delta in _take_pending(force=force).items():
+        await _aincr(key, delta)
+
+
+def _incr(key: str, delta: int) -> None:
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
+
+
+async def _aincr(key: str, delta: int) -> None:
+    try:
+        await cache.aincr(key, delta)
+    except ValueError:
+        if not await cache.aadd(key, delta, timeout=None):
+            await cache.aincr(key, delta)
+
+
+def _key(rule: str, event_type: str, outcome: str, name: str) -> str:
+    return f"{KEY_PREFIX}:{rule}:{event_type}:{outcome}:{name}"
+
+
+def _label_sets():
+    # Imported here: the engine itself imports this module.
+    from .engine import AchievementEngine  # noqa: PLC0415
+
+    AchievementEngine.register_rules()
+    rules = sorted(rule.__name__ for rule in AchievementEngine._rules.values())  # noqa: SLF001
+    return [
+        (rule, event_type, outcome)
+        for rule in rules
+        for event_type in Achievement.EventType.values
+        for outcome in OUTCOMES
+    ]
+
+
+def snapshot() -> dict[tuple[str, str, str], RuleStats]:
+    """Return the shared stats of every label set observed so far."""
+    flush(force=True)
+    label_sets = _label_sets()
+    names = list(RuleStats().to_counters())
+    values = cache.get_many(
+        [_key(*labels, name) for labels in label_sets for name in names],
+    )
+    stats = {}
+    for labels in label_sets:
+        counters = {
+            name: values[_key(*labels, name)]
+            for name in names
+            if _key(*labels, name) in values
+        }
+        if counters.get("count"):
+            stats[labels] = RuleStats.from_counters(counters)
+    return stats
+
+
+def reset() -> None:
+    """Drop all recorded stats, in this process and in the cache."""
+    with _lock:
+        _pending.clear()
+    names = list(RuleStats().to_counters())
+    cache.delete_many(
+        [_key(*labels, name) for labels in _label_sets() for name in names],
+    )
+
+
+def render_prometheus(stats: dict[tuple[str, str, str], RuleStats]) -> str:
+    """Render ``stats`` in the Prometheus text exposition format."""
+    lines = []
+    histograms = [
+        (
+            "achievement_rule_duration_seconds",
+            "Wall time of one achievement rule evaluation.",
+            DURATION_BUCKETS,
+            "duration_buckets",
+            "duration_sum",
+        ),
+        (
+            "achievement_rule_queries",
+            "SQL queries run by one achievement rule evaluation.",
+            QUERY_BUCKETS,
+            "query_buckets",
+            "queries_sum",
+        ),
+    ]
+    for name, help_text, bounds, buckets_attr, sum_attr in histograms:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (rule, event_type, outcome), rule_stats in sorted(stats.items()):
+            labels = f'rule="{rule}",event_type="{event_type}",outcome="{outcome}"'
+            cumulative = 0
+            buckets = getattr(rule_stats, buckets_attr)
+            for bound, count in zip(bounds, buckets, strict=False):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {rule_stats.count}')
+            lines.append(f"{name}_sum{{{labels}}} {getattr(rule_stats, sum_attr)}")
+            lines.append(f"{name}_count{{{labels}}} {rule_stats.count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from suchar_overflow.achievements.backfill import backfill_achievements
+from suchar_overflow.achievements.models import Achievement
+
+
+class Command(BaseCommand):
+    help = "Awards achievements retroactively to every user who already qualifies"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "slugs",
+            nargs="*",
+            help="Achievement slugs to backfill. Defaults to all of them.",
+        )
+        parser.add_argument(
+            "--metric",
+            type=str,
+            choices=Achievement.Metric.values,
+            help="Only backfill achievements using this metric.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of awards inserted per statement.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many users would be awarded without writing.",
+        )
+
+    def handle(self, *args, **options):
+        achievements = Achievement.objects.order_by("metric", "threshold")
+        if options["slugs"]:
+            achievements = achievements.filter(slug__in=options["slugs"])
+            missing = set(options["slugs"]) - {a.slug for a in achievements}
+            if missing:
+                msg = f"Unknown achievement slugs: {', '.join(sorted(missing))}"
+                raise CommandError(msg)
+        if options["metric"]:
+            achievements = achievements.filter(metric=options["metric"])
+
+        awarded = backfill_achievements(
+            achievements,
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+
+        for slug, count in awarded.items():
+            self.stdout.write(f"{slug}: {count}")
+        verb = "Would award" if options["dry_run"] else "Awarded"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {sum(awarded.values())} achievements "
+                f"across {len(awarded)} achievement types.",
+            ),
+        )
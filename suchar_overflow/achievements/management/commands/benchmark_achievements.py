@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from suchar_overflow.achievements import benchmark
+from suchar_overflow.achievements.models import Achievement
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the achievement engine on synthetic data (rolled back afterwards) "
+        "and writes the results as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--votes",
+            type=int,
+            nargs="+",
+            default=list(benchmark.SCALES),
+            help="Number of votes to seed, one benchmark run per value.",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=200,
+            help="Events timed per event type and rule.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed of the synthetic data.",
+        )
+        parser.add_argument(
+            "--label",
+            type=str,
+            default="",
+            help="Free-form label stored with the results (e.g. a commit).",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write the JSON results here instead of to stdout.",
+        )
+        parser.add_argument(
+            "--compare",
+            type=Path,
+            help="Results of an earlier run to compare the mean timings with.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.1,
+            help="Relative slowdown reported as a regression (default 0.1).",
+        )
+        parser.add_argument(
+            "--yes-i-mean-it",
+            action="store_true",
+            help="Run with DEBUG off, e.g. against a production-like database.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["yes_i_mean_it"]:
+            msg = (
+                "This seeds up to millions of rows into the configured database "
+                "(rolled back afterwards). Run it with DEBUG on, or pass "
+                "--yes-i-mean-it."
+            )
+            raise CommandError(msg)
+        if not Achievement.objects.exists():
+            msg = "No achievements are defined; there is nothing to benchmark."
+            raise CommandError(msg)
+        baseline = None
+        if options["compare"]:
+            try:
+                baseline = json.loads(options["compare"].read_text())
+            except (OSError, ValueError) as e:
+                msg = f"Cannot read baseline {options['compare']}: {e}"
+                raise CommandError(msg) from e
+
+        results = benchmark.run(
+            options["votes"],
+            samples=options["samples"],
+            seed_value=options["seed"],
+            label=options["label"],
+        )
+
+        payload = json.dumps(results, indent=2)
+        if options["output"]:
+            options["output"].write_text(payload + "\n")
+            self.stdout.write(f"Results written to {options['output']}.")
+        else:
+            self.stdout.write(payload)
+
+        if baseline is not None:
+            self.report_comparison(baseline, results, options["threshold"])
+
+    def report_comparison(self, baseline, results, threshold):
+        regressions = 0
+        for key, before, after, change in benchmark.compare(baseline, results):
+            line = f"{key}: {before:.3f} ms -> {after:.3f} ms ({change:+.1%})"
+            if change > threshold:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        summary = f"{regressions} timings regressed by more than {threshold:.0%}."
+        style = self.style.ERROR if regressions else self.style.SUCCESS
+        self.stdout.write(style(summary))
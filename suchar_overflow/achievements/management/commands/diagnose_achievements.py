@@ -0,0 +1,99 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+
+from suchar_overflow.achievements import instrumentation
+from suchar_overflow.achievements import outbox
+from suchar_overflow.achievements import targets
+from suchar_overflow.achievements.catalog import get_catalog
+from suchar_overflow.achievements.engine import AchievementEngine
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Shows how the achievement rules perform, overall or for one user"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "username",
+            nargs="?",
+            help="Evaluate every rule for this user and time each of them.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help=(
+                "Print the recorded per-rule timings and query counts, and "
+                "the checks saved by coalescing."
+            ),
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Clear the recorded per-rule statistics.",
+        )
+
+    def handle(self, *args, **options):
+        if not (options["username"] or options["stats"] or options["reset"]):
+            msg = "Pass a username, --stats or --reset."
+            raise CommandError(msg)
+        if options["username"]:
+            self.diagnose_user(options["username"])
+        if options["stats"]:
+            self.print_stats()
+        if options["reset"]:
+            instrumentation.reset()
+            self.stdout.write(self.style.SUCCESS("Per-rule statistics cleared."))
+
+    def diagnose_user(self, username):
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist as e:
+            msg = f"Unknown user: {username}"
+            raise CommandError(msg) from e
+
+        next_target = targets.next_targets(user, get_catalog())
+        self.stdout.write(
+            f"{'rule':<22} {'value':>7} {'next':>7} {'ms':>9} {'queries':>8}",
+        )
+        for metric in sorted(get_catalog().by_metric):
+            rule_cls = AchievementEngine.rule_for(metric)
+            if rule_cls is None:
+                continue
+            counter = instrumentation.QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                value = rule_cls.compute(user)
+                elapsed = (time.perf_counter() - start) * 1000
+            target = next_target.get(metric, "-")
+            self.stdout.write(
+                f"{rule_cls.__name__:<22} {value!s:>7} {target!s:>7} "
+                f"{elapsed:>9.2f} {counter.queries:>8}",
+            )
+
+    def print_stats(self):
+        coalescing = outbox.coalescing_stats()
+        self.stdout.write(
+            f"Worker checks: {coalescing['evaluated']} evaluated, "
+            f"{coalescing['coalesced']} saved by coalescing.",
+        )
+        stats = instrumentation.snapshot()
+        if not stats:
+            self.stdout.write("No rule evaluations recorded yet.")
+            return
+        self.stdout.write(
+            f"{'rule':<22} {'event':<14} {'outcome':<8} {'calls':>7} "
+            f"{'mean ms':>8} {'p95 ms':>7} {'queries':>8}",
+        )
+        for (rule, event_type, outcome), rule_stats in sorted(stats.items()):
+            mean_ms = rule_stats.duration_sum / rule_stats.count * 1000
+            p95_ms = rule_stats.duration_quantile(0.95) * 1000
+            mean_queries = rule_stats.queries_sum / rule_stats.count
+            self.stdout.write(
+                f"{rule:<22} {event_type:<14} {outcome:<8} {rule_stats.count:>7} "
+                f"{mean_ms:>8.2f} {p95_ms:>7.1f} {mean_queries:>8.1f}",
+            )
@@ -0,0 +1,72 @@
+from itertools import batched
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from suchar_overflow.achievements.metrics import METRIC_FIELDS
+from suchar_overflow.achievements.metrics import compute_user_metrics
+from suchar_overflow.achievements.metrics import save_user_metrics
+from suchar_overflow.achievements.models import UserMetrics
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Rebuilds per-user achievement metrics from the source tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=str,
+            help="Only reconcile the user with this username.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of users recounted per round of queries.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted rows without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("pk")
+        if options["user"]:
+            users = users.filter(username=options["user"])
+        user_ids = users.values_list("pk", flat=True)
+
+        checked = 0
+        drifted = 0
+        for batch in batched(
+            user_ids.iterator(),
+            options["batch_size"],
+            strict=False,
+        ):
+            computed = compute_user_metrics(batch)
+            stored = {
+                row.user_id: row
+                for row in UserMetrics.objects.filter(user_id__in=batch)
+            }
+            stale = {}
+            for pk, values in computed.items():
+                row = stored.get(pk)
+                if row is None or any(
+                    getattr(row, field) != values[field] for field in METRIC_FIELDS
+                ):
+                    stale[pk] = values
+                    self.stdout.write(f"User #{pk}: metrics drifted")
+
+            checked += len(computed)
+            drifted += len(stale)
+            if stale and not options["dry_run"]:
+                save_user_metrics(stale)
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} users. {verb} {drifted} drifted metrics rows.",
+            ),
+        )
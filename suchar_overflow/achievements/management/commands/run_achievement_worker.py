@@ -0,0 +1,94 @@
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import close_old_connections
+from django.db import connection
+
+from suchar_overflow.achievements.outbox import coalescing_stats
+from suchar_overflow.achievements.outbox import process_next
+
+
+class Command(BaseCommand):
+    help = "Evaluates queued achievement checks (see ACHIEVEMENTS_ASYNC)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pool-size",
+            type=int,
+            default=4,
+            help="Number of checks evaluated concurrently.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds an idle worker waits before looking for new checks.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of waiting for new checks.",
+        )
+
+    def handle(self, *args, **options):
+        pool_size = options["pool_size"]
+        if pool_size < 1:
+            msg = "--pool-size must be at least 1"
+            raise CommandError(msg)
+
+        stop = threading.Event()
+        previous_handlers = {
+            signum: signal.signal(signum, lambda *_: stop.set())
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            if pool_size == 1:
+                processed = self._work(stop, options)
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=pool_size,
+                    thread_name_prefix="achievement-worker",
+                ) as pool:
+                    futures = [
+                        pool.submit(self._work_in_thread, stop, options)
+                        for _ in range(pool_size)
+                    ]
+                processed = sum(future.result() for future in futures)
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {processed} achievement checks."),
+        )
+        stats = coalescing_stats()
+        self.stdout.write(
+            f"Totals: {stats['evaluated']} checks evaluated, "
+            f"{stats['coalesced']} saved by coalescing.",
+        )
+
+    @staticmethod
+    def _work(stop, options):
+        processed = 0
+        while not stop.is_set():
+            # Long-lived loop outside a request cycle: drop connections that
+            # went stale while idle, unless a caller's transaction owns it.
+            if not connection.in_atomic_block:
+                close_old_connections()
+            if process_next():
+                processed += 1
+            elif options["once"]:
+                break
+            else:
+                stop.wait(options["poll_interval"])
+        return processed
+
+    @classmethod
+    def _work_in_thread(cls, stop, options):
+        try:
+            return cls._work(stop, options)
+        finally:
+            connection.close()
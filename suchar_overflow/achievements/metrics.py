@@ -0,0 +1,359 @@
+"""Incremental per-user counters backing the count-based achievement rules.
+
+Every write path that changes a counted row calls into this module (see
+``signals.py``), so reading a metric is a single-row lookup regardless of how
+active the user has been. ``rebuild_user_metrics`` recomputes rows from the
+source tables and is the fallback for a missing row as well as the engine
+behind the ``reconcile_user_metrics`` command.
+"""
+
+from datetime import date
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import IntegerField
+from django.db.models import Max
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Coalesce
+from django.db.models.functions import ExtractHour
+from django.db.models.functions import Greatest
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Vote
+
+from .models import UserMetrics
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+COUNTER_FIELDS = (
+    "suchar_count",
+    "vote_cast_count",
+    "vote_funny_count",
+    "vote_dry_count",
+    "funny_received",
+    "dry_received",
+    "night_suchar_count",
+)
+# Posts from midnight up to (and including) this local hour count as night posts.
+NIGHT_OWL_LAST_HOUR = 4
+
+STREAK_FIELDS = ("streak_current", "streak_longest", "streak_last_date")
+METRIC_FIELDS = COUNTER_FIELDS + STREAK_FIELDS
+
+
+def increment(user_id: int, **deltas: int) -> None:
+    """Apply ``deltas`` (counter field -> signed amount) in a single UPDATE.
+
+    A missing row is deliberately left alone rather than created here:
+    ``get_metrics`` rebuilds it from the source tables on first read, which
+    also keeps cascade deletes (where the row may already be gone) from
+    resurrecting metrics for a user that is being removed.
+    """
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if changes:
+        UserMetrics.objects.filter(user_id=user_id).update(**changes)
+
+
+def record_suchar(suchar: Suchar, sign: int = 1) -> None:
+    """Count ``suchar`` for its author (``sign=-1`` when it is deleted).
+
+    A new suchar also extends its author's posting streak. Deleting one
+    leaves the streak alone — the activity still happened; reconciling
+    recomputes streaks from the suchary that remain.
+    """
+    increment(
+        suchar.author_id,
+        suchar_count=sign,
+        night_suchar_count=sign * is_night_post(suchar),
+    )
+    if sign > 0:
+        record_active_day(suchar.author_id, timezone.localdate(suchar.created_at))
+
+
+def is_night_post(suchar: Suchar) -> bool:
+    """Whether ``suchar`` was written between midnight and the Night Owl cutoff."""
+    return timezone.localtime(suchar.created_at).hour <= NIGHT_OWL_LAST_HOUR
+
+
+def record_active_day(user_id: int, day: date) -> None:
+    """Advance ``user_id``'s posting streak to ``day`` in a single UPDATE.
+
+    Days are local dates of ``created_at``, not ``published_at``: a suchar
+    scheduled for next week was still written today, and scheduling a batch
+    of posts for the coming days mustn't build a streak in advance.
+    """
+    current = Case(
+        When(streak_last_date=day, then=F("streak_current")),
+        When(
+            streak_last_date=day - timedelta(days=1),
+            then=F("streak_current") + 1,
+        ),
+        # An older day arriving late can't extend the latest run.
+        When(streak_last_date__gt=day, then=F("streak_current")),
+        default=Value(1),
+    )
+    UserMetrics.objects.filter(user_id=user_id).update(
+        streak_current=current,
+        streak_longest=Greatest("streak_longest", current),
+        streak_last_date=Case(
+            When(streak_last_date__gt=day, then=F("streak_last_date")),
+            default=Value(day),
+        ),
+    )
+
+
+def record_vote(vote: Vote, sign: int = 1) -> None:
+    """Count ``vote`` for the voter and the suchar author (``sign=-1`` on delete)."""
+    record_vote_change(
+        vote.user_id,
+        vote.suchar.author_id,
+        funny_delta=sign * vote.is_funny,
+        dry_delta=sign * vote.is_dry,
+        cast_delta=sign,
+    )
+
+
+def uncount_votes(votes) -> None:
+    """Take the ``votes`` queryset off its voters' and authors' counters.
+
+    ``record_vote(vote, sign=-1)`` for votes deleted along with their suchar
+    or voter: two UPDATEs however many votes there are, made while the
+    votes still exist.
+    """
+    cast = votes.filter(user_id=OuterRef("user_id"))
+    UserMetrics.objects.filter(user_id__in=votes.values("user_id")).update(
+        vote_cast_count=F("vote_cast_count") - _count(cast, "user_id"),
+        vote_funny_count=F("vote_funny_count")
+        - _count(cast.filter(is_funny=True), "user_id"),
+        vote_dry_count=F("vote_dry_count")
+        - _count(cast.filter(is_dry=True), "user_id"),
+    )
+    received = votes.filter(suchar__author_id=OuterRef("user_id"))
+    UserMetrics.objects.filter(user_id__in=votes.values("suchar__author_id")).update(
+        funny_received=F("funny_received")
+        - _count(received.filter(is_funny=True), "suchar__author_id"),
+        dry_received=F("dry_received")
+        - _count(received.filter(is_dry=True), "suchar__author_id"),
+    )
+
+
+def _count(votes, group: str):
+    counts = votes.values(group).annotate(n=Count("pk")).values("n")
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def record_vote_change(
+    voter_id: int,
+    author_id: int,
+    *,
+    funny_delta: int,
+    dry_delta: int,
+    cast_delta: int = 0,
+) -> None:
+    """Apply a change to a vote's flags to both sides of the vote."""
+    increment(
+        voter_id,
+        vote_cast_count=cast_delta,
+        vote_funny_count=funny_delta,
+        vote_dry_count=dry_delta,
+    )
+    increment(
+        author_id,
+        funny_received=funny_delta,
+        dry_received=dry_delta,
+    )
+
+
+def record_balance(author_id: int, funny_count: int, dry_count: int) -> None:
+    """Remember a suchar of ``author_id`` left with as many funny as dry votes.
+
+    Polarizer is won by the balance itself, which the next vote may break
+    before a queued check runs, so the best one reached is kept.
+    """
+    if funny_count == dry_count and funny_count > 0:
+        UserMetrics.objects.filter(
+            user_id=author_id,
+            balanced_best__lt=funny_count,
+        ).update(balanced_best=funny_count)
+
+
+def record_suchar_balance(suchar_id: int) -> None:
+    """``record_balance`` with the stored tallies of the suchar."""
+    row = (
+        Suchar.objects.filter(pk=suchar_id)
+        .values_list("author_id", "funny_count", "dry_count")
+        .first()
+    )
+    if row is not None:
+        record_balance(*row)
+
+
+def record_suchar_balances(suchar_ids: Iterable[int]) -> None:
+    """``record_suchar_balance`` for every suchar in ``suchar_ids``, in one UPDATE."""
+    suchar_ids = list(suchar_ids)
+    if not suchar_ids:
+        return
+    balanced = Suchar.objects.filter(
+        pk__in=suchar_ids,
+        funny_count=F("dry_count"),
+        funny_count__gt=0,
+    )
+    best = (
+        balanced.filter(author_id=OuterRef("user_id"))
+        .values("author_id")
+        .annotate(best=Max("funny_count"))
+        .values("best")
+    )
+    UserMetrics.objects.filter(user_id__in=balanced.values("author_id")).update(
+        balanced_best=Greatest("balanced_best", Subquery(best)),
+    )
+
+
+def compute_user_metrics(user_ids: Iterable[int]) -> dict[int, dict[str, int]]:
+    """Count every metric for ``user_ids`` straight from the source tables.
+
+    Five grouped queries regardless of how many users are passed in.
+    ``balanced_best`` can only be seeded from the suchary balanced now, so
+    ``save_user_metrics`` doesn't overwrite a stored one.
+    """
+    user_ids = list(user_ids)
+    result = {
+        pk: {
+            **dict.fromkeys(COUNTER_FIELDS, 0),
+            "streak_current": 0,
+            "streak_longest": 0,
+            "streak_last_date": None,
+            "balanced_best": 0,
+        }
+        for pk in user_ids
+    }
+
+    tz = timezone.get_current_timezone()
+    suchar_counts = (
+        Suchar.objects.filter(author_id__in=user_ids)
+        .annotate(local_hour=ExtractHour("created_at", tzinfo=tz))
+        .values("author_id")
+        .annotate(
+            n=Count("pk"),
+            night=Count("pk", filter=Q(local_hour__lte=NIGHT_OWL_LAST_HOUR)),
+        )
+    )
+    for row in suchar_counts:
+        result[row["author_id"]]["suchar_count"] = row["n"]
+        result[row["author_id"]]["night_suchar_count"] = row["night"]
+
+    cast_counts = (
+        Vote.objects.filter(user_id__in=user_ids)
+        .values("user_id")
+        .annotate(
+            cast=Count("pk"),
+            funny=Count("pk", filter=Q(is_funny=True)),
+            dry=Count("pk", filter=Q(is_dry=True)),
+        )
+    )
+    for row in cast_counts:
+        metrics = result[row["user_id"]]
+        metrics["vote_cast_count"] = row["cast"]
+        metrics["vote_funny_count"] = row["funny"]
+        metrics["vote_dry_count"] = row["dry"]
+
+    received_counts = (
+        Vote.objects.filter(suchar__author_id__in=user_ids)
+        .values("suchar__author_id")
+        .annotate(
+            funny=Count("pk", filter=Q(is_funny=True)),
+            dry=Count("pk", filter=Q(is_dry=True)),
+        )
+    )
+    for row in received_counts:
+        metrics = result[row["suchar__author_id"]]
+        metrics["funny_received"] = row["funny"]
+        metrics["dry_received"] = row["dry"]
+
+    balanced = (
+        Suchar.objects.filter(
+            author_id__in=user_ids,
+            funny_count=F("dry_count"),
+            funny_count__gt=0,
+        )
+        .values("author_id")
+        .annotate(best=Max("funny_count"))
+    )
+    for row in balanced:
+        result[row["author_id"]]["balanced_best"] = row["best"]
+
+    active_days = (
+        Suchar.objects.filter(author_id__in=user_ids)
+        .annotate(day=TruncDate("created_at", tzinfo=tz))
+        .values_list("author_id", "day")
+        .distinct()
+        .order_by("author_id", "day")
+    )
+    for author_id, rows in groupby(active_days.iterator(), key=itemgetter(0)):
+        result[author_id].update(compute_streaks([day for _, day in rows]))
+
+    return result
+
+
+def compute_streaks(days: list[date]) -> dict:
+    """Streak fields for a user active on ``days`` (distinct, ascending)."""
+    current = longest = 0
+    previous = None
+    for day in days:
+        if previous is not None and day - previous == timedelta(days=1):
+            current += 1
+        else:
+            current = 1
+        longest = max(longest, current)
+        previous = day
+    return {
+        "streak_current": current,
+        "streak_longest": longest,
+        "streak_last_date": previous,
+    }
+
+
+def save_user_metrics(computed: dict[int, dict[str, int]]) -> list[UserMetrics]:
+    """Upsert rows produced by ``compute_user_metrics``."""
+    rows = [UserMetrics(user_id=pk, **values) for pk, values in computed.items()]
+    return UserMetrics.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=list(METRIC_FIELDS),
+    )
+
+
+def rebuild_user_metrics(user_ids: Iterable[int]) -> list[UserMetrics]:
+    """Recompute and upsert the metrics rows for ``user_ids``."""
+    return save_user_metrics(compute_user_metrics(user_ids))
+
+
+def get_metrics(user) -> UserMetrics:
+    """Return ``user``'s metrics row, rebuilding it if it doesn't exist yet."""
+    try:
+        return UserMetrics.objects.get(user_id=user.pk)
+    except UserMetrics.DoesNotExist:
+        return rebuild_user_metrics([user.pk])[0]
+
+
+async def aget_metrics(user) -> UserMetrics:
+    """Async ``get_metrics``."""
+    try:
+        return await UserMetrics.objects.aget(user_id=user.pk)
+    except UserMetrics.DoesNotExist:
+        rebuilt = await sync_to_async(rebuild_user_metrics)([user.pk])
+        return rebuilt[0]
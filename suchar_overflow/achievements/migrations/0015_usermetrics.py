@@ -0,0 +1,32 @@
+# Generated by Django 6.0.6 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0014_best_suchar_tie_achievements_data'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserMetrics',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='metrics', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('suchar_count', models.IntegerField(default=0, verbose_name='Suchar Count')),
+                ('vote_cast_count', models.IntegerField(default=0, verbose_name='Vote Cast Count')),
+                ('vote_funny_count', models.IntegerField(default=0, verbose_name='Funny Vote Count')),
+                ('vote_dry_count', models.IntegerField(default=0, verbose_name='Dry Vote Count')),
+                ('funny_received', models.IntegerField(default=0, verbose_name='Funny Votes Received')),
+                ('dry_received', models.IntegerField(default=0, verbose_name='Dry Votes Received')),
+            ],
+            options={
+                'verbose_name': 'User Metrics',
+                'verbose_name_plural': 'User Metrics',
+            },
+        ),
+    ]
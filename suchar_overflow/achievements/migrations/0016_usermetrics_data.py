@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+from django.db.models import Q
+
+_BATCH_SIZE = 1000
+
+
+def backfill_user_metrics(apps, schema_editor):
+    """Seed one UserMetrics row per existing user from the source tables.
+
+    Mirrors ``metrics.compute_user_metrics`` against the historical models —
+    migrations must not import app code that can drift from this schema.
+    """
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Suchar = apps.get_model("suchary", "Suchar")
+    Vote = apps.get_model("suchary", "Vote")
+    UserMetrics = apps.get_model("achievements", "UserMetrics")
+
+    rows = {
+        pk: UserMetrics(user_id=pk)
+        for pk in User.objects.values_list("pk", flat=True)
+    }
+
+    for row in Suchar.objects.values("author_id").annotate(n=Count("pk")):
+        rows[row["author_id"]].suchar_count = row["n"]
+
+    cast_counts = Vote.objects.values("user_id").annotate(
+        cast=Count("pk"),
+        funny=Count("pk", filter=Q(is_funny=True)),
+        dry=Count("pk", filter=Q(is_dry=True)),
+    )
+    for row in cast_counts:
+        metrics = rows[row["user_id"]]
+        metrics.vote_cast_count = row["cast"]
+        metrics.vote_funny_count = row["funny"]
+        metrics.vote_dry_count = row["dry"]
+
+    received_counts = Vote.objects.values("suchar__author_id").annotate(
+        funny=Count("pk", filter=Q(is_funny=True)),
+        dry=Count("pk", filter=Q(is_dry=True)),
+    )
+    for row in received_counts:
+        metrics = rows[row["suchar__author_id"]]
+        metrics.funny_received = row["funny"]
+        metrics.dry_received = row["dry"]
+
+    UserMetrics.objects.bulk_create(
+        rows.values(),
+        batch_size=_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0015_usermetrics"),
+        ("suchary", "0007_suchar_text_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_metrics, migrations.RunPython.noop),
+    ]
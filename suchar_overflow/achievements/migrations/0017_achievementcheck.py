@@ -0,0 +1,33 @@
+# Generated by Django 6.0.6 on 2026-10-18 11:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0016_usermetrics_data'),
+        ('suchary', '0007_suchar_text_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AchievementCheck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('SUCHAR_POSTED', 'Suchar Posted'), ('VOTE_RECEIVED', 'Vote Received'), ('VOTE_CAST', 'Vote Cast'), ('FRONTEND', 'Frontend')], max_length=20, verbose_name='Event Type')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('suchar', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='suchary.suchar')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='achievement_checks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Achievement Check',
+                'verbose_name_plural': 'Achievement Checks',
+                'ordering': ('id',),
+            },
+        ),
+    ]
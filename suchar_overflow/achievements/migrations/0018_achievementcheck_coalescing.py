@@ -0,0 +1,28 @@
+# Generated by Django 6.0.6 on 2026-10-18 11:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0017_achievementcheck'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achievementcheck',
+            name='coalesced_count',
+            field=models.PositiveIntegerField(default=0, help_text='Later checks folded into this one instead of run separately.', verbose_name='Coalesced Checks'),
+        ),
+        migrations.AddField(
+            model_name='achievementcheck',
+            name='not_before',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Not Before'),
+        ),
+        migrations.AddConstraint(
+            model_name='achievementcheck',
+            constraint=models.UniqueConstraint(condition=models.Q(('attempts__lt', 5)), fields=('user', 'event_type', 'suchar'), name='achievement_check_one_pending', nulls_distinct=False),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.6 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0018_achievementcheck_coalescing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usermetrics',
+            name='streak_current',
+            field=models.IntegerField(default=0, verbose_name='Current Streak'),
+        ),
+        migrations.AddField(
+            model_name='usermetrics',
+            name='streak_last_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Last Active Day'),
+        ),
+        migrations.AddField(
+            model_name='usermetrics',
+            name='streak_longest',
+            field=models.IntegerField(default=0, verbose_name='Longest Streak'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+import datetime
+import zoneinfo
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models.functions import TruncDate
+
+_BATCH_SIZE = 1000
+
+
+def backfill_streaks(apps, schema_editor):
+    """Seed the streak fields from each author's distinct local posting days.
+
+    Mirrors ``metrics.compute_streaks`` against the historical models —
+    migrations must not import app code that can drift from this schema.
+    """
+    Suchar = apps.get_model("suchary", "Suchar")
+    UserMetrics = apps.get_model("achievements", "UserMetrics")
+
+    tz = zoneinfo.ZoneInfo(settings.TIME_ZONE)
+    active_days = (
+        Suchar.objects.annotate(day=TruncDate("created_at", tzinfo=tz))
+        .values_list("author_id", "day")
+        .distinct()
+        .order_by("author_id", "day")
+    )
+    rows = []
+    for author_id, days in groupby(active_days.iterator(), key=itemgetter(0)):
+        current = longest = 0
+        previous = None
+        for _, day in days:
+            if previous is not None and day - previous == datetime.timedelta(days=1):
+                current += 1
+            else:
+                current = 1
+            longest = max(longest, current)
+            previous = day
+        rows.append(
+            UserMetrics(
+                user_id=author_id,
+                streak_current=current,
+                streak_longest=longest,
+                streak_last_date=previous,
+            ),
+        )
+
+    UserMetrics.objects.bulk_update(
+        rows,
+        ["streak_current", "streak_longest", "streak_last_date"],
+        batch_size=_BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0019_usermetrics_streak"),
+        ("suchary", "0007_suchar_text_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_streaks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.6 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0020_usermetrics_streak_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usermetrics',
+            name='night_suchar_count',
+            field=models.IntegerField(default=0, verbose_name='Night Suchar Count'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+import zoneinfo
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import ExtractHour
+
+_BATCH_SIZE = 1000
+# Mirrors metrics.NIGHT_OWL_LAST_HOUR.
+_NIGHT_OWL_LAST_HOUR = 4
+
+
+def backfill_night_suchar_count(apps, schema_editor):
+    """Count each author's suchary written between midnight and the cutoff."""
+    Suchar = apps.get_model("suchary", "Suchar")
+    UserMetrics = apps.get_model("achievements", "UserMetrics")
+
+    tz = zoneinfo.ZoneInfo(settings.TIME_ZONE)
+    night_counts = (
+        Suchar.objects.annotate(local_hour=ExtractHour("created_at", tzinfo=tz))
+        .filter(local_hour__lte=_NIGHT_OWL_LAST_HOUR)
+        .values("author_id")
+        .annotate(n=Count("pk"))
+    )
+    rows = [
+        UserMetrics(user_id=row["author_id"], night_suchar_count=row["n"])
+        for row in night_counts
+    ]
+    UserMetrics.objects.bulk_update(
+        rows,
+        ["night_suchar_count"],
+        batch_size=_BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0021_usermetrics_night_suchar_count"),
+        ("suchary", "0007_suchar_text_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_night_suchar_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.9 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0022_usermetrics_night_suchar_count_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usermetrics',
+            name='balanced_best',
+            field=models.IntegerField(default=0, verbose_name='Best Balanced Suchar'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.db.models import F
+from django.db.models import Max
+
+_BATCH_SIZE = 1000
+
+
+def backfill_balanced_best(apps, schema_editor):
+    """Seed each author's best balance from the suchary balanced right now.
+
+    Balances reached and broken before this migration left no trace.
+    """
+    Suchar = apps.get_model("suchary", "Suchar")
+    UserMetrics = apps.get_model("achievements", "UserMetrics")
+
+    balanced = (
+        Suchar.objects.filter(funny_count=F("dry_count"), funny_count__gt=0)
+        .values("author_id")
+        .annotate(best=Max("funny_count"))
+    )
+    rows = [
+        UserMetrics(user_id=row["author_id"], balanced_best=row["best"])
+        for row in balanced
+    ]
+    UserMetrics.objects.bulk_update(rows, ["balanced_best"], batch_size=_BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("achievements", "0023_usermetrics_balanced_best"),
+        ("suchary", "0009_suchar_vote_tallies_data"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_balanced_best, migrations.RunPython.noop),
+    ]
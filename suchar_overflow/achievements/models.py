@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -127,6 +128,116 @@ class UserAchievement(models.Model):
         return f"{user_name} - {achievement_name}"
 
 
+class UserMetrics(models.Model):
+    """Denormalized per-user counters read by the count-based achievement rules.
+
+    Kept up to date incrementally by the receivers in ``signals.py`` so a rule
+    reads one row instead of re-counting the user's whole history on every
+    event. ``reconcile_user_metrics`` rebuilds rows from the source tables if
+    they ever drift (e.g. after a bulk ``QuerySet.update()`` in the shell).
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="metrics",
+    )
+    suchar_count = models.IntegerField(_("Suchar Count"), default=0)
+    vote_cast_count = models.IntegerField(_("Vote Cast Count"), default=0)
+    vote_funny_count = models.IntegerField(_("Funny Vote Count"), default=0)
+    vote_dry_count = models.IntegerField(_("Dry Vote Count"), default=0)
+    funny_received = models.IntegerField(_("Funny Votes Received"), default=0)
+    dry_received = models.IntegerField(_("Dry Votes Received"), default=0)
+    night_suchar_count = models.IntegerField(_("Night Suchar Count"), default=0)
+    # Consecutive local days with a new suchar, ending at streak_last_date.
+    streak_current = models.IntegerField(_("Current Streak"), default=0)
+    streak_longest = models.IntegerField(_("Longest Streak"), default=0)
+    streak_last_date = models.DateField(_("Last Active Day"), null=True, blank=True)
+    # Most funny votes one of the user's suchary had while it had as many dry
+    # ones, recorded at vote time: the balance may be gone by the next vote.
+    balanced_best = models.IntegerField(_("Best Balanced Suchar"), default=0)
+
+    class Meta:
+        verbose_name = _("User Metrics")
+        verbose_name_plural = _("User Metrics")
+
+    def __str__(self):
+        user_name = (
+            self.user.username
+            if "user" in self._state.fields_cache
+            else f"User #{self.user_id}"
+        )
+        return f"Metrics for {user_name}"
+
+    @property
+    def score_received(self):
+        return self.funny_received - self.dry_received
+
+
+# A check that keeps failing stops being retried and is left in the table for
+# inspection in the admin.
+MAX_CHECK_ATTEMPTS = 5
+
+
+class AchievementCheck(models.Model):
+    """Outbox row asking the worker to run the engine for one user event.
+
+    Written on commit by ``outbox.enqueue`` when ``ACHIEVEMENTS_ASYNC`` is on
+    and drained by the ``run_achievement_worker`` command, so votes and new
+    suchary don't wait on achievement SQL. At most one row is pending per
+    (user, event type, suchar): further events inside the coalescing window
+    only bump ``coalesced_count`` and are covered by the same evaluation.
+    """
+
+    MAX_ATTEMPTS = MAX_CHECK_ATTEMPTS
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="achievement_checks",
+    )
+    event_type = models.CharField(
+        _("Event Type"),
+        max_length=20,
+        choices=Achievement.EventType.choices,
+    )
+    # The suchar that triggered the event, for rules that inspect it (e.g.
+    # Night Owl looks at the post's hour).
+    suchar = models.ForeignKey(
+        "suchary.Suchar",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+    not_before = models.DateTimeField(_("Not Before"), default=timezone.now)
+    coalesced_count = models.PositiveIntegerField(
+        _("Coalesced Checks"),
+        default=0,
+        help_text=_("Later checks folded into this one instead of run separately."),
+    )
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+
+    class Meta:
+        ordering = ("id",)
+        constraints = [
+            # Given up checks (attempts == MAX_ATTEMPTS) don't block new ones.
+            models.UniqueConstraint(
+                fields=["user", "event_type", "suchar"],
+                condition=models.Q(attempts__lt=MAX_CHECK_ATTEMPTS),
+                nulls_distinct=False,
+                name="achievement_check_one_pending",
+            ),
+        ]
+        verbose_name = _("Achievement Check")
+        verbose_name_plural = _("Achievement Checks")
+
+    def __str__(self):
+        return f"{self.event_type} for User #{self.user_id}"
+
+
 class SchedulerRun(models.Model):
     """Last-run marker for an in-process apscheduler job.
 
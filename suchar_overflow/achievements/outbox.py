@@ -0,0 +1,188 @@
+"""Durable queue of achievement checks, drained by ``run_achievement_worker``.
+
+With ``ACHIEVEMENTS_ASYNC`` off (the default outside production) ``enqueue``
+simply runs the engine inline, which keeps tests and local development
+synchronous. With it on, the event is written to the ``AchievementCheck``
+outbox once the triggering transaction commits and the response returns
+straight away; the worker sets the same pending flag the SSE bell polls.
+
+Checks are coalesced: while a check for the same (user, event type, suchar)
+is still pending, a new event just bumps its ``coalesced_count``. A fresh
+check isn't claimable until ``ACHIEVEMENTS_COALESCE_WINDOW`` seconds have
+passed, so a burst of votes collapses into one evaluation that runs against
+the state left by the last of them. A failed check is retried after a
+delay doubling with each attempt (``backoff``), up to ``MAX_ATTEMPTS``.
+"""
+
+import contextlib
+import logging
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from suchar_overflow.suchary.models import Suchar
+
+from .engine import AchievementEngine
+from .models import AchievementCheck
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+EVALUATED_KEY = "achievements:checks_evaluated"
+COALESCED_KEY = "achievements:checks_coalesced"
+RETRY_DELAY = timedelta(seconds=30)
+
+
+# Set by ``adeferred``: inline checks are collected here instead of running.
+_deferred: ContextVar[list | None] = ContextVar("achievement_checks", default=None)
+
+
+def enqueue(user, event_type, instance=None) -> None:
+    """Evaluate ``event_type`` achievements for ``user``, now or in the worker."""
+    if not settings.ACHIEVEMENTS_ASYNC:
+        deferred = _deferred.get()
+        if deferred is not None:
+            deferred.append((user, event_type, instance))
+            return
+        AchievementEngine.check_achievements(user, event_type, instance)
+        return
+    _queue(user.pk, event_type, instance)
+
+
+def enqueue_for_user_id(user_id: int, event_type, instance=None) -> None:
+    """Like ``enqueue`` but by pk: the user is only loaded to run inline."""
+    if not settings.ACHIEVEMENTS_ASYNC:
+        enqueue(User.objects.get(pk=user_id), event_type, instance)
+        return
+    _queue(user_id, event_type, instance)
+
+
+def _queue(user_id: int, event_type, instance) -> None:
+    # Rules inspecting the event's suchar (Night Owl) get it; vote events
+    # are covered by counters recorded at vote time, so a burst of votes on
+    # any of the user's suchary coalesces into one check.
+    suchar_id = instance.pk if isinstance(instance, Suchar) else None
+    transaction.on_commit(lambda: _upsert(user_id, event_type, suchar_id))
+
+
+@contextlib.asynccontextmanager
+async def adeferred():
+    """Run the inline checks enqueued inside the block on the async engine.
+
+    An async view saving through ``sync_to_async`` triggers the signals in
+    that thread hop; inside this block they only record their checks, which
+    ``acheck_achievements`` evaluates once the block exits cleanly. With
+    ``ACHIEVEMENTS_ASYNC`` on, checks are queued as usual.
+    """
+    checks = []
+    token = _deferred.set(checks)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+    for user, event_type, instance in checks:
+        await AchievementEngine.acheck_achievements(user, event_type, instance)
+
+
+def _upsert(user_id: int, event_type: str, suchar_id: int | None) -> None:
+    pending = AchievementCheck.objects.filter(
+        user_id=user_id,
+        event_type=event_type,
+        suchar_id=suchar_id,
+        attempts__lt=AchievementCheck.MAX_ATTEMPTS,
+    )
+    # A check a worker is evaluating right now is row-locked: this UPDATE
+    # waits for it to finish, finds the row deleted and falls through to a
+    # new check, so events landing mid-evaluation are never lost.
+    if pending.update(coalesced_count=F("coalesced_count") + 1):
+        return
+    window = timedelta(seconds=settings.ACHIEVEMENTS_COALESCE_WINDOW)
+    try:
+        with transaction.atomic():
+            AchievementCheck.objects.create(
+                user_id=user_id,
+                event_type=event_type,
+                suchar_id=suchar_id,
+                not_before=timezone.now() + window,
+            )
+    except IntegrityError:
+        # Another request created it between our UPDATE and INSERT.
+        pending.update(coalesced_count=F("coalesced_count") + 1)
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before retrying a check that has failed ``attempts`` times before."""
+    return RETRY_DELAY * 2**attempts
+
+
+def process_next() -> bool:
+    """Claim and evaluate the oldest due check.
+
+    Returns ``False`` when there is nothing left to claim. Rows locked by
+    another worker are skipped, so any number of workers can drain the table
+    concurrently without evaluating the same check twice.
+    """
+    with transaction.atomic():
+        check = (
+            AchievementCheck.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("user", "suchar")
+            .filter(
+                attempts__lt=AchievementCheck.MAX_ATTEMPTS,
+                not_before__lte=timezone.now(),
+            )
+            .first()
+        )
+        if check is None:
+            return False
+        try:
+            with transaction.atomic():
+                AchievementEngine.check_achievements(
+                    check.user,
+                    check.event_type,
+                    check.suchar,
+                )
+        except Exception:
+            logger.exception("Achievement check #%s failed", check.pk)
+            AchievementCheck.objects.filter(pk=check.pk).update(
+                attempts=F("attempts") + 1,
+                not_before=timezone.now() + backoff(check.attempts),
+            )
+        else:
+            check.delete()
+            _count(EVALUATED_KEY, 1)
+            _count(COALESCED_KEY, check.coalesced_count)
+    return True
+
+
+def drain() -> int:
+    """Process due checks until none are left; return how many ran."""
+    processed = 0
+    while process_next():
+        processed += 1
+    return processed
+
+
+def _count(key: str, delta: int) -> None:
+    if not delta:
+        return
+    cache.add(key, 0, timeout=None)
+    # ValueError: evicted between add() and incr(); the stats are best-effort.
+    with contextlib.suppress(ValueError):
+        cache.incr(key, delta)
+
+
+def coalescing_stats() -> dict[str, int]:
+    """Checks evaluated by workers and checks saved by coalescing, so far."""
+    values = cache.get_many([EVALUATED_KEY, COALESCED_KEY])
+    return {
+        "evaluated": values.get(EVALUATED_KEY, 0),
+        "coalesced": values.get(COALESCED_KEY, 0),
+    }
@@ -1,41 +1,132 @@
+from django.conf import settings
+from django.db.models.signals import post_delete
 from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
 from django.dispatch import receiver
 
-from suchar_overflow.achievements.engine import AchievementEngine
+from suchar_overflow import conditional
+from suchar_overflow.achievements import catalog
+from suchar_overflow.achievements import metrics
+from suchar_overflow.achievements import outbox
+from suchar_overflow.achievements import targets
 from suchar_overflow.achievements.models import Achievement
+from suchar_overflow.achievements.models import UserAchievement
+from suchar_overflow.achievements.models import UserMetrics
 from suchar_overflow.suchary.models import Suchar
 from suchar_overflow.suchary.models import Vote
+from suchar_overflow.suchary.signals import cascaded
+from suchar_overflow.suchary.signals import flag_deltas
+from suchar_overflow.suchary.signals import vote_toggled
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_metrics(sender, instance, created, **kwargs):
+    if created:
+        UserMetrics.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def invalidate_achievement_catalog(sender, **kwargs):
+    catalog.invalidate()
+
+
+@receiver(post_save, sender=UserAchievement)
+@receiver(post_delete, sender=UserAchievement)
+def invalidate_next_targets(sender, instance, **kwargs):
+    targets.invalidate(instance.user_id)
+    conditional.touch_user(instance.user_id)
 
 
 @receiver(post_save, sender=Suchar)
 def check_suchar_achievements(sender, instance, created, **kwargs):
     if created:
+        metrics.record_suchar(instance)
         user = instance.author
-        AchievementEngine.check_achievements(
+        outbox.enqueue(
             user,
             Achievement.EventType.SUCHAR_POSTED,
             instance,
         )
 
 
+@receiver(pre_delete, sender=Suchar)
+def uncount_suchar_votes(sender, instance, **kwargs):
+    metrics.uncount_votes(Vote.objects.filter(suchar_id=instance.pk))
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def uncount_user_votes(sender, instance, **kwargs):
+    metrics.uncount_votes(Vote.objects.filter(user_id=instance.pk))
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def record_voted_balances(sender, instance, **kwargs):
+    # After suchary's ``recount_voted`` has recounted them without the user.
+    metrics.record_suchar_balances(getattr(instance, "voted_suchar_ids", ()))
+
+
+@receiver(post_delete, sender=Suchar)
+def uncount_suchar(sender, instance, **kwargs):
+    metrics.record_suchar(instance, sign=-1)
+
+
 @receiver(post_save, sender=Vote)
 def check_vote_achievements(sender, instance, created, **kwargs):
     if created:
-        # Check for voter
-        voter = instance.user
-        AchievementEngine.check_achievements(
-            voter,
-            Achievement.EventType.VOTE_CAST,
-            instance,
+        metrics.record_vote(instance)
+    else:
+        funny_delta, dry_delta = flag_deltas(instance)
+        if not funny_delta and not dry_delta:
+            return
+        metrics.record_vote_change(
+            instance.user_id,
+            instance.suchar.author_id,
+            funny_delta=funny_delta,
+            dry_delta=dry_delta,
         )
+    metrics.record_suchar_balance(instance.suchar_id)
 
-        # Check for author of the suchar (receiving vote)
-        author = instance.suchar.author
-        AchievementEngine.check_achievements(
-            author,
-            Achievement.EventType.VOTE_RECEIVED,
-            instance,
-        )
+    # Check for voter
+    voter = instance.user
+    outbox.enqueue(
+        voter,
+        Achievement.EventType.VOTE_CAST,
+        instance,
+    )
+
+    # Check for author of the suchar (receiving vote)
+    author = instance.suchar.author
+    outbox.enqueue(
+        author,
+        Achievement.EventType.VOTE_RECEIVED,
+        instance,
+    )
+
+
+@receiver(post_delete, sender=Vote)
+def uncount_vote(sender, instance, origin=None, **kwargs):
+    if cascaded(origin):
+        # Counted by ``uncount_suchar_votes`` or ``uncount_user_votes``.
+        return
+    metrics.record_vote(instance, sign=-1)
+    metrics.record_suchar_balance(instance.suchar_id)
+
+
+@receiver(vote_toggled)
+def check_vote_toggle_achievements(sender, vote, author_id, **kwargs):
+    metrics.record_vote_change(
+        vote.user_id,
+        author_id,
+        funny_delta=kwargs["funny_delta"],
+        dry_delta=kwargs["dry_delta"],
+        cast_delta=int(kwargs["created"]) - int(kwargs["deleted"]),
+    )
+    metrics.record_balance(author_id, kwargs["funny_count"], kwargs["dry_count"])
+    # Every flip moves the voter's funny/dry counts and the author's received
+    # ones, so both sides are checked, not only on the first click.
+    outbox.enqueue(vote.user, Achievement.EventType.VOTE_CAST, vote)
+    outbox.enqueue_for_user_id(author_id, Achievement.EventType.VOTE_RECEIVED, vote)
 
 
 # Note: EventType updates are handled in models.py.
@@ -0,0 +1,89 @@
+"""Per-user index of the next threshold each metric has to reach.
+
+For every metric the index holds the lowest threshold among the user's
+unearned, engine-awarded achievements; a metric the user has maxed out is
+absent. The engine compares the metric's value against it and stops there,
+without loading the user's awards or touching the candidate achievements,
+whenever nothing can possibly unlock — which is the case for most events.
+
+Entries are keyed by the catalog version, so editing an Achievement retires
+every index at once. Awarding or revoking a UserAchievement drops the user's
+entry (see ``signals.py``; the engine's own bulk insert does it directly).
+"""
+
+from django.core.cache import cache
+
+from .catalog import AchievementCatalog
+from .catalog import aget_catalog
+from .catalog import get_catalog
+from .models import Achievement
+from .models import UserAchievement
+
+TIMEOUT = 60 * 60 * 24
+
+
+def _key(version: str, user_id: int) -> str:
+    return f"achievements_next:{version}:{user_id}"
+
+
+def _build(catalog: AchievementCatalog, awarded: set[int]) -> dict[str, int]:
+    targets = {}
+    for metric, achievements in catalog.by_metric.items():
+        unmet = [
+            achievement.threshold
+            for achievement in achievements
+            if achievement.id not in awarded
+            and achievement.category != Achievement.Category.PERIODIC
+        ]
+        if unmet:
+            targets[metric] = min(unmet)
+    return targets
+
+
+def next_targets(user, catalog: AchievementCatalog) -> dict[str, int]:
+    """Return ``{metric: lowest unmet threshold}`` for ``user``."""
+    key = _key(catalog.version, user.pk)
+    targets = cache.get(key)
+    if targets is None:
+        awarded = set(
+            UserAchievement.objects.filter(user=user).values_list(
+                "achievement_id",
+                flat=True,
+            ),
+        )
+        targets = _build(catalog, awarded)
+        cache.set(key, targets, timeout=TIMEOUT)
+    return targets
+
+
+async def anext_targets(user, catalog: AchievementCatalog) -> dict[str, int]:
+    """Async ``next_targets``."""
+    key = _key(catalog.version, user.pk)
+    targets = await cache.aget(key)
+    if targets is None:
+        awarded = {
+            achievement_id
+            async for achievement_id in UserAchievement.objects.filter(
+                user=user,
+            ).values_list("achievement_id", flat=True)
+        }
+        targets = _build(catalog, awarded)
+        await cache.aset(key, targets, timeout=TIMEOUT)
+    return targets
+
+
+def invalidate(user_id: int) -> None:
+    """Drop ``user_id``'s index so it is rebuilt on the next event."""
+    cache.delete(_key(get_catalog().version, user_id))
+
+
+async def ainvalidate(user_id: int) -> None:
+    """Async ``invalidate``."""
+    catalog = await aget_catalog()
+    await cache.adelete(_key(catalog.version, user_id))
+
+
+def invalidate_many(user_ids) -> None:
+    """Drop the index of every user in ``user_ids`` (e.g. after a backfill)."""
+    version = get_catalog().version
+    cache.delete_many([_key(version, user_id) for user_id in user_ids])
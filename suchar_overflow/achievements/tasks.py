@@ -6,11 +6,11 @@ from typing import TYPE_CHECKING
 
 from django.db import close_old_connections
 from django.db import connection
-from django.db.models import Count
+from django.db.models import F
 from django.db.models import Max
 from django.utils import timezone
 
-from suchar_overflow.achievements.models import Achievement
+from suchar_overflow.achievements.catalog import get_catalog
 from suchar_overflow.achievements.models import SchedulerRun
 from suchar_overflow.achievements.models import UserAchievement
 from suchar_overflow.suchary.models import Suchar
@@ -93,7 +93,7 @@ def find_best_suchary(start_dt: datetime, end_dt: datetime) -> list[Suchar]:
             created_at__gte=start_dt,
             created_at__lt=end_dt,
         )
-        .annotate(vote_count=Count("votes"))
+        .annotate(vote_count=F("score"))
         .select_related("author")
     )
     max_votes = candidates.aggregate(max_votes=Max("vote_count"))["max_votes"]
@@ -123,9 +123,8 @@ def award_winners(winners: list[Suchar], suffix: str) -> list[tuple[str, User, b
 
 
 def _award_achievement(slug: str, users: set[User]) -> list[tuple[str, User, bool]]:
-    try:
-        achievement = Achievement.objects.get(slug=slug)
-    except Achievement.DoesNotExist:
+    achievement = get_catalog().by_slug.get(slug)
+    if achievement is None:
         logger.warning(
             "Achievement with slug '%s' not found; skipping award for %s",
             slug,
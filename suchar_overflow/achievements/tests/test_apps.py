@@ -6,6 +6,7 @@ import pytest
 from django.contrib.auth import get_user_model
 
 from suchar_overflow.achievements.apps import AchievementsConfig
+from suchar_overflow.achievements.apps import with_fresh_connections
 from suchar_overflow.achievements.models import SchedulerRun
 from suchar_overflow.achievements.models import UserAchievement
 from suchar_overflow.suchary.models import Suchar
@@ -162,6 +163,29 @@ def test_start_scheduler_starts_even_if_catch_up_raises(caplog):
     ):
         AchievementsConfig._start_scheduler()  # noqa: SLF001
 
-    mock_scheduler_cls.return_value.add_job.assert_called_once()
+    job_ids = {
+        call.kwargs["id"]
+        for call in mock_scheduler_cls.return_value.add_job.call_args_list
+    }
+    assert job_ids == {"award-best-suchar-month", "suchary-publication-tick"}
     mock_scheduler_cls.return_value.start.assert_called_once()
     assert "boom" in caplog.text
+
+
+def test_with_fresh_connections_closes_old_connections_around_the_job():
+    calls = []
+    with patch(
+        "suchar_overflow.achievements.apps.close_old_connections",
+        side_effect=lambda: calls.append("close"),
+    ):
+        job = with_fresh_connections(lambda: calls.append("job"))
+        job()
+
+        def failing():
+            calls.append("failing")
+            raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            with_fresh_connections(failing)()
+
+    assert calls == ["close", "job", "close", "close", "failing", "close"]
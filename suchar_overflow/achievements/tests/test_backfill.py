@@ -0,0 +1,199 @@
+"""Tests for retroactive, set-based achievement awarding."""
+
+import datetime
+import io
+
+import pytest
+from django.contrib.admin.sites import AdminSite
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from suchar_overflow.achievements.admin import AchievementAdmin
+from suchar_overflow.achievements.backfill import backfill_achievements
+from suchar_overflow.achievements.engine import AchievementEngine
+from suchar_overflow.achievements.metrics import rebuild_user_metrics
+from suchar_overflow.achievements.models import Achievement
+from suchar_overflow.achievements.models import UserAchievement
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Vote
+
+
+def make_achievement(slug, metric, threshold, **kwargs):
+    return Achievement.objects.create(
+        name=slug,
+        slug=slug,
+        description="",
+        icon_content="",
+        metric=metric,
+        threshold=threshold,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def posters(db):
+    """Three authors with one, two and three suchary."""
+    users = [make_user(f"poster{n}") for n in range(1, 4)]
+    for n, user in enumerate(users, start=1):
+        for i in range(n):
+            Suchar.objects.create(text=f"{user.username} {i}", author=user)
+    return users
+
+
+def awarded_usernames(achievement):
+    return set(
+        UserAchievement.objects.filter(achievement=achievement).values_list(
+            "user__username",
+            flat=True,
+        ),
+    )
+
+
+@pytest.mark.django_db
+def test_backfill_awards_every_qualifying_user_per_tier(posters):
+    silver = make_achievement("posts-2", Achievement.Metric.COUNT_SUCHAR, 2)
+    gold = make_achievement("posts-3", Achievement.Metric.COUNT_SUCHAR, 3)
+    cache.clear()  # drop flags from the engine run on each new suchar
+
+    awarded = backfill_achievements([silver, gold])
+
+    assert awarded == {"posts-2": 2, "posts-3": 1}
+    assert awarded_usernames(silver) == {"poster2", "poster3"}
+    assert awarded_usernames(gold) == {"poster3"}
+    assert cache.get(f"achievements_pending:{posters[2].pk}") is True
+    assert cache.get(f"achievements_pending:{posters[0].pk}") is None
+
+
+@pytest.mark.django_db
+def test_backfill_uses_one_values_query_per_metric(posters):
+    tiers = [
+        make_achievement(f"posts-{t}", Achievement.Metric.COUNT_SUCHAR, t)
+        for t in (1, 2, 3)
+    ]
+
+    with CaptureQueriesContext(connection) as ctx:
+        backfill_achievements(tiers)
+
+    sqls = [q["sql"] for q in ctx.captured_queries]
+    assert len([sql for sql in sqls if '"achievements_usermetrics"' in sql]) == 1
+    assert len([sql for sql in sqls if sql.startswith("INSERT")]) == 1
+
+
+@pytest.mark.django_db
+def test_backfill_skips_users_who_already_have_it(posters):
+    achievement = make_achievement("posts-2", Achievement.Metric.COUNT_SUCHAR, 2)
+    UserAchievement.objects.create(user=posters[2], achievement=achievement)
+
+    assert backfill_achievements([achievement]) == {"posts-2": 1}
+    assert backfill_achievements([achievement]) == {"posts-2": 0}
+
+
+@pytest.mark.django_db
+def test_backfill_dry_run_writes_nothing(posters):
+    achievement = make_achievement("posts-2", Achievement.Metric.COUNT_SUCHAR, 2)
+
+    assert backfill_achievements([achievement], dry_run=True) == {"posts-2": 2}
+    assert not UserAchievement.objects.filter(achievement=achievement).exists()
+
+
+@pytest.mark.django_db
+def test_backfill_skips_periodic_and_frontend_achievements(posters):
+    periodic = make_achievement(
+        "periodic",
+        Achievement.Metric.SUM_SCORE,
+        0,
+        category=Achievement.Category.PERIODIC,
+    )
+    frontend = make_achievement("frontend", Achievement.Metric.FRONTEND_EVENT, 1)
+
+    assert backfill_achievements([periodic, frontend]) == {}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "metric",
+    [
+        Achievement.Metric.COUNT_SUCHAR,
+        Achievement.Metric.COUNT_VOTE_FUNNY,
+        Achievement.Metric.COUNT_VOTE_DRY,
+        Achievement.Metric.COUNT_VOTE_CAST,
+        Achievement.Metric.SUM_SCORE,
+        Achievement.Metric.POLARIZER,
+        Achievement.Metric.STREAK_LOGIN,
+        Achievement.Metric.NIGHT_OWL,
+    ],
+)
+def test_values_by_user_matches_per_user_compute(metric):
+    alice = make_user("alice")
+    bob = make_user("bob")
+    carol = make_user("carol")
+    today = timezone.localtime().replace(hour=2, minute=0)
+    for days_ago, author in [(0, alice), (1, alice), (3, alice), (0, bob)]:
+        suchar = Suchar.objects.create(text="x", author=author)
+        Suchar.objects.filter(pk=suchar.pk).update(
+            created_at=today - datetime.timedelta(days=days_ago),
+        )
+    rebuild_user_metrics([alice.pk, bob.pk, carol.pk])
+    alice_suchar = Suchar.objects.filter(author=alice).first()
+    bob_suchar = Suchar.objects.get(author=bob)
+    Vote.objects.create(suchar=alice_suchar, user=bob, is_funny=True)
+    Vote.objects.create(suchar=alice_suchar, user=carol, is_dry=True)
+    Vote.objects.create(suchar=bob_suchar, user=alice, is_funny=True)
+    Vote.objects.create(suchar=bob_suchar, user=carol, is_funny=True)
+
+    rule = AchievementEngine.rule_for(metric)
+    values = dict(rule.values_by_user(1))
+
+    for user in (alice, bob, carol):
+        instance = Suchar.objects.filter(author=user).first()
+        expected = rule.compute(user, instance) or 0
+        assert values.get(user.pk, 0) == expected, user.username
+
+
+@pytest.mark.django_db
+def test_backfill_command_filters_by_metric(posters):
+    posts = make_achievement("posts-2", Achievement.Metric.COUNT_SUCHAR, 2)
+    score = make_achievement("score-1", Achievement.Metric.SUM_SCORE, 1)
+    out = io.StringIO()
+
+    call_command(
+        "backfill_achievements",
+        "posts-2",
+        "score-1",
+        "--metric",
+        "COUNT_SUCHAR",
+        stdout=out,
+    )
+
+    assert awarded_usernames(posts) == {"poster2", "poster3"}
+    assert not awarded_usernames(score)
+    assert "Awarded 2 achievements across 1 achievement types." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_backfill_command_rejects_unknown_slug():
+    with pytest.raises(CommandError, match="no-such-slug"):
+        call_command("backfill_achievements", "no-such-slug", stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+def test_admin_action_backfills_selected_achievements(posters):
+    achievement = make_achievement("posts-3", Achievement.Metric.COUNT_SUCHAR, 3)
+    request = RequestFactory().post("/")
+    request.session = {}
+    request._messages = FallbackStorage(request)  # noqa: SLF001
+    model_admin = AchievementAdmin(Achievement, AdminSite())
+
+    model_admin.award_to_qualifying_users(
+        request,
+        Achievement.objects.filter(pk=achievement.pk),
+    )
+
+    assert awarded_usernames(achievement) == {"poster3"}
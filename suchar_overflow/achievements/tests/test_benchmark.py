@@ -0,0 +1,83 @@
+"""Tests for the synthetic-data engine benchmark."""
+
+import io
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from suchar_overflow.achievements import benchmark
+from suchar_overflow.achievements.models import Achievement
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Vote
+
+
+@pytest.mark.django_db
+def test_benchmark_command_writes_results_and_rolls_back(tmp_path):
+    Achievement.objects.create(
+        name="Voter",
+        slug="bench-voter",
+        description="",
+        icon_content="",
+        event_type=Achievement.EventType.VOTE_CAST,
+        metric=Achievement.Metric.COUNT_VOTE_CAST,
+        threshold=3,
+    )
+    output = tmp_path / "results.json"
+    cache.clear()
+
+    call_command(
+        "benchmark_achievements",
+        "--votes",
+        "300",
+        "--samples",
+        "5",
+        "--label",
+        "test",
+        "--output",
+        str(output),
+        "--yes-i-mean-it",
+        stdout=io.StringIO(),
+    )
+
+    results = json.loads(output.read_text())
+    assert results["meta"]["label"] == "test"
+    scale = results["scales"]["300"]
+    assert scale["dataset"]["votes"] == 300  # noqa: PLR2004
+    assert set(scale["check_achievements"]) == set(Achievement.EventType.values)
+    assert scale["rules"]["PolarizerRule"]["n"] == 5  # noqa: PLR2004
+    assert "COUNT_VOTE_CAST" in scale["backfill"]["values_by_user"]
+    assert not Vote.objects.exists()
+    assert not Suchar.objects.exists()
+    # The synthetic awards and votes wrote nothing to the shared cache.
+    assert not cache._cache  # noqa: SLF001
+
+
+@pytest.mark.django_db
+def test_benchmark_command_refuses_to_run_without_debug():
+    with pytest.raises(CommandError, match="--yes-i-mean-it"):
+        call_command("benchmark_achievements", "--votes", "10", stdout=io.StringIO())
+    assert not Suchar.objects.exists()
+
+
+def test_compare_reports_regressions_worst_first():
+    def results(cast_ms, posted_ms):
+        return {
+            "scales": {
+                "1000": {
+                    "check_achievements": {
+                        "VOTE_CAST": {"mean_ms": cast_ms},
+                        "SUCHAR_POSTED": {"mean_ms": posted_ms},
+                    },
+                },
+            },
+        }
+
+    rows = benchmark.compare(results(1.0, 2.0), results(1.5, 1.0))
+
+    assert rows == [
+        ("1000/check_achievements/VOTE_CAST", 1.0, 1.5, 0.5),
+        ("1000/check_achievements/SUCHAR_POSTED", 2.0, 1.0, -0.5),
+    ]
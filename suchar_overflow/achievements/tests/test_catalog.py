@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from suchar_overflow.achievements.catalog import get_catalog
+from suchar_overflow.achievements.models import Achievement
+
+
+def _make(slug, **kwargs):
+    defaults = {
+        "name": slug,
+        "slug": slug,
+        "description": "",
+        "icon_content": "",
+        "category": Achievement.Category.LIFETIME,
+        "event_type": Achievement.EventType.SUCHAR_POSTED,
+        "metric": Achievement.Metric.COUNT_SUCHAR,
+        "threshold": 1,
+    }
+    defaults.update(kwargs)
+    return Achievement.objects.create(**defaults)
+
+
+@pytest.mark.django_db
+def test_warm_catalog_issues_no_queries():
+    _make("first-post")
+    get_catalog()
+
+    with CaptureQueriesContext(connection) as ctx:
+        catalog = get_catalog()
+
+    assert len(ctx.captured_queries) == 0
+    assert "first-post" in catalog.by_slug
+
+
+@pytest.mark.django_db
+def test_catalog_reloads_after_achievement_saved_and_deleted():
+    achievement = _make("first-post")
+    assert get_catalog().by_slug["first-post"].threshold == 1
+
+    achievement.threshold = 5
+    achievement.save()
+    assert get_catalog().by_slug["first-post"].threshold == 5  # noqa: PLR2004
+
+    achievement.delete()
+    assert "first-post" not in get_catalog().by_slug
+
+
+@pytest.mark.django_db
+def test_for_event_excludes_periodic_achievements():
+    _make("first-post")
+    _make(
+        "best-of-month",
+        category=Achievement.Category.PERIODIC,
+        metric=Achievement.Metric.COUNT_SUCHAR,
+    )
+
+    slugs = {
+        achievement.slug
+        for achievement in get_catalog().for_event(
+            Achievement.EventType.SUCHAR_POSTED,
+        )
+    }
+
+    assert "first-post" in slugs
+    assert "best-of-month" not in slugs
@@ -11,6 +11,7 @@ from suchar_overflow.achievements.engine import NightOwlRule
 from suchar_overflow.achievements.engine import PolarizerRule
 from suchar_overflow.achievements.engine import StreakLoginRule
 from suchar_overflow.achievements.engine import VoteDryCountRule
+from suchar_overflow.achievements.metrics import rebuild_user_metrics
 from suchar_overflow.achievements.models import Achievement
 from suchar_overflow.achievements.models import UserAchievement
 from suchar_overflow.conftest import make_user
@@ -143,6 +144,29 @@ def test_polarizer_rule_engine_awards_achievement():
     assert UserAchievement.objects.filter(user=user, achievement=ach).exists()
 
 
+@pytest.mark.django_db
+def test_polarizer_rule_remembers_a_balance_broken_later():
+    user = make_user("u1")
+    suchar = Suchar.objects.create(text="joke", author=user)
+    Vote.objects.create(suchar=suchar, user=make_user("vf"), is_funny=True)
+    Vote.objects.create(suchar=suchar, user=make_user("vd"), is_dry=True)
+    Vote.objects.create(suchar=suchar, user=make_user("vo"), is_funny=True)
+
+    assert PolarizerRule.compute(user) == 1
+    assert PolarizerRule.evaluate(user, threshold=1)
+    assert not PolarizerRule.evaluate(user, threshold=2)
+
+
+@pytest.mark.django_db
+def test_polarizer_rule_ignores_suchar_of_another_author():
+    user = make_user("u1")
+    suchar = Suchar.objects.create(text="joke", author=make_user("someone"))
+    Vote.objects.create(suchar=suchar, user=make_user("vf"), is_funny=True)
+    Vote.objects.create(suchar=suchar, user=make_user("vd"), is_dry=True)
+
+    assert PolarizerRule.compute(user, suchar) == 0
+
+
 # ---------------------------------------------------------------------------
 # StreakLoginRule
 # ---------------------------------------------------------------------------
@@ -171,6 +195,7 @@ def test_streak_rule_true_for_consecutive_days():
         created_at=today - datetime.timedelta(days=1),
     )
     Suchar.objects.filter(pk=s2.pk).update(created_at=today)
+    rebuild_user_metrics([user.pk])
     assert StreakLoginRule.evaluate(user, threshold=2)
 
 
@@ -184,6 +209,7 @@ def test_streak_rule_false_when_gap_in_days():
         created_at=today - datetime.timedelta(days=2),
     )
     Suchar.objects.filter(pk=s2.pk).update(created_at=today)
+    rebuild_user_metrics([user.pk])
     # gap: 2 days apart → no 2-day streak
     assert not StreakLoginRule.evaluate(user, threshold=2)
 
@@ -199,6 +225,7 @@ def test_streak_rule_counts_only_longest_leading_streak():
         Suchar.objects.filter(pk=s.pk).update(
             created_at=today - datetime.timedelta(days=offset),
         )
+    rebuild_user_metrics([user.pk])
     assert not StreakLoginRule.evaluate(user, threshold=3)
     assert StreakLoginRule.evaluate(user, threshold=2)
 
@@ -219,6 +246,7 @@ def test_streak_rule_engine_awards_achievement():
         created_at=today - datetime.timedelta(days=1),
     )
     Suchar.objects.filter(pk=s2.pk).update(created_at=today)
+    rebuild_user_metrics([user.pk])
     AchievementEngine.check_achievements(user, Achievement.EventType.SUCHAR_POSTED)
     assert UserAchievement.objects.filter(user=user, achievement=ach).exists()
 
@@ -235,6 +263,7 @@ def _make_night_suchar(user, hour=2):
     suchar = Suchar.objects.create(text=f"night joke h{hour}", author=user)
     ts = timezone.now().replace(hour=hour, minute=0, second=0, microsecond=0)
     Suchar.objects.filter(pk=suchar.pk).update(created_at=ts)
+    rebuild_user_metrics([user.pk])
     suchar.refresh_from_db()
     return suchar
 
@@ -244,6 +273,7 @@ def _make_day_suchar(user):
     suchar = Suchar.objects.create(text="day joke", author=user)
     ts = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
     Suchar.objects.filter(pk=suchar.pk).update(created_at=ts)
+    rebuild_user_metrics([user.pk])
     suchar.refresh_from_db()
     return suchar
 
@@ -0,0 +1,166 @@
+"""Tests for the async achievement engine API."""
+
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+
+from suchar_overflow.achievements import instrumentation
+from suchar_overflow.achievements import outbox
+from suchar_overflow.achievements.engine import AchievementEngine
+from suchar_overflow.achievements.engine import PolarizerRule
+from suchar_overflow.achievements.models import Achievement
+from suchar_overflow.achievements.models import UserAchievement
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Vote
+
+
+def make_achievement(slug, metric, event_type, threshold=1):
+    return Achievement.objects.create(
+        name=slug,
+        slug=slug,
+        description="",
+        icon_content="",
+        event_type=event_type,
+        metric=metric,
+        threshold=threshold,
+    )
+
+
+@sync_to_async
+def post_suchar(user):
+    # Saved with the inline checks deferred, as an async view would.
+    return Suchar.objects.create(text="joke", author=user)
+
+
+@pytest.mark.anyio
+@pytest.mark.django_db(transaction=True)
+async def test_acheck_achievements_awards_and_sets_pending_flag():
+    achievement = await sync_to_async(make_achievement)(
+        "first-post",
+        Achievement.Metric.COUNT_SUCHAR,
+        Achievement.EventType.SUCHAR_POSTED,
+    )
+    user = await sync_to_async(make_user)("author")
+
+    async with outbox.adeferred():
+        suchar = await post_suchar(user)
+        assert not await UserAchievement.objects.filter(user=user).aexists()
+
+    assert await UserAchievement.objects.filter(
+        user=user,
+        achievement=achievement,
+    ).aexists()
+    assert await cache.aget(f"achievements_pending:{user.pk}") is True
+
+    # Already awarded: a second run writes nothing.
+    await AchievementEngine.acheck_achievements(
+        user,
+        Achievement.EventType.SUCHAR_POSTED,
+        suchar,
+    )
+    assert await UserAchievement.objects.filter(user=user).acount() == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.django_db(transaction=True)
+async def test_acheck_achievements_counts_the_rules_queries():
+    await sync_to_async(make_achievement)(
+        "posts-5",
+        Achievement.Metric.COUNT_SUCHAR,
+        Achievement.EventType.SUCHAR_POSTED,
+        threshold=5,
+    )
+    user = await sync_to_async(make_user)("author")
+    suchar = await sync_to_async(Suchar.objects.create)(text="joke", author=user)
+    await sync_to_async(instrumentation.reset)()
+
+    await AchievementEngine.acheck_achievements(
+        user,
+        Achievement.EventType.SUCHAR_POSTED,
+        suchar,
+    )
+
+    stats = await sync_to_async(instrumentation.snapshot)()
+    not_yet = stats[
+        "SucharCountRule",
+        Achievement.EventType.SUCHAR_POSTED,
+        instrumentation.NOT_YET,
+    ]
+    assert not_yet.count == 1
+    # The rule's queries ran on the sync_to_async thread, and still count.
+    assert not_yet.queries_sum >= 1
+    # The counting hook was only there while the rules ran.
+    assert await sync_to_async(lambda: connection.execute_wrappers)() == []
+
+
+@pytest.mark.anyio
+@pytest.mark.django_db(transaction=True)
+async def test_adeferred_skips_checks_when_the_block_raises():
+    await sync_to_async(make_achievement)(
+        "first-post",
+        Achievement.Metric.COUNT_SUCHAR,
+        Achievement.EventType.SUCHAR_POSTED,
+    )
+    user = await sync_to_async(make_user)("author")
+
+    async def post_then_fail():
+        async with outbox.adeferred():
+            await post_suchar(user)
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        await post_then_fail()
+
+    assert not await UserAchievement.objects.filter(user=user).aexists()
+
+
+@pytest.mark.anyio
+@pytest.mark.django_db(transaction=True)
+async def test_polarizer_acompute_matches_compute():
+    @sync_to_async
+    def setup():
+        author = make_user("author")
+        suchar = Suchar.objects.create(text="joke", author=author)
+        Vote.objects.create(suchar=suchar, user=make_user("vf"), is_funny=True)
+        vote = Vote.objects.create(suchar=suchar, user=make_user("vd"), is_dry=True)
+        return author, vote
+
+    author, vote = await setup()
+
+    assert await PolarizerRule.acompute(author, vote) == 1
+    assert await PolarizerRule.acompute(author) == 1
+    assert await sync_to_async(PolarizerRule.compute)(author, vote) == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.django_db(transaction=True)
+async def test_create_view_evaluates_achievements_on_the_async_engine(async_client):
+    achievement = await sync_to_async(make_achievement)(
+        "first-post",
+        Achievement.Metric.COUNT_SUCHAR,
+        Achievement.EventType.SUCHAR_POSTED,
+    )
+    user = await sync_to_async(make_user)("author")
+    await async_client.aforce_login(user)
+
+    with patch.object(
+        AchievementEngine,
+        "check_achievements",
+        side_effect=AssertionError("sync engine used"),
+    ):
+        response = await async_client.post(
+            reverse("suchary:add"),
+            {"text": "A brand new suchar"},
+        )
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert await UserAchievement.objects.filter(
+        user=user,
+        achievement=achievement,
+    ).aexists()
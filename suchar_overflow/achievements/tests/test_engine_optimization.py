@@ -62,3 +62,113 @@ class TestAchievementEngineOptimizations:
             user=user,
             achievement__metric=Achievement.Metric.SUM_SCORE,
         ).exists()
+
+    def test_tier_ladder_evaluated_once_and_awarded_in_one_insert(self):
+        user = User.objects.create_user(
+            username="ladder",
+            email="ladder@a.com",
+            password="123",  # noqa: S106
+        )
+        for threshold in [1, 2, 3, 50, 100]:
+            Achievement.objects.create(
+                name=f"Polarizer {threshold}",
+                slug=f"polarizer-ladder-{threshold}",
+                description="",
+                icon_content="",
+                event_type=Achievement.EventType.VOTE_RECEIVED,
+                metric=Achievement.Metric.POLARIZER,
+                threshold=threshold,
+            )
+        suchar = Suchar.objects.create(text="Balanced", author=user)
+        for i in range(3):
+            voter = User.objects.create_user(
+                username=f"ladder-funny-{i}",
+                email=f"ladder-funny-{i}@a.com",
+                password="123",  # noqa: S106
+            )
+            Vote.objects.create(suchar=suchar, user=voter, is_funny=True)
+            voter = User.objects.create_user(
+                username=f"ladder-dry-{i}",
+                email=f"ladder-dry-{i}@a.com",
+                password="123",  # noqa: S106
+            )
+            Vote.objects.create(suchar=suchar, user=voter, is_dry=True)
+        UserAchievement.objects.filter(user=user).delete()
+
+        with CaptureQueriesContext(connection) as ctx:
+            AchievementEngine.check_achievements(
+                user,
+                Achievement.EventType.VOTE_RECEIVED,
+            )
+
+        sqls = [q["sql"] for q in ctx.captured_queries]
+        vote_scans = [sql for sql in sqls if '"suchary_vote"' in sql]
+        inserts = [sql for sql in sqls if sql.startswith("INSERT")]
+        assert not vote_scans  # the stored per-suchar tallies are read instead
+        assert len(inserts) == 1
+        awarded = set(
+            UserAchievement.objects.filter(
+                user=user,
+                achievement__metric=Achievement.Metric.POLARIZER,
+            ).values_list("achievement__threshold", flat=True),
+        )
+        assert awarded == {1, 2, 3}
+
+    def test_counter_below_next_threshold_skips_award_lookup(self):
+        Achievement.objects.all().delete()
+        for threshold in [5, 10]:
+            Achievement.objects.create(
+                name=f"Poster {threshold}",
+                slug=f"poster-{threshold}",
+                description="",
+                icon_content="",
+                event_type=Achievement.EventType.SUCHAR_POSTED,
+                metric=Achievement.Metric.COUNT_SUCHAR,
+                threshold=threshold,
+            )
+        user = User.objects.create_user(
+            username="far",
+            email="far@a.com",
+            password="123",  # noqa: S106
+        )
+        # Creating the suchar runs the engine once, warming the index.
+        Suchar.objects.create(text="One", author=user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            AchievementEngine.check_achievements(
+                user,
+                Achievement.EventType.SUCHAR_POSTED,
+            )
+
+        # Only the user's metrics row is read.
+        assert len(ctx.captured_queries) == 1
+        assert '"achievements_usermetrics"' in ctx.captured_queries[0]["sql"]
+
+    def test_revoked_award_is_granted_again(self):
+        user = User.objects.create_user(
+            username="revoked",
+            email="revoked@a.com",
+            password="123",  # noqa: S106
+        )
+        achievement = Achievement.objects.create(
+            name="Poster",
+            slug="poster-revoked",
+            description="",
+            icon_content="",
+            event_type=Achievement.EventType.SUCHAR_POSTED,
+            metric=Achievement.Metric.COUNT_SUCHAR,
+            threshold=1,
+        )
+        Suchar.objects.create(text="One", author=user)
+        awarded = UserAchievement.objects.get(user=user, achievement=achievement)
+
+        awarded.delete()
+        AchievementEngine.check_achievements(
+            user,
+            Achievement.EventType.SUCHAR_POSTED,
+        )
+
+        assert UserAchievement.objects.filter(
+            user=user,
+            achievement=achievement,
+        ).exists()
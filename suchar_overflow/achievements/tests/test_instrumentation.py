@@ -0,0 +1,152 @@
+"""Tests for the per-rule timing and query-count instrumentation."""
+
+import io
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from suchar_overflow.achievements import instrumentation
+from suchar_overflow.achievements.models import Achievement
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary.models import Suchar
+
+METRICS_URL = "/api/achievements/metrics"
+POSTED = Achievement.EventType.SUCHAR_POSTED
+RECEIVED = Achievement.EventType.VOTE_RECEIVED
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats(db):
+    instrumentation.reset()
+
+
+@pytest.fixture(autouse=True)
+def achievements(db):
+    for slug, event_type, metric, threshold in [
+        ("posts-1", POSTED, Achievement.Metric.COUNT_SUCHAR, 1),
+        ("posts-5", POSTED, Achievement.Metric.COUNT_SUCHAR, 5),
+        ("night-1", POSTED, Achievement.Metric.NIGHT_OWL, 1),
+        ("polarizer-1", RECEIVED, Achievement.Metric.POLARIZER, 1),
+        ("score-1", RECEIVED, Achievement.Metric.SUM_SCORE, 1),
+    ]:
+        Achievement.objects.create(
+            name=slug,
+            slug=slug,
+            description="",
+            icon_content="",
+            event_type=event_type,
+            metric=metric,
+            threshold=threshold,
+        )
+
+
+def post_suchary(user, count):
+    for i in range(count):
+        Suchar.objects.create(text=f"joke {i}", author=user)
+
+
+def test_rule_stats_buckets_and_quantile():
+    stats = instrumentation.RuleStats()
+    for duration in (0.0005, 0.003, 0.003, 2.0):
+        stats.observe(duration, queries=1)
+
+    assert stats.count == 4  # noqa: PLR2004
+    assert stats.duration_buckets[0] == 1
+    assert stats.duration_buckets[-1] == 1
+    assert stats.duration_quantile(0.5) == 0.005  # noqa: PLR2004
+    assert stats.duration_quantile(1.0) == float("inf")
+    assert instrumentation.RuleStats.from_counters(stats.to_counters()).count == 4  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_engine_records_outcome_and_queries_per_rule():
+    user = make_user("author")
+    post_suchary(user, 2)
+
+    stats = instrumentation.snapshot()
+
+    awarded = stats["SucharCountRule", POSTED, instrumentation.AWARDED]
+    not_yet = stats["SucharCountRule", POSTED, instrumentation.NOT_YET]
+    assert awarded.count == 1  # first post
+    assert not_yet.count == 1  # second post, still short of five
+    assert not_yet.queries_sum >= 1
+    # A daytime post is skipped by Night Owl without computing anything.
+    assert ("NightOwlRule", POSTED, instrumentation.SKIPPED) in stats
+
+
+@pytest.mark.django_db
+def test_flush_is_deferred_until_interval_elapses(monkeypatch):
+    monkeypatch.setattr(instrumentation, "FLUSH_INTERVAL", 3600)
+    instrumentation.flush(force=True)
+    post_suchary(make_user("author"), 1)
+    instrumentation.flush()
+
+    assert instrumentation.snapshot()  # forced flush picks the rest up
+
+
+@pytest.mark.django_db
+def test_disabled_instrumentation_records_nothing(settings):
+    settings.ACHIEVEMENTS_INSTRUMENTATION = False
+    post_suchary(make_user("author"), 1)
+
+    assert instrumentation.snapshot() == {}
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_staff(client):
+    client.force_login(make_user("regular"))
+
+    assert client.get(METRICS_URL).status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_renders_prometheus_histograms(client):
+    post_suchary(make_user("author"), 1)
+    staff = make_user("staff")
+    staff.is_staff = True
+    staff.save()
+    client.force_login(staff)
+
+    response = client.get(METRICS_URL)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert "# TYPE achievement_rule_duration_seconds histogram" in body
+    labels = 'rule="SucharCountRule",event_type="SUCHAR_POSTED",outcome="awarded"'
+    assert f'achievement_rule_queries_bucket{{{labels},le="+Inf"}} 1' in body
+    assert f"achievement_rule_duration_seconds_count{{{labels}}} 1" in body
+
+
+@pytest.mark.django_db
+def test_diagnose_command_stats_and_reset():
+    post_suchary(make_user("author"), 1)
+    out = io.StringIO()
+
+    call_command("diagnose_achievements", "--stats", stdout=out)
+    assert "SucharCountRule" in out.getvalue()
+    assert "0 saved by coalescing" in out.getvalue()
+
+    call_command("diagnose_achievements", "--reset", stdout=io.StringIO())
+    out = io.StringIO()
+    call_command("diagnose_achievements", "--stats", stdout=out)
+    assert "No rule evaluations recorded yet." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_diagnose_command_times_each_rule_for_a_user():
+    post_suchary(make_user("author"), 2)
+    out = io.StringIO()
+
+    call_command("diagnose_achievements", "author", stdout=out)
+
+    assert "PolarizerRule" in out.getvalue()
+    assert "SumScoreRule" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_diagnose_command_needs_a_mode():
+    with pytest.raises(CommandError):
+        call_command("diagnose_achievements", stdout=io.StringIO())
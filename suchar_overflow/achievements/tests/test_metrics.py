@@ -0,0 +1,267 @@
+"""Tests for the incremental UserMetrics counters and their reconcile command."""
+
+import datetime
+import io
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from suchar_overflow.achievements.metrics import get_metrics
+from suchar_overflow.achievements.metrics import rebuild_user_metrics
+from suchar_overflow.achievements.metrics import record_active_day
+from suchar_overflow.achievements.models import UserMetrics
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Vote
+
+
+def vote(client, suchar, vote_type):
+    return client.post(
+        f"/api/suchary/{suchar.pk}/vote",
+        data={"vote_type": vote_type},
+        content_type="application/json",
+    )
+
+
+@pytest.mark.django_db
+def test_metrics_row_created_with_user():
+    user = make_user("u1")
+    metrics = UserMetrics.objects.get(user=user)
+    assert metrics.suchar_count == 0
+    assert metrics.vote_cast_count == 0
+
+
+@pytest.mark.django_db
+def test_suchar_create_and_delete_update_count():
+    user = make_user("u1")
+    s1 = Suchar.objects.create(text="a", author=user)
+    Suchar.objects.create(text="b", author=user)
+    assert get_metrics(user).suchar_count == 2  # noqa: PLR2004
+
+    s1.delete()
+    assert get_metrics(user).suchar_count == 1
+
+
+@pytest.mark.django_db
+def test_vote_create_and_delete_update_both_sides():
+    author = make_user("author")
+    voter = make_user("voter")
+    suchar = Suchar.objects.create(text="joke", author=author)
+
+    v = Vote.objects.create(suchar=suchar, user=voter, is_funny=True)
+    voter_metrics = get_metrics(voter)
+    author_metrics = get_metrics(author)
+    assert voter_metrics.vote_cast_count == 1
+    assert voter_metrics.vote_funny_count == 1
+    assert author_metrics.funny_received == 1
+    assert author_metrics.score_received == 1
+
+    v.delete()
+    assert get_metrics(voter).vote_cast_count == 0
+    assert get_metrics(author).funny_received == 0
+
+
+@pytest.mark.django_db
+def test_edited_vote_moves_both_sides_by_its_flag_change():
+    author = make_user("author")
+    voter = make_user("voter")
+    suchar = Suchar.objects.create(text="joke", author=author)
+    Vote.objects.create(suchar=suchar, user=make_user("other"), is_dry=True)
+    v = Vote.objects.create(suchar=suchar, user=voter, is_dry=True)
+
+    v.is_funny, v.is_dry = True, False
+    v.save()
+
+    voter_metrics = get_metrics(voter)
+    author_metrics = get_metrics(author)
+    assert voter_metrics.vote_cast_count == 1
+    assert (voter_metrics.vote_funny_count, voter_metrics.vote_dry_count) == (1, 0)
+    assert (author_metrics.funny_received, author_metrics.dry_received) == (1, 1)
+    assert author_metrics.balanced_best == 1
+
+
+@pytest.mark.django_db
+def test_vote_api_toggle_keeps_counters_in_sync(client):
+    author = make_user("author")
+    voter = make_user("voter")
+    suchar = Suchar.objects.create(text="joke", author=author)
+    client.force_login(voter)
+
+    assert vote(client, suchar, "funny").status_code == HTTPStatus.OK
+    assert vote(client, suchar, "dry").status_code == HTTPStatus.OK
+    voter_metrics = get_metrics(voter)
+    assert voter_metrics.vote_cast_count == 1
+    assert voter_metrics.vote_funny_count == 1
+    assert voter_metrics.vote_dry_count == 1
+    assert get_metrics(author).score_received == 0
+
+    vote(client, suchar, "funny")
+    vote(client, suchar, "dry")
+    voter_metrics = get_metrics(voter)
+    assert voter_metrics.vote_cast_count == 0
+    assert voter_metrics.vote_funny_count == 0
+    assert voter_metrics.vote_dry_count == 0
+    assert get_metrics(author).dry_received == 0
+
+
+@pytest.mark.django_db
+def test_get_metrics_rebuilds_missing_row():
+    author = make_user("author")
+    voter = make_user("voter")
+    suchar = Suchar.objects.create(text="joke", author=author)
+    Vote.objects.create(suchar=suchar, user=voter, is_dry=True)
+    UserMetrics.objects.filter(user=author).delete()
+
+    metrics = get_metrics(author)
+    assert metrics.suchar_count == 1
+    assert metrics.dry_received == 1
+
+
+@pytest.mark.django_db
+def test_reconcile_command_fixes_drift():
+    user = make_user("u1")
+    Suchar.objects.create(text="joke", author=user)
+    UserMetrics.objects.filter(user=user).update(suchar_count=42)
+
+    out = io.StringIO()
+    call_command("reconcile_user_metrics", stdout=out)
+
+    assert "Fixed 1 drifted" in out.getvalue()
+    assert get_metrics(user).suchar_count == 1
+
+
+@pytest.mark.django_db
+def test_reconcile_command_dry_run_leaves_rows_alone():
+    user = make_user("u1")
+    UserMetrics.objects.filter(user=user).update(vote_cast_count=7)
+
+    out = io.StringIO()
+    call_command("reconcile_user_metrics", "--dry-run", stdout=out)
+
+    assert "Found 1 drifted" in out.getvalue()
+    assert get_metrics(user).vote_cast_count == 7  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_streak_advances_once_per_local_day_and_resets_after_gap():
+    user = make_user("u1")
+    day = datetime.date(2026, 3, 1)
+
+    for offset in (0, 0, 1, 2):
+        record_active_day(user.pk, day + datetime.timedelta(days=offset))
+    metrics = get_metrics(user)
+    assert metrics.streak_current == 3  # noqa: PLR2004
+    assert metrics.streak_longest == 3  # noqa: PLR2004
+    assert metrics.streak_last_date == day + datetime.timedelta(days=2)
+
+    record_active_day(user.pk, day + datetime.timedelta(days=5))
+    metrics = get_metrics(user)
+    assert metrics.streak_current == 1
+    assert metrics.streak_longest == 3  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_streak_uses_local_date_of_created_at(settings):
+    settings.TIME_ZONE = "Europe/Warsaw"
+    user = make_user("u1")
+    # 23:30 UTC on 1 March is already 2 March in Warsaw.
+    late_evening = datetime.datetime(2026, 3, 1, 23, 30, tzinfo=datetime.UTC)
+    with patch("django.utils.timezone.now", return_value=late_evening):
+        Suchar.objects.create(text="joke", author=user)
+
+    assert get_metrics(user).streak_last_date == datetime.date(2026, 3, 2)
+
+
+@pytest.mark.django_db
+def test_scheduled_suchar_counts_on_the_day_it_was_written():
+    user = make_user("u1")
+    Suchar.objects.create(
+        text="later",
+        author=user,
+        published_at=timezone.now() + datetime.timedelta(days=3),
+    )
+
+    metrics = get_metrics(user)
+    assert metrics.streak_current == 1
+    assert metrics.streak_last_date == timezone.localdate()
+
+
+@pytest.mark.django_db
+def test_rebuild_matches_incremental_streak():
+    user = make_user("u1")
+    today = timezone.now()
+    for offset in (6, 5, 2, 1, 0):
+        suchar = Suchar.objects.create(text=str(offset), author=user)
+        Suchar.objects.filter(pk=suchar.pk).update(
+            created_at=today - datetime.timedelta(days=offset),
+        )
+
+    rebuild_user_metrics([user.pk])
+
+    metrics = get_metrics(user)
+    assert metrics.streak_current == 3  # noqa: PLR2004
+    assert metrics.streak_longest == 3  # noqa: PLR2004
+    assert metrics.streak_last_date == timezone.localdate(today)
+
+
+@pytest.mark.django_db
+def test_night_suchar_count_follows_local_hour_of_created_at():
+    user = make_user("u1")
+    night = datetime.datetime(2026, 3, 1, 3, 59, tzinfo=datetime.UTC)
+    dawn = datetime.datetime(2026, 3, 1, 5, 0, tzinfo=datetime.UTC)
+    with patch("django.utils.timezone.now", return_value=night):
+        night_suchar = Suchar.objects.create(text="night", author=user)
+    with patch("django.utils.timezone.now", return_value=dawn):
+        Suchar.objects.create(text="dawn", author=user)
+    assert get_metrics(user).night_suchar_count == 1
+
+    night_suchar.delete()
+    assert get_metrics(user).night_suchar_count == 0
+
+
+@pytest.mark.django_db
+def test_deleting_a_suchar_uncounts_its_votes_in_bulk(django_assert_max_num_queries):
+    author = make_user("author")
+    suchar = Suchar.objects.create(text="joke", author=author)
+    voters = [make_user(f"v{i}") for i in range(30)]
+    Vote.objects.bulk_create(
+        Vote(suchar=suchar, user=voter, is_funny=i % 2 == 0, is_dry=i % 3 == 0)
+        for i, voter in enumerate(voters)
+    )
+    rebuild_user_metrics([author.pk, *(voter.pk for voter in voters)])
+
+    with django_assert_max_num_queries(10):
+        suchar.delete()
+
+    for voter in voters:
+        metrics = get_metrics(voter)
+        assert metrics.vote_cast_count == 0
+        assert (metrics.vote_funny_count, metrics.vote_dry_count) == (0, 0)
+    metrics = get_metrics(author)
+    assert (metrics.suchar_count, metrics.funny_received, metrics.dry_received) == (
+        0,
+        0,
+        0,
+    )
+
+
+@pytest.mark.django_db
+def test_deleting_a_voter_uncounts_their_votes_in_bulk():
+    author = make_user("author")
+    voter = make_user("voter")
+    other = Suchar.objects.create(text="other", author=author)
+    Vote.objects.create(suchar=other, user=voter, is_funny=True)
+    suchar = Suchar.objects.create(text="joke", author=author)
+    Vote.objects.create(suchar=suchar, user=voter, is_dry=True)
+    Vote.objects.create(suchar=suchar, user=make_user("dry"), is_dry=True)
+    Vote.objects.create(suchar=suchar, user=make_user("funny"), is_funny=True)
+    assert get_metrics(author).balanced_best == 0
+
+    voter.delete()
+
+    metrics = get_metrics(author)
+    assert (metrics.funny_received, metrics.dry_received) == (1, 1)
+    assert metrics.balanced_best == 1
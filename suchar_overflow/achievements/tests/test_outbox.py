@@ -0,0 +1,247 @@
+"""Tests for the achievement check outbox and its worker command."""
+
+import io
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from suchar_overflow.achievements import outbox
+from suchar_overflow.achievements.models import Achievement
+from suchar_overflow.achievements.models import AchievementCheck
+from suchar_overflow.achievements.models import UserAchievement
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Vote
+
+
+@pytest.fixture(autouse=True)
+def _no_coalesce_window(settings):
+    settings.ACHIEVEMENTS_COALESCE_WINDOW = 0
+
+
+@pytest.fixture
+def first_post(db):
+    return Achievement.objects.create(
+        name="First post",
+        slug="first-post",
+        description="",
+        icon_content="",
+        event_type=Achievement.EventType.SUCHAR_POSTED,
+        metric=Achievement.Metric.COUNT_SUCHAR,
+        threshold=1,
+    )
+
+
+@pytest.mark.django_db
+def test_sync_mode_awards_inline(settings, first_post):
+    settings.ACHIEVEMENTS_ASYNC = False
+    user = make_user("author")
+
+    Suchar.objects.create(text="a", author=user)
+
+    assert UserAchievement.objects.filter(user=user, achievement=first_post).exists()
+    assert not AchievementCheck.objects.exists()
+
+
+@pytest.mark.django_db
+def test_async_mode_queues_on_commit_and_worker_awards(
+    settings,
+    first_post,
+    django_capture_on_commit_callbacks,
+):
+    settings.ACHIEVEMENTS_ASYNC = True
+    user = make_user("author")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        suchar = Suchar.objects.create(text="a", author=user)
+
+    assert not UserAchievement.objects.filter(user=user).exists()
+    check = AchievementCheck.objects.get()
+    assert check.user == user
+    assert check.event_type == Achievement.EventType.SUCHAR_POSTED
+    assert check.suchar == suchar
+
+    assert outbox.drain() == 1
+
+    assert UserAchievement.objects.filter(user=user, achievement=first_post).exists()
+    assert cache.get(f"achievements_pending:{user.pk}") is True
+    assert not AchievementCheck.objects.exists()
+
+
+@pytest.mark.django_db
+def test_async_mode_queues_nothing_before_commit(settings, first_post):
+    settings.ACHIEVEMENTS_ASYNC = True
+    user = make_user("author")
+
+    Suchar.objects.create(text="a", author=user)
+
+    assert not AchievementCheck.objects.exists()
+
+
+@pytest.mark.django_db
+def test_vote_queues_checks_for_voter_and_author(
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    settings.ACHIEVEMENTS_ASYNC = True
+    author = make_user("author")
+    voter = make_user("voter")
+    suchar = Suchar.objects.create(text="a", author=author)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Vote.objects.create(suchar=suchar, user=voter, is_funny=True)
+
+    assert set(AchievementCheck.objects.values_list("user_id", "event_type")) == {
+        (voter.pk, Achievement.EventType.VOTE_CAST),
+        (author.pk, Achievement.EventType.VOTE_RECEIVED),
+    }
+
+
+@pytest.mark.django_db
+def test_failing_check_is_retried_then_left_for_inspection():
+    user = make_user("author")
+    check = AchievementCheck.objects.create(
+        user=user,
+        event_type=Achievement.EventType.SUCHAR_POSTED,
+    )
+
+    now = timezone.now()
+    with patch(
+        "suchar_overflow.achievements.outbox.AchievementEngine.check_achievements",
+        side_effect=RuntimeError("boom"),
+    ):
+        for attempts in range(AchievementCheck.MAX_ATTEMPTS):
+            with patch("django.utils.timezone.now", return_value=now):
+                assert outbox.drain() == 1
+            check.refresh_from_db()
+            assert check.attempts == attempts + 1
+            assert check.not_before == now + outbox.backoff(attempts)
+            now = check.not_before
+
+    with patch("django.utils.timezone.now", return_value=now + timedelta(days=1)):
+        assert outbox.process_next() is False
+
+
+@pytest.mark.django_db
+def test_run_achievement_worker_once_drains_queue(first_post):
+    user = make_user("author")
+    suchar = Suchar.objects.create(text="a", author=user)
+    UserAchievement.objects.all().delete()
+    AchievementCheck.objects.create(
+        user=user,
+        event_type=Achievement.EventType.SUCHAR_POSTED,
+        suchar=suchar,
+    )
+
+    out = io.StringIO()
+    call_command("run_achievement_worker", "--once", "--pool-size", "1", stdout=out)
+
+    assert "Processed 1 achievement checks." in out.getvalue()
+    assert "Totals: 1 checks evaluated, 0 saved by coalescing." in out.getvalue()
+    assert UserAchievement.objects.filter(user=user, achievement=first_post).exists()
+    assert not AchievementCheck.objects.exists()
+
+
+@pytest.mark.django_db
+def test_burst_of_votes_coalesces_into_one_check_per_event_type(
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    settings.ACHIEVEMENTS_ASYNC = True
+    voter = make_user("voter")
+    author = make_user("author")
+    suchary = [Suchar.objects.create(text=str(i), author=author) for i in range(3)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for suchar in suchary:
+            Vote.objects.create(suchar=suchar, user=voter, is_funny=True)
+        Vote.objects.create(suchar=suchary[0], user=make_user("other"), is_dry=True)
+
+    cast = AchievementCheck.objects.get(
+        user=voter,
+        event_type=Achievement.EventType.VOTE_CAST,
+    )
+    assert cast.coalesced_count == 2  # noqa: PLR2004
+    received = AchievementCheck.objects.get(
+        user=author,
+        event_type=Achievement.EventType.VOTE_RECEIVED,
+    )
+    assert received.coalesced_count == 3  # noqa: PLR2004
+
+    assert outbox.drain() == 3  # noqa: PLR2004
+    assert outbox.coalescing_stats() == {"evaluated": 3, "coalesced": 5}
+
+
+@pytest.mark.django_db
+def test_coalesced_check_awards_a_balance_broken_inside_the_window(
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    settings.ACHIEVEMENTS_ASYNC = True
+    polarizer = Achievement.objects.create(
+        name="Polarizer",
+        slug="polarizer",
+        event_type=Achievement.EventType.VOTE_RECEIVED,
+        metric=Achievement.Metric.POLARIZER,
+        threshold=1,
+    )
+    author = make_user("author")
+    suchar = Suchar.objects.create(text="a", author=author)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for name, is_funny in [("first", True), ("second", False), ("third", True)]:
+            Vote.objects.create(
+                suchar=suchar,
+                user=make_user(name),
+                is_funny=is_funny,
+                is_dry=not is_funny,
+            )
+
+    outbox.drain()
+    assert UserAchievement.objects.filter(user=author, achievement=polarizer).exists()
+
+
+@pytest.mark.django_db
+def test_check_waits_for_coalesce_window(settings, django_capture_on_commit_callbacks):
+    settings.ACHIEVEMENTS_ASYNC = True
+    settings.ACHIEVEMENTS_COALESCE_WINDOW = 60
+    user = make_user("author")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Suchar.objects.create(text="a", author=user)
+
+    assert outbox.drain() == 0
+    assert AchievementCheck.objects.exists()
+
+
+@pytest.mark.django_db
+def test_given_up_check_does_not_absorb_new_events(
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    settings.ACHIEVEMENTS_ASYNC = True
+    voter = make_user("voter")
+    author = make_user("author")
+    suchar = Suchar.objects.create(text="a", author=author)
+    dead = AchievementCheck.objects.create(
+        user=voter,
+        event_type=Achievement.EventType.VOTE_CAST,
+        attempts=AchievementCheck.MAX_ATTEMPTS,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Vote.objects.create(suchar=suchar, user=voter, is_funny=True)
+
+    dead.refresh_from_db()
+    assert dead.coalesced_count == 0
+    assert (
+        AchievementCheck.objects.filter(
+            user=voter,
+            event_type=Achievement.EventType.VOTE_CAST,
+        ).count()
+        == 2  # noqa: PLR2004
+    )
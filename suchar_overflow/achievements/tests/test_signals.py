@@ -255,3 +255,46 @@ def test_rising_star_not_awarded_twice(ensure_achievements):
         ).count()
         == 1
     )
+
+
+@pytest.mark.django_db
+def test_vote_api_awards_voter_and_author(client, ensure_achievements):
+    author = make_user("author")
+    suchar = Suchar.objects.create(text="joke", author=author)
+    # Both depend on the flag the click set, not just on the vote existing.
+    Achievement.objects.create(
+        name="First Laugh",
+        slug="first-laugh",
+        description="",
+        icon_content="",
+        event_type="VOTE_CAST",
+        metric="COUNT_VOTE_FUNNY",
+        threshold=1,
+    )
+    Achievement.objects.create(
+        name="First Score",
+        slug="first-score",
+        description="",
+        icon_content="",
+        event_type="VOTE_RECEIVED",
+        metric="SUM_SCORE",
+        threshold=1,
+    )
+    voter = make_user("voter")
+    client.force_login(voter)
+
+    client.post(
+        f"/api/suchary/{suchar.pk}/vote",
+        data={"vote_type": "funny"},
+        content_type="application/json",
+    )
+
+    awarded = UserAchievement.objects.filter(user=voter).values_list(
+        "achievement__slug",
+        flat=True,
+    )
+    assert {"first-vote", "first-laugh"} <= set(awarded)
+    assert UserAchievement.objects.filter(
+        user=author,
+        achievement__slug="first-score",
+    ).exists()
@@ -456,15 +456,11 @@ def test_award_best_suchar_month_missing_achievement_does_not_crash(
     )
     Vote.objects.create(suchar=s, user=voter, is_funny=True)
 
-    with (
-        patch(
-            "suchar_overflow.achievements.tasks.timezone.now",
-            return_value=frozen_now,
-        ),
-        patch(
-            "suchar_overflow.achievements.tasks.Achievement.objects.get",
-            side_effect=Achievement.DoesNotExist,
-        ),
+    Achievement.objects.filter(slug="best-suchar-month").delete()
+
+    with patch(
+        "suchar_overflow.achievements.tasks.timezone.now",
+        return_value=frozen_now,
     ):
         award_best_suchar("month")  # should not raise
 
@@ -689,15 +685,13 @@ def test_award_best_suchar_logs_warning_when_achievement_missing(
     )
     Vote.objects.create(suchar=s, user=voter, is_funny=True)
 
+    Achievement.objects.filter(slug="best-suchar-month").delete()
+
     with (
         patch(
             "suchar_overflow.achievements.tasks.timezone.now",
             return_value=frozen_now,
         ),
-        patch(
-            "suchar_overflow.achievements.tasks.Achievement.objects.get",
-            side_effect=Achievement.DoesNotExist,
-        ),
         caplog.at_level(logging.WARNING, logger="suchar_overflow.achievements.tasks"),
     ):
         award_best_suchar("month")  # should not raise
@@ -6,8 +6,10 @@ from django.core.cache import cache
 from django.http import StreamingHttpResponse
 from django.shortcuts import render
 
+from suchar_overflow import conditional
 from suchar_overflow.users.mixins import AsyncLoginRequiredMixin
 
+from .catalog import aget_catalog
 from .models import Achievement
 from .models import UserAchievement
 
@@ -42,10 +44,12 @@ class MyAchievementsView(AsyncLoginRequiredMixin):
 
     async def get(self, request, *args, **kwargs):
         user = await request.auser()
-        await UserAchievement.objects.filter(
+        seen = await UserAchievement.objects.filter(
             user=user,
             is_seen=False,
         ).aupdate(is_seen=True)
+        if seen:
+            await conditional.atouch_user(user.pk)
 
         user_achievements = [
             ua
@@ -72,22 +76,14 @@ class AchievementListView(AsyncLoginRequiredMixin):
             ).values_list("achievement_id", flat=True)
         }
 
-        all_achs = [
-            a async for a in Achievement.objects.all().order_by("theme", "tier", "id")
+        catalog = await aget_catalog()
+        visible_achs = [
+            ach
+            for ach in catalog.achievements
+            if not (ach.theme and ach.tier != Achievement.Tier.NONE)
         ]
-        visible_achs = []
-        grouped: dict[tuple[str, str], list[Achievement]] = {}
-
-        for ach in all_achs:
-            if ach.theme and ach.tier != Achievement.Tier.NONE:
-                key = (ach.theme, ach.metric)
-                if key not in grouped:
-                    grouped[key] = []
-                grouped[key].append(ach)
-            else:
-                visible_achs.append(ach)
 
-        for series in grouped.values():
+        for series in catalog.series.values():
             for ach in series:
                 visible_achs.append(ach)
                 if ach.id not in user_achs:
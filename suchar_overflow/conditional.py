@@ -0,0 +1,131 @@
+"""Conditional GET for the suchar list, the leaderboard and the profiles.
+
+Rendering these pages runs their heaviest queries, yet between two visits
+of the same person they rarely change. Their responses carry a strong
+``ETag`` and a ``Last-Modified`` computed from versions kept in the cache,
+so a browser or the nginx front revalidating an unchanged page gets a
+``304`` for the price of one ``get_many``. The ETag covers:
+
+* the content version of ``suchary.list_cache``, bumped by any change to
+  the suchary, their votes or tags, and by user renames;
+* the next scheduled publication (``suchary.timeline``), which changes the
+  pages once it has passed;
+* the version of each user the page shows (the visitor, and on a profile
+  its owner), bumped by their awards, seen badges and profile edits;
+* the version of the achievement catalog the badges are drawn from;
+* the URL, the language, the theme cookie and the CSRF cookie, whose
+  secret the HTML embeds a token of (a first visit, without one yet, gets
+  the cookie with its page and a new ETag next time).
+
+Versions are nanosecond timestamps (``list_cache.new_version``), so the
+latest of them is the ``Last-Modified``. The pages carry no CSP nonce (the
+base template's scripts are all files): a browser pairs a ``304``'s CSP
+header, with the new request's nonce, with its cached copy.
+"""
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.crypto import salted_hmac
+from django.utils.http import http_date
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+
+from suchar_overflow.achievements import catalog
+from suchar_overflow.suchary import list_cache
+from suchar_overflow.suchary import timeline
+
+USER_VERSION_KEY = "pages:user_version:{}"
+_SALT = "suchar_overflow.conditional"
+_ETAG_LENGTH = 32
+
+
+def _user_key(user_id: int) -> str:
+    return USER_VERSION_KEY.format(user_id)
+
+
+def touch_users(user_ids) -> None:
+    """Retire the pages showing any of ``user_ids``.
+
+    Bumped immediately and again on commit, like ``list_cache.invalidate``.
+    """
+    keys = [_user_key(user_id) for user_id in set(user_ids)]
+    if not keys:
+        return
+
+    def _bump():
+        cache.set_many(dict.fromkeys(keys, list_cache.new_version()), timeout=None)
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def touch_user(user_id: int) -> None:
+    touch_users([user_id])
+
+
+async def atouch_user(user_id: int) -> None:
+    await cache.aset(_user_key(user_id), list_cache.new_version(), timeout=None)
+
+
+def _current(key: str, found: dict) -> str:
+    """The version under ``key``, starting one if it was never set or evicted."""
+    version = found.get(key)
+    if version is None:
+        version = list_cache.new_version()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def _changed_at(version: str) -> int:
+    return int(version, 16) // 1_000_000_000
+
+
+def respond(request, user, build, *, users=(), extra=()):
+    """Answer ``request`` for a page with a 304 or the response of ``build()``.
+
+    ``user`` is the visitor, ``users`` the IDs of other users the page
+    shows and ``extra`` any other strings the page depends on. Requests
+    with flash messages waiting are always built, so the messages show.
+    """
+    if request.method not in {"GET", "HEAD"} or len(messages.get_messages(request)):
+        return build()
+
+    user_ids = sorted({*users, *([user.pk] if user.is_authenticated else [])})
+    keys = [list_cache.VERSION_KEY, *map(_user_key, user_ids)]
+    found = cache.get_many([*keys, catalog.VERSION_KEY, timeline.NEXT_KEY])
+    versions = [_current(key, found) for key in keys]
+    catalog_version = _current(catalog.VERSION_KEY, found)
+    upcoming = timeline.next_publication(cached=found.get(timeline.NEXT_KEY))
+
+    parts = [
+        request.get_full_path(),
+        get_language(),
+        request.COOKIES.get("theme", ""),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        str(user.pk),
+        *versions,
+        catalog_version,
+        upcoming.isoformat() if upcoming else "",
+        *extra,
+    ]
+    digest = salted_hmac(_SALT, "\n".join(parts), algorithm="sha256").hexdigest()
+    etag = quote_etag(digest[:_ETAG_LENGTH])
+    last_modified = max(_changed_at(version) for version in versions)
+
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified,
+    )
+    if response is None:
+        response = build()
+    if response.status_code in {200, 304}:
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, no_cache=True, private=user.is_authenticated)
+    return response
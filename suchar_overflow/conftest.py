@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
 import pytest
+from django.core.cache import cache
 
 from suchar_overflow.users.tests.factories import UserFactory
 
@@ -13,6 +14,13 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    # Cached state (e.g. the achievement catalog version) must not outlive
+    # the rolled-back rows it describes.
+    cache.clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory.create()
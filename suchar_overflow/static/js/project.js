@@ -432,6 +432,120 @@ document.addEventListener('DOMContentLoaded', () => {
         };
     }
 
+    // Infinite scroll of the suchar list: pages after the rendered one are
+    // fetched from the JSON feed and appended as copies of the first card.
+    const feedSentinel = document.querySelector('.suchar-feed-sentinel');
+    const cardTemplate = document.querySelector('.suchar-card');
+    if (feedSentinel && cardTemplate && window.IntersectionObserver) {
+        const listParams = new URLSearchParams(window.location.search);
+        const pageNav = document.querySelector('nav[aria-label="Page navigation"]')?.closest('.row');
+        const dateFormat = new Intl.DateTimeFormat(document.documentElement.lang || undefined, {
+            day: '2-digit',
+            month: 'short',
+            year: 'numeric',
+            hour: '2-digit',
+            minute: '2-digit',
+        });
+        let loading = false;
+
+        const filterUrl = (name, value) => {
+            const params = new URLSearchParams(listParams);
+            params.delete('page');
+            params.delete('cursor');
+            params.set(name, value);
+            return `?${params}`;
+        };
+
+        const buildCard = (item) => {
+            const card = cardTemplate.cloneNode(true);
+
+            const authorLink = card.querySelector('h6 a');
+            authorLink.textContent = item.author_name;
+            authorLink.href = filterUrl('author', item.author);
+            card.querySelector('.suchar-meta').textContent = dateFormat.format(new Date(item.published_at));
+
+            const text = card.querySelector('p');
+            text.replaceChildren();
+            item.text.split(/\r\n|\r|\n/).forEach((line, i) => {
+                if (i > 0) text.appendChild(document.createElement('br'));
+                text.appendChild(document.createTextNode(line));
+            });
+
+            card.querySelector('a.badge')?.parentElement.remove();
+            if (item.tags.length > 0) {
+                const tagList = document.createElement('div');
+                tagList.className = 'mb-3';
+                item.tags.forEach(tag => {
+                    const link = document.createElement('a');
+                    link.className = 'badge text-secondary border me-1 text-decoration-none bg-light';
+                    link.href = filterUrl('tag', tag.slug);
+                    link.textContent = `#${tag.name}`;
+                    tagList.appendChild(link);
+                });
+                card.querySelector('.voting-controls').before(tagList);
+            }
+
+            card.querySelectorAll('.btn-vote').forEach(btn => {
+                const voteType = btn.dataset.voteType;
+                const active = Boolean(item[`user_is_${voteType}`]);
+                btn.dataset.sucharId = item.id;
+                btn.classList.toggle('active', active);
+                btn.setAttribute('aria-pressed', String(active));
+                btn.querySelector('.vote-count').textContent = item[`${voteType}_count`];
+            });
+            return card;
+        };
+
+        const observer = new IntersectionObserver((entries) => {
+            if (entries.some(entry => entry.isIntersecting)) loadMore();
+        }, { rootMargin: '400px' });
+
+        async function loadMore() {
+            if (loading) return;
+            loading = true;
+
+            const params = new URLSearchParams({ cursor: feedSentinel.dataset.feedCursor });
+            ['sort', 'q', 'tag', 'author'].forEach(name => {
+                const value = listParams.get(name);
+                if (value) params.set(name, value);
+            });
+
+            try {
+                const response = await fetch(`/api/suchary/?${params}`);
+                if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+                const data = await response.json();
+
+                const cards = document.querySelectorAll('.suchar-card');
+                let last = cards[cards.length - 1];
+                data.items.forEach(item => {
+                    const card = buildCard(item);
+                    last.after(card);
+                    last = card;
+                });
+                if (pageNav) pageNav.hidden = true;
+
+                if (data.next_cursor) {
+                    feedSentinel.dataset.feedCursor = data.next_cursor;
+                    // Re-observing reports the sentinel again if it's still in view.
+                    observer.unobserve(feedSentinel);
+                    observer.observe(feedSentinel);
+                } else {
+                    observer.disconnect();
+                    feedSentinel.remove();
+                }
+            } catch (err) {
+                // Leave the page links for browsing on.
+                console.error('Error loading more suchary:', err);
+                observer.disconnect();
+                if (pageNav) pageNav.hidden = false;
+            } finally {
+                loading = false;
+            }
+        }
+
+        observer.observe(feedSentinel);
+    }
+
     function updateBell(achievements) {
         const wrapper = document.getElementById('bell-wrapper');
         if (!wrapper) return;
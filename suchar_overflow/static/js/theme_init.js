@@ -0,0 +1,14 @@
+/* Applies the stored theme before the first paint; loaded without defer. */
+(function() {
+  var stored = localStorage.getItem('theme');
+  var theme = stored ||
+    (window.matchMedia('(prefers-color-scheme: dark)').matches ? 'dark' : 'light');
+  // Server already rendered data-theme from the cookie; only override on first visit
+  // (no cookie → server defaults to "light") or if localStorage differs.
+  if (document.documentElement.getAttribute('data-theme') !== theme) {
+    document.documentElement.setAttribute('data-theme', theme);
+  }
+  // Write cookie so the next server-rendered page arrives with the correct theme.
+  document.cookie = 'theme=' + theme + '; path=/; max-age=31536000; SameSite=Lax';
+  window.__initialTheme = theme;
+})();
@@ -4,13 +4,15 @@ from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.db.models import Count
 from django.db.models import Min
-from django.db.models import Q
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
 from django.db.models.functions import TruncDay
 from django.db.models.functions import TruncMonth
 from django.shortcuts import render
 from django.utils import timezone
 from django.views import View
 
+from suchar_overflow import conditional
 from suchar_overflow.suchary.models import Suchar
 
 User = get_user_model()
@@ -124,8 +126,18 @@ class LeaderboardView(View):
     template_name = "stats/leaderboard.html"
 
     async def get(self, request, *args, **kwargs):
-        context = await sync_to_async(self._build_context)()
-        return await sync_to_async(render)(request, self.template_name, context)
+        user = await request.auser()
+
+        def _build():
+            return render(request, self.template_name, self._build_context())
+
+        # The activity charts end today, so the page also changes at midnight.
+        return await sync_to_async(conditional.respond)(
+            request,
+            user,
+            _build,
+            extra=[timezone.localdate().isoformat()],
+        )
 
     def _build_context(self):
         now = timezone.now()
@@ -136,10 +148,12 @@ class LeaderboardView(View):
         # Each tab's card only ever renders the fields it annotates here — the
         # "overall" card is the only one showing a funny/dry breakdown
         # alongside its primary metric, so only its queryset needs all three.
-        suchar_count = Count("suchary", distinct=True)
-        total_score = Count("suchary__votes")
-        funny_score = Count("suchary__votes", filter=Q(suchary__votes__is_funny=True))
-        dry_score = Count("suchary__votes", filter=Q(suchary__votes__is_dry=True))
+        # Summed from the tallies stored on each suchar; authors without any
+        # suchary get 0 rather than NULL so _top_n drops them.
+        suchar_count = Count("suchary")
+        total_score = Coalesce(Sum("suchary__score"), 0)
+        funny_score = Coalesce(Sum("suchary__funny_count"), 0)
+        dry_score = Coalesce(Sum("suchary__dry_count"), 0)
 
         top_authors_overall = _top_n(
             User.objects,
@@ -162,17 +176,10 @@ class LeaderboardView(View):
             "dry_score",
         )
 
-        score = Count("votes")
-        funny_count = Count("votes", filter=Q(votes__is_funny=True))
-        dry_count = Count("votes", filter=Q(votes__is_dry=True))
-
-        top_suchars_overall = _top_n(
-            suchary,
-            {"score": score, "funny_count": funny_count, "dry_count": dry_count},
-            "score",
-        )
-        top_suchars_funny = _top_n(suchary, {"funny_count": funny_count}, "funny_count")
-        top_suchars_dry = _top_n(suchary, {"dry_count": dry_count}, "dry_count")
+        # score / funny_count / dry_count are stored on Suchar itself.
+        top_suchars_overall = _top_n(suchary, {}, "score")
+        top_suchars_funny = _top_n(suchary, {}, "funny_count")
+        top_suchars_dry = _top_n(suchary, {}, "dry_count")
 
         chart_datasets = {
             "7": get_daily_activity_data(start_of_today, now, 7),
@@ -1,5 +1,4 @@
 from django.contrib import admin
-from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
 
 from .models import Suchar
@@ -9,7 +8,7 @@ from .models import Vote
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = ["name", "slug"]
+    list_display = ["name", "slug", "usage_count"]
     search_fields = ["name"]
     prepopulated_fields = {"slug": ("name",)}
 
@@ -33,18 +32,14 @@ class SucharAdmin(admin.ModelAdmin):
     inlines = [VoteInline]
     date_hierarchy = "created_at"
 
-    def get_queryset(self, request):
-        queryset = super().get_queryset(request)
-        return queryset.annotate(_total_votes=Count("votes"))
-
     @admin.display(description=_("Text"))
     def short_text_display(self, obj):
         limit = 75
         return (obj.text[:limit] + "...") if len(obj.text) > limit else obj.text
 
-    @admin.display(description=_("Votes"), ordering="_total_votes")
+    @admin.display(description=_("Votes"), ordering="score")
     def total_votes(self, obj):
-        return obj._total_votes  # noqa: SLF001
+        return obj.score
 
 
 @admin.register(Vote)
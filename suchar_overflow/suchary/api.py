@@ -1,18 +1,40 @@
+from operator import attrgetter
 from typing import Literal
 
-from django.db.models import Count
-from django.db.models import Q
-from django.shortcuts import get_object_or_404
+from django.http import Http404
+from ninja import Query
 from ninja import Router
 from ninja import Schema
+from ninja.errors import HttpError
 from ninja.security import django_auth
 
+from . import feed
+from . import pagination
+from . import tags
+from . import vote_buffer
+from . import votes
 from .models import Suchar
-from .models import Tag
-from .models import Vote
 
 router = Router()
 
+FEED_PAGE_SIZE = 10
+# How each field of a feed item is read off a suchar.
+_FEED_FIELDS = {
+    "id": attrgetter("pk"),
+    "text": attrgetter("text"),
+    "author": attrgetter("author.username"),
+    "author_name": attrgetter("author.display_name"),
+    "published_at": lambda suchar: suchar.published_at.isoformat(),
+    "tags": lambda suchar: [
+        {"name": tag.name, "slug": tag.slug} for tag in suchar.tags.all()
+    ],
+    "funny_count": attrgetter("funny_count"),
+    "dry_count": attrgetter("dry_count"),
+    "user_is_funny": lambda suchar: getattr(suchar, "user_is_funny", False),
+    "user_is_dry": lambda suchar: getattr(suchar, "user_is_dry", False),
+}
+_VOTE_FIELDS = {"user_is_funny", "user_is_dry"}
+
 
 class VoteSchema(Schema):
     vote_type: Literal["funny", "dry"]
@@ -30,47 +52,90 @@ class TagSchema(Schema):
     slug: str
 
 
+class FeedItemSchema(Schema):
+    # Every field is optional: only those asked for by ``fields`` are sent.
+    id: int | None = None
+    text: str | None = None
+    author: str | None = None
+    author_name: str | None = None
+    published_at: str | None = None
+    tags: list[TagSchema] | None = None
+    funny_count: int | None = None
+    dry_count: int | None = None
+    user_is_funny: bool | None = None
+    user_is_dry: bool | None = None
+
+
+class FeedQuery(Schema):
+    sort: str | None = None
+    q: str | None = None
+    tag: str | None = None
+    author: str | None = None
+    cursor: str | None = None
+    fields: str | None = None
+
+
+class FeedPageSchema(Schema):
+    items: list[FeedItemSchema]
+    next_cursor: str | None
+
+
+def _feed_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return list(_FEED_FIELDS)
+    wanted = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(wanted) - set(_FEED_FIELDS))
+    if unknown:
+        raise HttpError(400, f"Unknown fields: {', '.join(unknown)}")
+    return wanted
+
+
+@router.get("/", response=FeedPageSchema, exclude_unset=True)
+def list_suchary(request, params: Query[FeedQuery]):
+    """Pages of published suchary, for the list's infinite scroll.
+
+    Filtered like the list page, but always in a ``sort`` order (a search
+    too, as relevance has no key to resume from), and paged by the
+    ``next_cursor`` of the previous page. ``fields`` is a comma-separated
+    subset of the item fields to send; the tags and the caller's votes are
+    only loaded when asked for.
+    """
+    wanted = _feed_fields(params.fields)
+    sort = pagination.sort_key(params.sort)
+    qs = feed.queryset(sort=sort, q=params.q, tag=params.tag, author=params.author)
+    if "tags" not in wanted:
+        qs = qs.prefetch_related(None)
+    try:
+        page = pagination.paginate(qs, sort, params.cursor, FEED_PAGE_SIZE)
+    except pagination.InvalidCursorError as e:
+        raise HttpError(400, "Invalid cursor") from e
+
+    suchary = vote_buffer.apply_pending(page.object_list)
+    if _VOTE_FIELDS.intersection(wanted):
+        suchary = votes.attach_user_votes(suchary, request.user)
+    return {
+        "items": [
+            {name: _FEED_FIELDS[name](suchar) for name in wanted} for suchar in suchary
+        ],
+        "next_cursor": page.next_cursor,
+    }
+
+
 @router.get("/tags", response=list[TagSchema])
 def list_tags(request, q: str | None = None):
-    tags = Tag.objects.all()
-    if q:
-        tags = tags.filter(name__icontains=q)
-    return tags[:10]
+    return tags.autocomplete(q)
 
 
 @router.post("/{suchar_id}/vote", auth=django_auth, response=VoteResponse)
 def vote_suchar(request, suchar_id: int, payload: VoteSchema):
-    suchar = get_object_or_404(Suchar, pk=suchar_id)
-    user = request.user
-    vote_type = payload.vote_type
-
-    vote, _ = Vote.objects.get_or_create(
-        user=user,
-        suchar=suchar,
-    )
-
-    if vote_type == "funny":
-        vote.is_funny = not vote.is_funny
-    elif vote_type == "dry":
-        vote.is_dry = not vote.is_dry
-
-    if not vote.is_funny and not vote.is_dry:
-        vote.delete()
-    else:
-        vote.save()
-
-    # Calculate counts using aggregation
-    counts = suchar.votes.aggregate(
-        funny=Count("pk", filter=Q(is_funny=True)),
-        dry=Count("pk", filter=Q(is_dry=True)),
-    )
+    try:
+        result = votes.toggle(request.user, suchar_id, payload.vote_type)
+    except Suchar.DoesNotExist as e:
+        raise Http404 from e
 
     return {
-        "funny_count": counts["funny"] or 0,
-        "dry_count": counts["dry"] or 0,
-        "user_is_funny": vote.is_funny
-        if vote.pk
-        # If deleted, object still has state but pk might be irrelevant
-        else False,
-        "user_is_dry": vote.is_dry if vote.pk else False,
+        "funny_count": result.funny_count,
+        "dry_count": result.dry_count,
+        "user_is_funny": result.vote.is_funny,
+        "user_is_dry": result.vote.is_dry,
     }
@@ -6,3 +6,6 @@ class SucharyConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "suchar_overflow.suchary"
     verbose_name = _("Suchary")
+
+    def ready(self):
+        import suchar_overflow.suchary.signals  # noqa: F401
@@ -0,0 +1,50 @@
+"""The published suchary as filtered and ordered by the list page.
+
+Shared by ``SucharListView`` and the JSON feed in ``api.py``, so both
+pages of the same ``sort``/``q``/``tag``/``author`` hold the same suchary
+and a cursor from one is valid for the other.
+"""
+
+from django.utils import timezone
+
+from . import pagination
+from . import ranking
+from . import search
+from .models import Suchar
+
+RELEVANCE = "relevance"
+HOT = "hot"
+
+
+def is_ranked(q: str | None, sort: str | None) -> bool:
+    """A search is ordered by relevance unless another sort was picked."""
+    return bool(q) and sort in {None, "", RELEVANCE}
+
+
+def queryset(
+    *,
+    sort: str | None = None,
+    q: str | None = None,
+    tag: str | None = None,
+    author: str | None = None,
+):
+    """Return the published suchary matching the filters, in list order."""
+    qs = (
+        Suchar.objects.select_related("author")
+        .prefetch_related("tags")
+        .defer("search_vector")
+        .filter(published_at__lte=timezone.now())
+    )
+    if pagination.sort_key(sort) == HOT:
+        qs = ranking.hot(qs)
+    qs = qs.order_by(*pagination.ordering(sort))
+
+    if q:
+        qs = search.search(qs, q)
+    if is_ranked(q, sort):
+        qs = qs.order_by("-rank", *pagination.ordering(None))
+    if tag:
+        qs = qs.filter(tags__slug=tag)
+    if author:
+        qs = qs.filter(author__username=author)
+    return qs
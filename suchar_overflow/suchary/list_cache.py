@@ -0,0 +1,127 @@
+"""Shared cache of the rendered suchar list for anonymous visitors.
+
+Anonymous visitors all see the same first pages, so the cards and the
+pagination of a page are rendered once and stored per filter combination
+(``sort``, ``tag``, ``author``, ``page`` and the language). Each entry
+carries the list version it was built from; new or edited suchary, tag
+changes and votes bump the version (see ``signals.py``), which retires
+every entry at once without having to find them.
+
+An entry also expires when the next scheduled suchar goes public (see
+``timeline.py``), as the page it holds is missing that suchar from then on.
+
+A miss under load would have every concurrent request rebuild the same
+page. Only the request that wins a short lock rebuilds; the others serve
+the outdated entry meanwhile, or, when there is none yet, wait briefly for
+the winner's result.
+"""
+
+import math
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import get_language
+
+from . import timeline
+
+VERSION_KEY = "suchary:list_version"
+# Filters a cached page may be built for; any other parameter (a search,
+# a cursor, tracking tags copied into the links) bypasses the cache.
+KEY_PARAMS = ("sort", "tag", "author", "page")
+FRAGMENT_TIMEOUT = 300
+LOCK_TIMEOUT = 10
+WAIT_INTERVAL = 0.05
+WAIT_STEPS = 20
+
+
+def new_version() -> str:
+    """A fresh version: the current time in nanoseconds, as hex.
+
+    Being a timestamp, it also tells when the list last changed (see
+    ``suchar_overflow.conditional``).
+    """
+    return f"{time.time_ns():x}"
+
+
+def version() -> str:
+    current = cache.get(VERSION_KEY)
+    if current is None:
+        current = new_version()
+        if not cache.add(VERSION_KEY, current, timeout=None):
+            current = cache.get(VERSION_KEY, current)
+    return current
+
+
+def invalidate() -> None:
+    """Retire every cached page.
+
+    Bumped immediately so this process sees its own change, and again on
+    commit so a page rebuilt in between from the old rows is retired too.
+    """
+
+    def _bump():
+        cache.set(VERSION_KEY, new_version(), timeout=None)
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def key_for(params, max_page: int) -> str | None:
+    """Cache key of a list request's parameters, or None if not cacheable."""
+    if not set(params) <= set(KEY_PARAMS):
+        return None
+    page = params.get("page", "1")
+    if not page.isdigit() or not 1 <= int(page) <= max_page:
+        return None
+    filters = {name: params.get(name, "") for name in KEY_PARAMS}
+    filters["page"] = page
+    return f"suchary:list:{get_language()}:{urlencode(sorted(filters.items()))}"
+
+
+def _is_fresh(entry, current: str, now) -> bool:
+    expires_at = entry.get("expires_at")
+    return entry["version"] == current and (expires_at is None or now < expires_at)
+
+
+def _timeout(expires_at, now) -> int:
+    if expires_at is None:
+        return FRAGMENT_TIMEOUT
+    return max(1, min(FRAGMENT_TIMEOUT, math.ceil((expires_at - now).total_seconds())))
+
+
+def get_or_build(key: str, build):
+    """Return the fragments cached under ``key``, calling ``build`` on a miss."""
+    current = version()
+    now = timezone.now()
+    entry = cache.get(key)
+    if entry is not None and _is_fresh(entry, current, now):
+        return entry["fragments"]
+
+    lock = f"{key}:lock"
+    if cache.add(lock, 1, LOCK_TIMEOUT):
+        try:
+            # Read before building: a suchar going public during the build
+            # is already due at this moment.
+            expires_at = timeline.next_publication(now)
+            fragments = build()
+            entry = {
+                "version": current,
+                "expires_at": expires_at,
+                "fragments": fragments,
+            }
+            cache.set(key, entry, _timeout(expires_at, now))
+        finally:
+            cache.delete(lock)
+        return fragments
+
+    if entry is not None:
+        return entry["fragments"]
+    for _ in range(WAIT_STEPS):
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["fragments"]
+    return build()
@@ -0,0 +1,73 @@
+from contextlib import nullcontext
+from itertools import batched
+
+from django.core.management.base import BaseCommand
+
+from suchar_overflow.suchary import tallies
+from suchar_overflow.suchary import vote_buffer
+from suchar_overflow.suchary.models import Suchar
+
+
+class Command(BaseCommand):
+    help = "Checks the stored funny/dry/score tallies of every suchar against its votes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of suchary recounted per round of queries.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted tallies without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        # With the vote buffer on, each batch is checked while no flush runs,
+        # and suchary whose tallies still have deltas waiting in Redis, being
+        # written or about to be added are in flux and left for the next run.
+        buffered = vote_buffer.enabled()
+        if buffered:
+            vote_buffer.flush()
+        pks = Suchar.objects.order_by("pk").values_list("pk", flat=True)
+
+        checked = 0
+        drifted = 0
+        for chunk in batched(pks.iterator(), options["batch_size"], strict=False):
+            with vote_buffer.paused() if buffered else nullcontext():
+                batch_checked, stale = self._check(chunk, buffered=buffered)
+                if stale and not options["dry_run"]:
+                    tallies.recount(Suchar.objects.filter(pk__in=stale))
+            checked += batch_checked
+            drifted += len(stale)
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} suchary. {verb} {drifted} drifted tallies.",
+            ),
+        )
+
+    def _check(self, chunk, *, buffered):
+        """Report the drifted suchary of ``chunk``; return the count checked
+        and the drifted pks.
+        """
+        unsettled = vote_buffer.unsettled(chunk) if buffered else set()
+        pks = [pk for pk in chunk if pk not in unsettled]
+        batch = (
+            Suchar.objects.filter(pk__in=pks)
+            .order_by("pk")
+            .values_list("pk", *tallies.TALLY_FIELDS)
+        )
+        counted = tallies.count_votes(pks)
+        stale = []
+        for pk, *stored in batch:
+            expected = counted.get(pk, (0, 0, 0))
+            if tuple(stored) != expected:
+                stale.append(pk)
+                self.stdout.write(
+                    f"Suchar #{pk}: stored {tuple(stored)}, counted {expected}",
+                )
+        return len(pks), stale
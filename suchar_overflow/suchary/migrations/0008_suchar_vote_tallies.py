@@ -0,0 +1,23 @@
+# Generated by Django 6.0.6 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suchary', '0007_suchar_text_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='suchar',
+            name='dry_count',
+            field=models.IntegerField(default=0, verbose_name='Dry votes'),
+        ),
+        migrations.AddField(
+            model_name='suchar',
+            name='funny_count',
+            field=models.IntegerField(default=0, verbose_name='Funny votes'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models import IntegerField
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_vote_tallies(apps, schema_editor):
+    """Seed both tallies for every suchar in a single UPDATE."""
+    Suchar = apps.get_model("suchary", "Suchar")
+    Vote = apps.get_model("suchary", "Vote")
+
+    def tally(**flags):
+        counts = (
+            Vote.objects.filter(suchar=OuterRef("pk"), **flags)
+            .values("suchar")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    Suchar.objects.update(
+        funny_count=tally(is_funny=True),
+        dry_count=tally(is_dry=True),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("suchary", "0008_suchar_vote_tallies"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_vote_tallies, migrations.RunPython.noop),
+    ]
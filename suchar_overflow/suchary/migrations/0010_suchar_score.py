@@ -0,0 +1,26 @@
+# Generated by Django 6.0.6 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suchary', '0009_suchar_vote_tallies_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='suchar',
+            name='score',
+            field=models.IntegerField(default=0, verbose_name='Votes'),
+        ),
+        migrations.AddIndex(
+            model_name='suchar',
+            index=models.Index(fields=['-funny_count', '-dry_count', '-created_at'], name='suchar_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='suchar',
+            index=models.Index(fields=['-score'], name='suchar_score_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models import IntegerField
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_scores(apps, schema_editor):
+    """Seed ``score`` with each suchar's vote count in a single UPDATE."""
+    Suchar = apps.get_model("suchary", "Suchar")
+    Vote = apps.get_model("suchary", "Vote")
+
+    counts = (
+        Vote.objects.filter(suchar=OuterRef("pk"))
+        .values("suchar")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    Suchar.objects.update(
+        score=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("suchary", "0010_suchar_score"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+    ]
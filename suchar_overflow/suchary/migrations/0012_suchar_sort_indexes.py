@@ -0,0 +1,25 @@
+# Generated by Django 6.0.9 on 2026-10-18 11:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suchary', '0011_suchar_score_data'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='suchar',
+            name='suchar_top_idx',
+        ),
+        migrations.AddIndex(
+            model_name='suchar',
+            index=models.Index(fields=['-created_at', '-id'], name='suchar_new_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='suchar',
+            index=models.Index(fields=['-funny_count', '-dry_count', '-created_at', '-id'], name='suchar_top_idx'),
+        ),
+    ]
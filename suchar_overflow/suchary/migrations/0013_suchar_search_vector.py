@@ -0,0 +1,51 @@
+# Generated by Django 6.0.6 on 2026-10-18 16:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_config(apps, schema_editor):
+    """Create the ``suchar_search`` text search configuration.
+
+    ``simple`` behind ``unaccent`` where the extension is available, plain
+    ``simple`` otherwise (see suchary/search.py).
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'unaccent'",
+        )
+        has_unaccent = cursor.fetchone() is not None
+    schema_editor.execute(
+        "CREATE TEXT SEARCH CONFIGURATION suchar_search (COPY = pg_catalog.simple)",
+    )
+    if has_unaccent:
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+        schema_editor.execute(
+            "ALTER TEXT SEARCH CONFIGURATION suchar_search "
+            "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple",
+        )
+
+
+def drop_search_config(apps, schema_editor):
+    schema_editor.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS suchar_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suchary', '0012_suchar_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_config, drop_search_config),
+        migrations.AddField(
+            model_name='suchar',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='suchar',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='suchar_search_idx'),
+        ),
+    ]
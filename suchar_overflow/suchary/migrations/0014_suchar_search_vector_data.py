@@ -0,0 +1,38 @@
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef
+from django.db.models import StringAgg
+from django.db.models import Subquery
+from django.db.models import TextField
+from django.db.models import Value
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Index every suchar's text and tag names in a single UPDATE."""
+    Suchar = apps.get_model("suchary", "Suchar")
+    Tag = apps.get_model("suchary", "Tag")
+
+    tag_names = (
+        Tag.objects.filter(suchary=OuterRef("pk"))
+        .values("suchary")
+        .annotate(names=StringAgg("name", Value(" ")))
+        .values("names")
+    )
+    Suchar.objects.update(
+        search_vector=SearchVector("text", config="suchar_search", weight="A")
+        + SearchVector(
+            Subquery(tag_names, output_field=TextField()),
+            config="suchar_search",
+            weight="B",
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("suchary", "0013_suchar_search_vector"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
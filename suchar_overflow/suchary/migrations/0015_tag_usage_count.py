@@ -0,0 +1,57 @@
+# Generated by Django 6.0.9 on 2026-10-18 17:20
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def create_trigram_index(apps, schema_editor):
+    """Index ``UPPER(name)`` for trigram lookups if ``pg_trgm`` is available.
+
+    Without the extension the autocomplete still works, on a scan of the
+    tag table.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    Tag = apps.get_model("suchary", "Tag")
+    schema_editor.add_index(Tag, TRIGRAM_INDEX)
+
+
+def drop_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS tag_name_trgm_idx")
+
+
+TRIGRAM_INDEX = django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='tag_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suchary', '0014_suchar_search_vector_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='usage_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='tag',
+                    index=TRIGRAM_INDEX,
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_trigram_index, drop_trigram_index),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-usage_count', 'name'], name='tag_usage_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models import IntegerField
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_usage_counts(apps, schema_editor):
+    """Seed ``usage_count`` with each tag's number of suchary in one UPDATE."""
+    Suchar = apps.get_model("suchary", "Suchar")
+    Tag = apps.get_model("suchary", "Tag")
+
+    counts = (
+        Suchar.tags.through.objects.filter(tag=OuterRef("pk"))
+        .values("tag")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    Tag.objects.update(
+        usage_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("suchary", "0015_tag_usage_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_usage_counts, migrations.RunPython.noop),
+    ]
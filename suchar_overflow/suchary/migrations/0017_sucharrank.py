@@ -0,0 +1,24 @@
+# Generated by Django 6.0.9 on 2026-10-18 11:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suchary', '0016_tag_usage_count_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SucharRank',
+            fields=[
+                ('suchar', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='suchary.suchar')),
+                ('hot_score', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-hot_score', '-suchar'], name='suchar_hot_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+import datetime
+import math
+
+from django.db import migrations
+
+# Copied from ranking.py as they stood when this migration was written.
+EPOCH = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+TENFOLD_SECONDS = 12 * 60 * 60
+WEIGHTS = {"funny": 1.0, "dry": 0.5}
+BATCH_SIZE = 1000
+
+
+def seed_ranks(apps, schema_editor):
+    """Give every suchar a rank from its current tallies and publication date."""
+    Suchar = apps.get_model("suchary", "Suchar")
+    SucharRank = apps.get_model("suchary", "SucharRank")
+
+    ranks = []
+    for pk, funny, dry, published_at in Suchar.objects.values_list(
+        "pk",
+        "funny_count",
+        "dry_count",
+        "published_at",
+    ).iterator(chunk_size=BATCH_SIZE):
+        weight = funny * WEIGHTS["funny"] + dry * WEIGHTS["dry"]
+        age = (published_at - EPOCH).total_seconds()
+        ranks.append(
+            SucharRank(
+                suchar_id=pk,
+                hot_score=math.log10(1 + weight) + age / TENFOLD_SECONDS,
+            ),
+        )
+    SucharRank.objects.bulk_create(
+        ranks,
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("suchary", "0017_sucharrank"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_ranks, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,9 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -7,6 +11,19 @@ from django.utils.translation import gettext_lazy as _
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=50, unique=True)
+    # Number of suchary with this tag, recounted by the receivers in
+    # signals.py (tags.py).
+    usage_count = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # The autocomplete's name__icontains (UPPER(name) LIKE ...).
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="tag_name_trgm_idx",
+            ),
+            models.Index(fields=["-usage_count", "name"], name="tag_usage_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -26,6 +43,27 @@ class Suchar(models.Model):
         db_index=True,
     )
     tags = models.ManyToManyField(Tag, related_name="suchary", blank=True)
+    # Denormalized vote tallies, kept in step with Vote by the receivers in
+    # signals.py so readers don't have to count the votes table (tallies.py).
+    funny_count = models.IntegerField(_("Funny votes"), default=0)
+    dry_count = models.IntegerField(_("Dry votes"), default=0)
+    score = models.IntegerField(_("Votes"), default=0)
+    # Text and tag names for the list's search box, refreshed by the
+    # receivers in signals.py (search.py).
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # The list's "new" sort, id breaking ties as its cursors do.
+            models.Index(fields=["-created_at", "-id"], name="suchar_new_idx"),
+            # The list's "top" sort and the leaderboard's best suchary.
+            models.Index(
+                fields=["-funny_count", "-dry_count", "-created_at", "-id"],
+                name="suchar_top_idx",
+            ),
+            models.Index(fields=["-score"], name="suchar_score_idx"),
+            GinIndex(fields=["search_vector"], name="suchar_search_idx"),
+        ]
 
     def __str__(self):
         author_name = (
@@ -63,3 +101,24 @@ class Vote(models.Model):
             f"{user_name} voted on Suchar #{self.suchar_id} "
             f"(Funny: {self.is_funny}, Dry: {self.is_dry})"
         )
+
+
+class SucharRank(models.Model):
+    """The "hot" score of a suchar, kept up to date by ranking.py."""
+
+    suchar = models.OneToOneField(
+        Suchar,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="ranking",
+    )
+    hot_score = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            # The list's "hot" sort.
+            models.Index(fields=["-hot_score", "-suchar"], name="suchar_hot_idx"),
+        ]
+
+    def __str__(self):
+        return f"Suchar #{self.suchar_id}: {self.hot_score:.2f}"
@@ -0,0 +1,141 @@
+"""Keyset (cursor) pagination of the suchar list.
+
+Page-number pagination counts the whole filtered query and then skips
+``OFFSET`` rows, both of which get slower the deeper a reader scrolls. A
+cursor instead remembers the sort key of the last row shown, and the next
+page is simply the rows ordered after it, read straight off the index of
+its sort (``suchar_new_idx``, ``suchar_top_idx``, ``suchar_hot_idx``, each
+ending in the id) at any depth.
+
+Each sort orders by a unique key ending in ``id``, always descending.
+Cursors are signed, so a tampered or stale-format token is rejected as
+``InvalidCursorError`` rather than producing a bogus filter.
+"""
+
+import datetime
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+
+from django.core import signing
+from django.db.models import Q
+
+ORDERINGS = {
+    "new": ("created_at", "id"),
+    "top": ("funny_count", "dry_count", "created_at", "id"),
+    # Annotated by ranking.hot().
+    "hot": ("hot_score", "id"),
+}
+DEFAULT_SORT = "new"
+
+_SALT = "suchary.pagination"
+_PARSERS = {"created_at": datetime.datetime.fromisoformat, "hot_score": float}
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def sort_key(sort: str | None) -> str:
+    """Map the ``sort`` query parameter onto a key of ``ORDERINGS``."""
+    return sort if sort in ORDERINGS else DEFAULT_SORT
+
+
+def ordering(sort: str | None) -> list[str]:
+    return [f"-{field}" for field in ORDERINGS[sort_key(sort)]]
+
+
+def _serialize(value):
+    return value.isoformat() if isinstance(value, datetime.datetime) else value
+
+
+def encode(sort: str | None, obj, *, backwards: bool = False) -> str:
+    """Return a cursor pointing just past ``obj`` in the given direction."""
+    sort = sort_key(sort)
+    values = [_serialize(getattr(obj, field)) for field in ORDERINGS[sort]]
+    return signing.dumps({"s": sort, "k": values, "b": backwards}, salt=_SALT)
+
+
+def decode(cursor: str, sort: str | None) -> tuple[list, bool]:
+    """Return ``(key values, backwards)`` of a cursor made for ``sort``."""
+    sort = sort_key(sort)
+    try:
+        data = signing.loads(cursor, salt=_SALT)
+        fields = ORDERINGS[data["s"]]
+        if data["s"] != sort or len(data["k"]) != len(fields):
+            raise InvalidCursorError(cursor)
+        values = [
+            _PARSERS.get(field, int)(value)
+            for field, value in zip(fields, data["k"], strict=True)
+        ]
+    except (signing.BadSignature, KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError(cursor) from e
+    return values, bool(data["b"])
+
+
+def _beyond(fields, values, *, backwards: bool) -> Q:
+    """Rows ordered after (or, ``backwards``, before) the key ``values``.
+
+    The tuple comparison is spelled out as ``a < x OR (a = x AND b < y) ...``;
+    the redundant bound on the first field lets the planner range-scan the
+    index instead of evaluating the OR per row.
+    """
+    lookup = "gt" if backwards else "lt"
+    branches = [
+        Q(**dict(zip(fields[:i], values[:i], strict=True)))
+        & Q(**{f"{fields[i]}__{lookup}": values[i]})
+        for i in range(len(fields))
+    ]
+    bound = Q(**{f"{fields[0]}__{lookup}e": values[0]})
+    return bound & reduce(or_, branches)
+
+
+@dataclass
+class CursorPage:
+    object_list: list
+    next_cursor: str | None
+    previous_cursor: str | None
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+def paginate(queryset, sort: str | None, cursor: str | None, per_page: int):
+    """Return the ``CursorPage`` of ``queryset`` that ``cursor`` points at.
+
+    ``queryset`` must already be ordered by ``ordering(sort)``. Without a
+    cursor the first page is returned. One query, fetching a row more than
+    shown to learn whether the page in the direction of travel exists.
+    """
+    sort = sort_key(sort)
+    fields = ORDERINGS[sort]
+    backwards = False
+    if cursor:
+        values, backwards = decode(cursor, sort)
+        queryset = queryset.filter(_beyond(fields, values, backwards=backwards))
+    if backwards:
+        queryset = queryset.reverse()
+
+    rows = list(queryset[: per_page + 1])
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+    if not rows:
+        return CursorPage([], None, None)
+
+    # Coming from one side proves a page exists there; the extra row tells
+    # whether there's one further along.
+    has_next = more if not backwards else True
+    has_previous = more if backwards else bool(cursor)
+    return CursorPage(
+        rows,
+        encode(sort, rows[-1]) if has_next else None,
+        encode(sort, rows[0], backwards=True) if has_previous else None,
+    )
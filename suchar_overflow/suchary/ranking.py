@@ -0,0 +1,72 @@
+"""The "hot" score of each suchar, for the list's ``sort=hot``.
+
+The classic hot formula: ``log10(1 + weight)`` of the suchar's votes plus
+its publication time since ``EPOCH`` in units of ``TENFOLD``. A suchar
+published ``TENFOLD`` later than another outranks it unless the older one
+has over ten times its weight, so the hot sort favours suchary both fresh
+and liked where ``top`` ranks by all-time tallies. The sort is a range read
+of the ``suchar_hot_idx`` index instead of sorting every suchar.
+
+Time is folded into the score once, at publication, instead of decaying
+the scores as the clock runs. A score depends only on its suchar's row, so
+a vote moves it exactly (an un-vote restores the score it had before) and
+nothing else does: a hot page's cursor stays valid however late the next
+page is read. ``rescore`` recomputes the scores from the stored tallies;
+the toggle in votes.py does the same within its own statement.
+"""
+
+import datetime
+import math
+
+from django.db import connection
+from django.db.models import F
+
+EPOCH = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+TENFOLD = datetime.timedelta(hours=12)
+# "top" ranks funny votes before dry ones.
+WEIGHTS = {"funny": 1.0, "dry": 0.5}
+
+# Postgres' log() of a double is base 10, as in ``score``.
+_RESCORE_SQL = """
+UPDATE suchary_sucharrank AS r
+SET hot_score = log(1 + s.funny_count * %(funny_weight)s
+        + s.dry_count * %(dry_weight)s)
+    + extract(epoch FROM s.published_at - %(epoch)s)::double precision
+        / %(tenfold)s
+FROM suchary_suchar AS s
+WHERE r.suchar_id = s.id AND s.id = ANY(%(suchar_ids)s::bigint[])
+"""
+
+
+def params(**extra) -> dict:
+    """Query parameters of the hot formula, plus ``extra``."""
+    return {
+        "funny_weight": WEIGHTS["funny"],
+        "dry_weight": WEIGHTS["dry"],
+        "epoch": EPOCH,
+        "tenfold": TENFOLD.total_seconds(),
+        **extra,
+    }
+
+
+def score(suchar) -> float:
+    """The hot score of ``suchar``'s stored tallies and publication date."""
+    weight = suchar.funny_count * WEIGHTS["funny"] + suchar.dry_count * WEIGHTS["dry"]
+    age = (suchar.published_at - EPOCH).total_seconds()
+    return math.log10(1 + weight) + age / TENFOLD.total_seconds()
+
+
+def rescore(suchar_ids) -> None:
+    """Recompute the scores of ``suchar_ids`` in one UPDATE."""
+    suchar_ids = list(suchar_ids)
+    if not suchar_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(_RESCORE_SQL, params(suchar_ids=suchar_ids))
+
+
+def hot(queryset):
+    """Annotate ``hot_score`` on ``queryset``, for ordering by the hot sort."""
+    return queryset.filter(ranking__isnull=False).annotate(
+        hot_score=F("ranking__hot_score"),
+    )
@@ -0,0 +1,64 @@
+"""Full-text search over suchary and their tag names.
+
+Each suchar stores a ``search_vector`` (its text, weight A, plus its tag
+names, weight B) behind a GIN index, so the list's ``q`` filter is an index
+lookup instead of a scan of every text and tag. The vector is refreshed by
+the receivers in ``signals.py`` when a suchar is saved or its tags change.
+
+Documents and queries go through the ``suchar_search`` text search
+configuration created by migration 0012: the ``simple`` dictionary (no
+stemming, which would mangle Polish) behind ``unaccent``, so "zolw" finds
+"żółw". On a server without the ``unaccent`` extension the configuration is
+plain ``simple`` and searches are accent-sensitive.
+"""
+
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.contrib.postgres.search import SearchVector
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import StringAgg
+from django.db.models import Subquery
+from django.db.models import TextField
+from django.db.models import Value
+
+from .models import Suchar
+from .models import Tag
+
+CONFIG = "suchar_search"
+
+
+def document():
+    """The ``search_vector`` expression of a suchar, for use in an UPDATE."""
+    tag_names = (
+        Tag.objects.filter(suchary=OuterRef("pk"))
+        .values("suchary")
+        .annotate(names=StringAgg("name", Value(" ")))
+        .values("names")
+    )
+    return SearchVector("text", config=CONFIG, weight="A") + SearchVector(
+        Subquery(tag_names, output_field=TextField()),
+        config=CONFIG,
+        weight="B",
+    )
+
+
+def refresh(queryset) -> int:
+    """Recompute the search vector of every suchar in ``queryset``."""
+    return queryset.update(search_vector=document())
+
+
+def refresh_ids(suchar_ids) -> int:
+    return refresh(Suchar.objects.filter(pk__in=list(suchar_ids)))
+
+
+def search(queryset, q: str):
+    """Filter ``queryset`` to suchary matching ``q``, annotated with ``rank``.
+
+    ``q`` is read like a search engine query: words are ANDed, ``"quoted
+    phrases"``, ``or`` and ``-excluded`` words are understood.
+    """
+    query = SearchQuery(q, config=CONFIG, search_type="websearch")
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F("search_vector"), query),
+    )
@@ -0,0 +1,201 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_save
+from django.dispatch import Signal
+from django.dispatch import receiver
+
+from suchar_overflow import conditional
+
+from . import list_cache
+from . import ranking
+from . import search
+from . import tags
+from . import tallies
+from . import timeline
+from .models import Suchar
+from .models import SucharRank
+from .models import Tag
+from .models import Vote
+
+# Sent by ``votes.toggle``, whose SQL bypasses the model signals and has
+# already moved the tallies and the hot score. Receivers get the change
+# itself: ``vote`` (its pk is None once deleted), ``author_id`` of the
+# suchar, ``created``, ``deleted``, ``funny_delta`` and ``dry_delta`` (each
+# -1, 0 or +1), and the suchar's ``funny_count`` and ``dry_count`` after it.
+vote_toggled = Signal()
+
+
+@receiver(pre_save, sender=Vote)
+def remember_vote_flags(sender, instance, **kwargs):
+    # An edited vote (``vote.save()``, a shell, a fixture) is counted by how
+    # its flags differ from the stored ones, read before they are overwritten.
+    instance.stored_flags = None
+    if instance.pk is not None:
+        instance.stored_flags = (
+            Vote.objects.filter(pk=instance.pk)
+            .values_list("is_funny", "is_dry")
+            .first()
+        )
+
+
+def flag_deltas(vote) -> tuple[int, int]:
+    """Return the ``(funny, dry)`` deltas of saving an existing ``vote``."""
+    funny, dry = getattr(vote, "stored_flags", None) or (vote.is_funny, vote.is_dry)
+    return int(vote.is_funny) - int(funny), int(vote.is_dry) - int(dry)
+
+
+# These receivers are connected before the achievements app's (INSTALLED_APPS
+# order), so rules evaluated inline on the same vote see the updated tallies.
+@receiver(post_save, sender=Vote)
+def count_vote(sender, instance, created, **kwargs):
+    if created:
+        funny, dry, votes = int(instance.is_funny), int(instance.is_dry), 1
+    else:
+        (funny, dry), votes = flag_deltas(instance), 0
+    tallies.update(instance.suchar_id, funny=funny, dry=dry, votes=votes)
+    if funny or dry:
+        ranking.rescore([instance.suchar_id])
+
+
+def cascaded(origin) -> bool:
+    """Whether a vote is deleted along with its suchar or voter.
+
+    Such votes are loaded and signalled one by one, so instead of counting
+    each of them the suchar's and voter's own delete receivers adjust every
+    count they touch at once.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin is not None and model is not Vote
+
+
+@receiver(post_delete, sender=Vote)
+def uncount_vote(sender, instance, origin=None, **kwargs):
+    if cascaded(origin):
+        # A deleted suchar takes its tallies along; see ``recount_voted``.
+        return
+    tallies.update(
+        instance.suchar_id,
+        funny=-int(instance.is_funny),
+        dry=-int(instance.is_dry),
+        votes=-1,
+    )
+    if instance.is_funny or instance.is_dry:
+        ranking.rescore([instance.suchar_id])
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def remember_voted_suchary(sender, instance, **kwargs):
+    # Read while the user's votes still exist, for ``recount_voted``.
+    instance.voted_suchar_ids = list(
+        Vote.objects.filter(user_id=instance.pk).values_list("suchar_id", flat=True),
+    )
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def recount_voted(sender, instance, **kwargs):
+    # The user's votes are gone: one recount of the suchary they voted on.
+    suchar_ids = getattr(instance, "voted_suchar_ids", ())
+    if suchar_ids:
+        tallies.recount(Suchar.objects.filter(pk__in=suchar_ids))
+        ranking.rescore(suchar_ids)
+        list_cache.invalidate()
+
+
+@receiver(post_save, sender=Suchar)
+def rank_suchar(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        SucharRank.objects.create(suchar=instance, hot_score=ranking.score(instance))
+    elif update_fields is None or "published_at" in update_fields:
+        # The hot score counts from the publication date.
+        ranking.rescore([instance.pk])
+
+
+@receiver(post_save, sender=Suchar)
+def index_suchar(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or "text" in update_fields:
+        search.refresh_ids([instance.pk])
+
+
+@receiver(m2m_changed, sender=Suchar.tags.through)
+def index_suchar_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            search.refresh_ids([instance.pk])
+    elif action in {"post_add", "post_remove"}:
+        search.refresh_ids(pk_set)
+    elif action == "pre_clear":
+        # The rows are gone by post_clear, so the suchary are collected now.
+        _refresh_on_commit(instance)
+
+
+@receiver(m2m_changed, sender=Suchar.tags.through)
+def count_tag_usage(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            tags.recount_ids([instance.pk])
+    elif action in {"post_add", "post_remove"}:
+        tags.recount_ids(pk_set)
+    elif action == "pre_clear":
+        tags.recount(instance.tags.all(), excluding=instance.pk)
+
+
+@receiver(pre_delete, sender=Suchar)
+def uncount_tag_usage(sender, instance, **kwargs):
+    # The suchar's tag links are deleted with it, without an m2m_changed.
+    tags.recount(instance.tags.all(), excluding=instance.pk)
+
+
+@receiver(post_save, sender=Tag)
+def index_renamed_tag(sender, instance, created, **kwargs):
+    if not created:
+        search.refresh(instance.suchary.all())
+
+
+@receiver(pre_delete, sender=Tag)
+def index_deleted_tag(sender, instance, **kwargs):
+    _refresh_on_commit(instance)
+
+
+def _refresh_on_commit(tag):
+    suchar_ids = list(tag.suchary.values_list("pk", flat=True))
+    transaction.on_commit(lambda: search.refresh_ids(suchar_ids))
+
+
+@receiver(post_save, sender=Suchar)
+def reschedule_suchar(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or "published_at" in update_fields:
+        timeline.invalidate()
+
+
+@receiver(post_delete, sender=Suchar)
+def unschedule_suchar(sender, instance, **kwargs):
+    timeline.invalidate()
+
+
+# Anything a list card shows: the suchary themselves, their tags and tallies.
+@receiver(post_save, sender=Suchar)
+@receiver(post_delete, sender=Suchar)
+@receiver(post_save, sender=Vote)
+@receiver(post_delete, sender=Vote)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=Suchar.tags.through)
+@receiver(vote_toggled)
+def invalidate_list_cache(sender, origin=None, **kwargs):
+    if sender is Vote and cascaded(origin):
+        return
+    list_cache.invalidate()
+
+
+# Cards show their author and profiles their owner; logins change neither.
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_user_pages(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    conditional.touch_user(instance.pk)
+    list_cache.invalidate()
@@ -0,0 +1,84 @@
+"""Tag usage counts and the tag autocomplete.
+
+``Tag.usage_count`` is the number of suchary carrying the tag, recounted by
+the receivers in ``signals.py`` whenever tags are attached or detached, so
+the autocomplete can rank by popularity without joining the suchary.
+
+``autocomplete`` serves the tag field of the suchar form on every
+keystroke. Its ``name__icontains`` filter is backed by a trigram index on
+``UPPER(name)`` (migration 0014), tags starting with the typed text come
+first, then the most used. The shortest prefixes are what everyone types
+first and match the most tags, so their results are cached for a few
+seconds.
+"""
+
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import IntegerField
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Coalesce
+
+from .models import Suchar
+from .models import Tag
+
+LIMIT = 10
+# Queries up to this long are cached, for CACHE_TIMEOUT seconds.
+CACHED_PREFIX_LENGTH = 3
+CACHE_TIMEOUT = 30
+_CACHE_KEY = "suchary:tags:autocomplete:{}"
+
+
+def recount(queryset, *, excluding: int | None = None) -> int:
+    """Recount ``usage_count`` of every tag in ``queryset`` in one UPDATE.
+
+    ``excluding`` leaves one suchar's links out of the count, for a suchar
+    whose tags are about to be cleared or that is about to be deleted.
+    """
+    suchary = Suchar.tags.through.objects.filter(tag=OuterRef("pk"))
+    if excluding is not None:
+        suchary = suchary.exclude(suchar_id=excluding)
+    counts = suchary.values("tag").annotate(n=Count("pk")).values("n")
+    return queryset.update(
+        usage_count=Coalesce(
+            Subquery(counts, output_field=IntegerField()),
+            Value(0),
+        ),
+    )
+
+
+def recount_ids(tag_ids, *, excluding: int | None = None) -> int:
+    return recount(Tag.objects.filter(pk__in=list(tag_ids)), excluding=excluding)
+
+
+def _query(q: str) -> list[dict]:
+    tags = Tag.objects.all()
+    if q:
+        tags = tags.filter(name__icontains=q).annotate(
+            prefix=Case(
+                When(name__istartswith=q, then=Value(1)),
+                default=Value(0),
+            ),
+        )
+        tags = tags.order_by("-prefix", "-usage_count", "name")
+    else:
+        tags = tags.order_by("-usage_count", "name")
+    return list(tags.values("name", "slug")[:LIMIT])
+
+
+def autocomplete(q: str | None) -> list[dict]:
+    """Return up to ``LIMIT`` tags matching ``q`` as ``name``/``slug`` dicts."""
+    q = (q or "").strip()
+    if len(q) > CACHED_PREFIX_LENGTH:
+        return _query(q)
+    key = _CACHE_KEY.format(quote(q.casefold()))
+    tags = cache.get(key)
+    if tags is None:
+        tags = _query(q)
+        cache.set(key, tags, CACHE_TIMEOUT)
+    return tags
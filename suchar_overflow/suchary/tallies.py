@@ -0,0 +1,73 @@
+"""Denormalized vote tallies stored on ``Suchar``.
+
+``funny_count``, ``dry_count`` and ``score`` (the number of votes cast) are
+moved by ``F()`` deltas from the vote receivers in ``signals.py``, so lists
+and leaderboards read and sort by them without counting the votes table.
+``recount`` rebuilds them from the votes, used by ``reconcile_vote_counts``.
+"""
+
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import IntegerField
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+from .models import Suchar
+from .models import Vote
+
+TALLY_FIELDS = ("funny_count", "dry_count", "score")
+
+
+def update(suchar_id: int, *, funny: int = 0, dry: int = 0, votes: int = 0) -> None:
+    """Apply the given deltas to one suchar's tallies in a single UPDATE."""
+    changes = {
+        field: F(field) + delta
+        for field, delta in zip(TALLY_FIELDS, (funny, dry, votes), strict=True)
+        if delta
+    }
+    if changes:
+        Suchar.objects.filter(pk=suchar_id).update(**changes)
+
+
+def count_votes(suchar_ids) -> dict[int, tuple[int, int, int]]:
+    """Return ``{suchar_id: (funny, dry, votes)}`` counted from the votes.
+
+    Suchary without votes are left out.
+    """
+    rows = (
+        Vote.objects.filter(suchar_id__in=suchar_ids)
+        .values("suchar_id")
+        .annotate(
+            funny=Count("pk", filter=Q(is_funny=True)),
+            dry=Count("pk", filter=Q(is_dry=True)),
+            votes=Count("pk"),
+        )
+        .values_list("suchar_id", "funny", "dry", "votes")
+    )
+    return {suchar_id: counts for suchar_id, *counts in rows}
+
+
+def _subcount(**flags):
+    counts = (
+        Vote.objects.filter(suchar=OuterRef("pk"), **flags)
+        .values("suchar")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def recount(queryset) -> int:
+    """Recount the tallies of every suchar in ``queryset`` in one UPDATE.
+
+    Each row is recomputed by correlated subqueries inside the statement, so
+    a vote landing meanwhile can't be overwritten by a stale count.
+    """
+    return queryset.update(
+        funny_count=_subcount(is_funny=True),
+        dry_count=_subcount(is_dry=True),
+        score=_subcount(),
+    )
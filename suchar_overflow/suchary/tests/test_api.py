@@ -1,13 +1,19 @@
 import json
+from datetime import timedelta
 from http import HTTPStatus
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
 from suchar_overflow.conftest import make_user
 from suchar_overflow.suchary.models import Suchar
 from suchar_overflow.suchary.models import Tag
 from suchar_overflow.suchary.models import Vote
 
+FEED_URL = "/api/suchary/"
 TAGS_URL = "/api/suchary/tags"
 VOTE_URL = "/api/suchary/{pk}/vote"
 
@@ -91,6 +97,37 @@ def test_list_tags_schema_fields(client):
     assert "slug" in item
 
 
+@pytest.mark.django_db
+def test_list_tags_ranks_prefix_matches_then_popularity(client):
+    author = make_user("author")
+    python = Tag.objects.create(name="Python", slug="python")
+    typo = Tag.objects.create(name="Pythonowe", slug="pythonowe")
+    Tag.objects.create(name="Monty Python", slug="monty-python")
+    for _ in range(2):
+        Suchar.objects.create(text="Joke", author=author).tags.add(typo)
+    Suchar.objects.create(text="Joke", author=author).tags.add(python)
+
+    response = client.get(TAGS_URL, {"q": "pyth"})
+
+    names = [item["name"] for item in response.json()]
+    assert names == ["Pythonowe", "Python", "Monty Python"]
+
+
+@pytest.mark.django_db
+def test_list_tags_caches_short_prefixes(client, django_assert_num_queries):
+    Tag.objects.create(name="IT", slug="it")
+    client.get(TAGS_URL, {"q": "it"})
+    Tag.objects.create(name="Italia", slug="italia")
+
+    with django_assert_num_queries(0):
+        response = client.get(TAGS_URL, {"q": "IT"})
+    assert [item["name"] for item in response.json()] == ["IT"]
+
+    # Longer queries are specific enough to run every time.
+    with django_assert_num_queries(1):
+        client.get(TAGS_URL, {"q": "ital"})
+
+
 # ---------------------------------------------------------------------------
 # vote_suchar — auth requirement
 # ---------------------------------------------------------------------------
@@ -249,6 +286,78 @@ def test_vote_response_counts_multiple_voters(client):
     assert data["dry_count"] == 1
 
 
+@pytest.mark.django_db
+def test_vote_toggles_keep_stored_tallies_in_sync(client):
+    suchar = Suchar.objects.create(text="Joke", author=make_user("author"))
+    client.force_login(make_user("voter"))
+
+    for vote_type in ("funny", "dry", "funny"):
+        client.post(
+            vote_url(suchar.pk),
+            data=json.dumps({"vote_type": vote_type}),
+            content_type="application/json",
+        )
+    suchar.refresh_from_db()
+    assert (suchar.funny_count, suchar.dry_count) == (0, 1)
+
+    client.post(
+        vote_url(suchar.pk),
+        data=json.dumps({"vote_type": "dry"}),
+        content_type="application/json",
+    )
+    suchar.refresh_from_db()
+    assert (suchar.funny_count, suchar.dry_count) == (0, 0)
+    assert not Vote.objects.filter(suchar=suchar).exists()
+
+
+@pytest.mark.django_db
+def test_deleting_a_vote_decrements_stored_tallies():
+    suchar = Suchar.objects.create(text="Joke", author=make_user("author"))
+    vote = Vote.objects.create(
+        suchar=suchar,
+        user=make_user("voter"),
+        is_funny=True,
+        is_dry=True,
+    )
+    suchar.refresh_from_db()
+    assert (suchar.funny_count, suchar.dry_count, suchar.score) == (1, 1, 1)
+
+    vote.delete()
+    suchar.refresh_from_db()
+    assert (suchar.funny_count, suchar.dry_count, suchar.score) == (0, 0, 0)
+
+
+@pytest.mark.django_db
+def test_vote_toggle_is_one_statement_plus_delete(client):
+    suchar = Suchar.objects.create(text="Joke", author=make_user("author"))
+    client.force_login(make_user("voter"))
+
+    def vote_statements(vote_type):
+        with CaptureQueriesContext(connection) as ctx:
+            client.post(
+                vote_url(suchar.pk),
+                data=json.dumps({"vote_type": vote_type}),
+                content_type="application/json",
+            )
+        # Writes only: achievement rules may read the suchar afterwards.
+        return [
+            q["sql"]
+            for q in ctx.captured_queries
+            if q["sql"].lstrip().startswith(("WITH", "INSERT", "UPDATE", "DELETE"))
+            and ("suchary_vote" in q["sql"] or "suchary_suchar" in q["sql"])
+        ]
+
+    created = vote_statements("funny")
+    assert len(created) == 1
+    assert "ON CONFLICT" in created[0]
+
+    removed = vote_statements("funny")
+    assert len(removed) == 2  # noqa: PLR2004
+    assert removed[1].startswith("DELETE")
+    suchar.refresh_from_db()
+    assert (suchar.funny_count, suchar.dry_count, suchar.score) == (0, 0, 0)
+
+
 # ---------------------------------------------------------------------------
 # vote_suchar — error cases
 # ---------------------------------------------------------------------------
@@ -295,3 +404,100 @@ def test_vote_missing_payload_returns_422(client):
         content_type="application/json",
     )
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+# ---------------------------------------------------------------------------
+# list_suchary — the JSON feed
+# ---------------------------------------------------------------------------
+
+
+def make_suchary(author, count):
+    """Create ``count`` suchary, returned newest first."""
+    suchary = [
+        Suchar.objects.create(text=f"Joke {i}", author=author) for i in range(count)
+    ]
+    return suchary[::-1]
+
+
+@pytest.mark.django_db
+def test_feed_pages_by_cursor_and_hides_scheduled(client):
+    author = make_user("author")
+    suchary = make_suchary(author, 12)
+    Suchar.objects.create(
+        text="Scheduled",
+        author=author,
+        published_at=timezone.now() + timedelta(days=1),
+    )
+
+    data = client.get(FEED_URL).json()
+    assert [item["id"] for item in data["items"]] == [s.pk for s in suchary[:10]]
+    assert data["items"][0] == {
+        "id": suchary[0].pk,
+        "text": "Joke 11",
+        "author": "author",
+        "author_name": author.display_name,
+        "published_at": suchary[0].published_at.isoformat(),
+        "tags": [],
+        "funny_count": 0,
+        "dry_count": 0,
+        "user_is_funny": False,
+        "user_is_dry": False,
+    }
+
+    data = client.get(FEED_URL, {"cursor": data["next_cursor"]}).json()
+    assert [item["id"] for item in data["items"]] == [s.pk for s in suchary[10:]]
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.django_db
+def test_feed_filters_and_sends_only_the_fields_asked_for(
+    client,
+    django_assert_num_queries,
+):
+    author = make_user("author")
+    suchar = Suchar.objects.create(text="Kot w butach", author=author)
+    suchar.tags.add(Tag.objects.create(name="Koty", slug="koty"))
+    Suchar.objects.create(text="Pies", author=make_user("other"))
+
+    for params in ({"tag": "koty"}, {"author": "author"}, {"q": "kot"}):
+        data = client.get(FEED_URL, {**params, "fields": "id,tags"}).json()
+        assert data["items"] == [
+            {"id": suchar.pk, "tags": [{"name": "Koty", "slug": "koty"}]},
+        ]
+
+    with django_assert_num_queries(1):
+        data = client.get(FEED_URL, {"tag": "koty", "fields": "text"}).json()
+    assert data["items"] == [{"text": "Kot w butach"}]
+
+
+@pytest.mark.django_db
+def test_feed_includes_the_callers_votes(client):
+    voter = make_user("voter")
+    suchar = Suchar.objects.create(text="Joke", author=make_user("author"))
+    Vote.objects.create(suchar=suchar, user=voter, is_dry=True)
+
+    client.force_login(voter)
+    data = client.get(FEED_URL, {"fields": "user_is_funny,user_is_dry"}).json()
+    assert data["items"] == [{"user_is_funny": False, "user_is_dry": True}]
+
+
+@pytest.mark.django_db
+def test_feed_rejects_unknown_fields_and_bad_cursors(client):
+    assert client.get(FEED_URL, {"fields": "id,secret"}).status_code == (
+        HTTPStatus.BAD_REQUEST
+    )
+    assert client.get(FEED_URL, {"cursor": "bogus"}).status_code == (
+        HTTPStatus.BAD_REQUEST
+    )
+
+
+@pytest.mark.django_db
+def test_feed_continues_from_the_list_page(client):
+    suchary = make_suchary(make_user("author"), 25)
+
+    response = client.get(reverse("suchary:list"), {"sort": "top"})
+    cursor = response.context["feed_cursor"]
+    assert f'data-feed-cursor="{cursor}"' in response.content.decode()
+
+    data = client.get(FEED_URL, {"sort": "top", "cursor": cursor}).json()
+    assert [item["id"] for item in data["items"]] == [s.pk for s in suchary[10:20]]
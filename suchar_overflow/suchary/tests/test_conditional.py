@@ -0,0 +1,118 @@
+"""Tests for the ETags and conditional GETs of the list, leaderboard and profiles."""
+
+import json
+
+import pytest
+from django.conf import settings
+from django.test import Client
+from django.urls import reverse
+
+from suchar_overflow.achievements.models import Achievement
+from suchar_overflow.achievements.models import UserAchievement
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary.models import Suchar
+
+LIST_URL = reverse("suchary:list")
+
+
+@pytest.fixture
+def client(client, db):
+    # A returning visitor, whose browser already holds the CSRF cookie.
+    client.get(LIST_URL)
+    return client
+
+
+def revalidate(client, url, response):
+    return client.get(url, headers={"if-none-match": response["ETag"]})
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [LIST_URL, reverse("stats:leaderboard")])
+def test_unchanged_page_is_not_modified(client, url):
+    Suchar.objects.create(text="Joke", author=make_user("author"))
+
+    response = client.get(url)
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response["ETag"]
+    assert response["Last-Modified"]
+    assert "no-cache" in response["Cache-Control"]
+
+    revalidated = revalidate(client, url, response)
+    assert revalidated.status_code == 304  # noqa: PLR2004
+    assert revalidated["ETag"] == response["ETag"]
+    assert not revalidated.content
+
+
+@pytest.mark.django_db
+def test_pages_carry_no_csp_nonce_a_304_would_invalidate(client):
+    response = client.get(LIST_URL)
+    assert "nonce=" not in response.content.decode()
+    revalidated = revalidate(client, LIST_URL, response)
+    assert revalidated.status_code == 304  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_first_visit_is_revalidated_once_it_has_its_csrf_cookie():
+    client = Client()
+    first = client.get(LIST_URL)
+    assert settings.CSRF_COOKIE_NAME in first.cookies
+
+    second = revalidate(client, LIST_URL, first)
+    assert second.status_code == 200  # noqa: PLR2004
+    assert revalidate(client, LIST_URL, second).status_code == 304  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_new_suchar_or_vote_changes_the_etag(client):
+    author = make_user("author")
+    response = client.get(LIST_URL)
+
+    suchar = Suchar.objects.create(text="Fresh joke", author=author)
+    changed = revalidate(client, LIST_URL, response)
+    assert changed.status_code == 200  # noqa: PLR2004
+    assert "Fresh joke" in changed.content.decode()
+
+    client.force_login(make_user("voter"))
+    response = client.get(LIST_URL)
+    client.post(
+        f"/api/suchary/{suchar.pk}/vote",
+        data=json.dumps({"vote_type": "funny"}),
+        content_type="application/json",
+    )
+    assert revalidate(client, LIST_URL, response).status_code == 200  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_etag_is_per_visitor_and_query(client):
+    client.force_login(make_user("first"))
+    response = client.get(LIST_URL)
+    assert "private" in response["Cache-Control"]
+    other_sort = client.get(LIST_URL, {"sort": "top"})
+    assert other_sort["ETag"] != response["ETag"]
+
+    client.force_login(make_user("second"))
+    assert revalidate(client, LIST_URL, response).status_code == 200  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_profile_changes_with_its_owners_awards_and_edits(client):
+    owner = make_user("owner")
+    url = reverse("users:detail", kwargs={"username": owner.username})
+    client.force_login(make_user("visitor"))
+    response = client.get(url)
+    assert revalidate(client, url, response).status_code == 304  # noqa: PLR2004
+
+    achievement = Achievement.objects.create(
+        name="First post",
+        slug="first-post",
+        event_type=Achievement.EventType.SUCHAR_POSTED,
+        metric=Achievement.Metric.COUNT_SUCHAR,
+        threshold=1,
+    )
+    UserAchievement.objects.create(user=owner, achievement=achievement)
+    response = revalidate(client, url, response)
+    assert response.status_code == 200  # noqa: PLR2004
+
+    owner.name = "Renamed"
+    owner.save()
+    assert revalidate(client, url, response).status_code == 200  # noqa: PLR2004
@@ -0,0 +1,102 @@
+"""Tests for the cached list fragments served to anonymous visitors."""
+
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary import list_cache
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Vote
+
+LIST_URL = reverse("suchary:list")
+
+
+def suchar_queries(client, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(LIST_URL, params or {})
+    return response, [q for q in ctx.captured_queries if "suchary_suchar" in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_anonymous_pages_are_served_from_cache_until_a_vote(client):
+    suchar = Suchar.objects.create(text="Cached joke", author=make_user("author"))
+
+    _, queries = suchar_queries(client, {"sort": "top"})
+    assert queries
+    response, queries = suchar_queries(client, {"sort": "top"})
+    assert not queries
+    assert "Cached joke" in response.content.decode()
+
+    Vote.objects.create(suchar=suchar, user=make_user("voter"), is_funny=True)
+    response, queries = suchar_queries(client, {"sort": "top"})
+    assert queries
+    assert 'vote-count fw-bold">1<' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_searches_and_logged_in_users_bypass_the_cache(client):
+    Suchar.objects.create(text="Cached joke", author=make_user("author"))
+
+    suchar_queries(client, {"q": "joke"})
+    _, queries = suchar_queries(client, {"q": "joke"})
+    assert queries
+
+    client.force_login(make_user("reader"))
+    suchar_queries(client)
+    _, queries = suchar_queries(client)
+    assert queries
+
+
+def test_key_covers_filters_and_rejects_other_parameters():
+    assert list_cache.key_for({"sort": "top", "page": "2"}, max_page=5)
+    assert list_cache.key_for({"sort": "top"}, max_page=5) != list_cache.key_for(
+        {"sort": "top", "tag": "it"},
+        max_page=5,
+    )
+    assert list_cache.key_for({"page": "6"}, max_page=5) is None
+    assert list_cache.key_for({"page": "last"}, max_page=5) is None
+    assert list_cache.key_for({"utm_source": "x"}, max_page=5) is None
+
+
+def test_concurrent_miss_serves_stale_entry_while_another_rebuilds():
+    key = "suchary:list:test"
+    cache.set(key, {"version": "old", "fragments": {"list_cards": "stale"}})
+    cache.add(f"{key}:lock", 1)
+    build = Mock(return_value={"list_cards": "fresh"})
+
+    assert list_cache.get_or_build(key, build) == {"list_cards": "stale"}
+    build.assert_not_called()
+
+
+def test_concurrent_miss_without_entry_waits_for_the_rebuild(monkeypatch):
+    key = "suchary:list:test"
+    cache.add(f"{key}:lock", 1)
+    build = Mock(return_value={"list_cards": "own"})
+
+    def rebuilt_meanwhile(seconds):
+        cache.set(key, {"version": "any", "fragments": {"list_cards": "winner"}})
+
+    monkeypatch.setattr(list_cache.time, "sleep", rebuilt_meanwhile)
+
+    assert list_cache.get_or_build(key, build) == {"list_cards": "winner"}
+    build.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_miss_rebuilds_once_and_caches_under_the_current_version():
+    key = "suchary:list:test"
+    build = Mock(return_value={"list_cards": "fresh"})
+
+    list_cache.get_or_build(key, build)
+    list_cache.get_or_build(key, build)
+
+    build.assert_called_once()
+    assert cache.get(f"{key}:lock") is None
+    list_cache.invalidate()
+    list_cache.get_or_build(key, build)
+    assert build.call_count == 2  # noqa: PLR2004
@@ -0,0 +1,110 @@
+"""Tests for the "hot" ranking behind ``sort=hot``."""
+
+import json
+import math
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary import pagination
+from suchar_overflow.suchary import ranking
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import SucharRank
+from suchar_overflow.suchary.models import Vote
+
+LIST_URL = reverse("suchary:list")
+
+
+def hot_score(suchar):
+    return SucharRank.objects.get(suchar=suchar).hot_score
+
+
+def vote(client, suchar, vote_type):
+    client.post(
+        f"/api/suchary/{suchar.pk}/vote",
+        data=json.dumps({"vote_type": vote_type}),
+        content_type="application/json",
+    )
+
+
+@pytest.mark.django_db
+def test_votes_move_the_score_and_unvotes_restore_it(client):
+    suchar = Suchar.objects.create(text="Joke", author=make_user("author"))
+    unvoted = hot_score(suchar)
+    assert unvoted == pytest.approx(ranking.score(suchar))
+
+    client.force_login(make_user("voter"))
+    vote(client, suchar, "funny")
+    vote(client, suchar, "dry")
+    assert hot_score(suchar) == pytest.approx(unvoted + math.log10(2.5))
+
+    vote(client, suchar, "funny")
+    vote(client, suchar, "dry")
+    assert hot_score(suchar) == pytest.approx(unvoted)
+
+
+@pytest.mark.django_db
+def test_orm_votes_move_the_score_too():
+    suchar = Suchar.objects.create(text="Joke", author=make_user("author"))
+    unvoted = hot_score(suchar)
+    vote = Vote.objects.create(suchar=suchar, user=make_user("voter"), is_funny=True)
+    assert hot_score(suchar) == pytest.approx(unvoted + math.log10(2))
+
+    vote.delete()
+    assert hot_score(suchar) == pytest.approx(unvoted)
+
+
+@pytest.mark.django_db
+def test_fresher_suchar_outranks_one_under_ten_times_its_weight():
+    author = make_user("author")
+    now = timezone.now()
+    older = Suchar.objects.create(
+        text="Older",
+        author=author,
+        published_at=now - ranking.TENFOLD,
+    )
+    fresher = Suchar.objects.create(text="Fresher", author=author, published_at=now)
+    for i in range(8):
+        Vote.objects.create(suchar=older, user=make_user(f"v{i}"), is_funny=True)
+    assert hot_score(fresher) > hot_score(older)
+
+    Vote.objects.create(suchar=older, user=make_user("tenth"), is_funny=True)
+    Vote.objects.create(suchar=older, user=make_user("eleventh"), is_funny=True)
+    assert hot_score(older) > hot_score(fresher)
+
+
+@pytest.mark.django_db
+def test_rescheduled_suchar_is_rescored():
+    suchar = Suchar.objects.create(text="Joke", author=make_user("author"))
+    suchar.published_at += ranking.TENFOLD
+    suchar.save(update_fields=["published_at"])
+
+    suchar.refresh_from_db()
+    assert hot_score(suchar) == pytest.approx(ranking.score(suchar))
+
+
+@pytest.mark.django_db
+def test_hot_sort_orders_by_score_and_pages_by_cursor(client):
+    author = make_user("author")
+    suchary = [
+        Suchar.objects.create(text=f"Joke {i}", author=author) for i in range(12)
+    ]
+    for score, suchar in enumerate(suchary):
+        SucharRank.objects.filter(suchar=suchar).update(hot_score=score / 2)
+    scheduled = Suchar.objects.create(
+        text="Scheduled",
+        author=author,
+        published_at=timezone.now() + timedelta(days=1),
+    )
+    SucharRank.objects.filter(suchar=scheduled).update(hot_score=100)
+
+    response = client.get(LIST_URL, {"sort": "hot"})
+    first_page = list(response.context["suchary"])
+    assert first_page == suchary[::-1][:10]
+
+    cursor = pagination.encode("hot", first_page[-1])
+    response = client.get(LIST_URL, {"sort": "hot", "cursor": cursor})
+    assert response.context["cursor_page"].object_list == suchary[1::-1]
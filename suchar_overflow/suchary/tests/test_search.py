@@ -0,0 +1,75 @@
+"""Tests for the full-text search vector and its upkeep."""
+
+import pytest
+from django.db import connection
+
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary import search
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Tag
+
+
+def found(q):
+    return list(search.search(Suchar.objects.all(), q).order_by("-rank", "-id"))
+
+
+def has_unaccent():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'unaccent'")
+        return cursor.fetchone() is not None
+
+
+@pytest.mark.django_db
+def test_text_matches_rank_above_tag_matches():
+    author = make_user("author")
+    tagged = Suchar.objects.create(text="Why did the chicken", author=author)
+    tagged.tags.add(Tag.objects.create(name="Python", slug="python"))
+    in_text = Suchar.objects.create(text="A python walks into a bar", author=author)
+    Suchar.objects.create(text="Unrelated", author=author)
+
+    assert found("python") == [in_text, tagged]
+    assert found("python -bar") == [tagged]
+
+
+@pytest.mark.django_db
+def test_vector_follows_text_and_tag_changes():
+    suchar = Suchar.objects.create(text="Old text", author=make_user("author"))
+    tag = Tag.objects.create(name="Koty", slug="koty")
+
+    suchar.tags.add(tag)
+    assert found("koty") == [suchar]
+
+    tag.name = "Psy"
+    tag.save()
+    assert found("psy") == [suchar]
+    assert found("koty") == []
+
+    tag.suchary.remove(suchar)
+    assert found("psy") == []
+
+    suchar.text = "New text"
+    suchar.save()
+    assert found("new") == [suchar]
+    assert found("old") == []
+
+
+@pytest.mark.django_db
+def test_tag_deletion_reindexes_after_commit(django_capture_on_commit_callbacks):
+    suchar = Suchar.objects.create(text="Joke", author=make_user("author"))
+    tag = Tag.objects.create(name="Koty", slug="koty")
+    suchar.tags.add(tag)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        tag.delete()
+
+    assert found("koty") == []
+
+
+@pytest.mark.django_db
+def test_search_ignores_polish_diacritics():
+    if not has_unaccent():
+        pytest.skip("the unaccent extension is not installed")
+    suchar = Suchar.objects.create(text="Żółw na łące", author=make_user("author"))
+
+    assert found("zolw lace") == [suchar]
+    assert found("ŻÓŁW") == [suchar]
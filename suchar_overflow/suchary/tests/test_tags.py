@@ -0,0 +1,63 @@
+"""Tests for the per-tag usage counts."""
+
+import pytest
+
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary import tags
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Tag
+
+
+def usage(*tag_list):
+    return [Tag.objects.get(pk=tag.pk).usage_count for tag in tag_list]
+
+
+@pytest.mark.django_db
+def test_usage_counts_follow_tag_changes_from_both_sides():
+    author = make_user("author")
+    first = Suchar.objects.create(text="One", author=author)
+    second = Suchar.objects.create(text="Two", author=author)
+    koty = Tag.objects.create(name="Koty", slug="koty")
+    psy = Tag.objects.create(name="Psy", slug="psy")
+
+    first.tags.add(koty, psy)
+    koty.suchary.add(second)
+    assert usage(koty, psy) == [2, 1]
+
+    # Removing a tag the suchar doesn't carry changes nothing.
+    second.tags.remove(koty, psy)
+    assert usage(koty, psy) == [1, 1]
+
+    first.tags.clear()
+    assert usage(koty, psy) == [0, 0]
+
+    koty.suchary.add(first, second)
+    koty.suchary.clear()
+    assert usage(koty) == [0]
+
+
+@pytest.mark.django_db
+def test_deleting_a_suchar_uncounts_its_tags():
+    author = make_user("author")
+    suchar = Suchar.objects.create(text="One", author=author)
+    Suchar.objects.create(text="Two", author=author).tags.add(
+        koty := Tag.objects.create(name="Koty", slug="koty"),
+    )
+    suchar.tags.add(koty)
+
+    suchar.delete()
+    assert usage(koty) == [1]
+
+    author.delete()
+    assert usage(koty) == [0]
+
+
+@pytest.mark.django_db
+def test_recount_repairs_drifted_counts():
+    suchar = Suchar.objects.create(text="One", author=make_user("author"))
+    koty = Tag.objects.create(name="Koty", slug="koty")
+    suchar.tags.add(koty)
+    Tag.objects.update(usage_count=42)
+
+    assert tags.recount(Tag.objects.all()) == 1
+    assert usage(koty) == [1]
@@ -0,0 +1,82 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary import ranking
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import SucharRank
+from suchar_overflow.suchary.models import Vote
+
+
+@pytest.fixture
+def drifted(db):
+    author = make_user("author")
+    suchar = Suchar.objects.create(text="Joke", author=author)
+    Vote.objects.create(suchar=suchar, user=make_user("v1"), is_funny=True)
+    Vote.objects.create(suchar=suchar, user=make_user("v2"), is_dry=True)
+    clean = Suchar.objects.create(text="Clean", author=author)
+    Suchar.objects.filter(pk=suchar.pk).update(funny_count=7, score=0)
+    return suchar, clean
+
+
+@pytest.mark.django_db
+def test_reconcile_vote_counts_fixes_drifted_tallies(drifted):
+    suchar, clean = drifted
+    out = io.StringIO()
+
+    call_command("reconcile_vote_counts", stdout=out)
+
+    suchar.refresh_from_db()
+    assert (suchar.funny_count, suchar.dry_count, suchar.score) == (1, 1, 2)
+    assert f"Suchar #{suchar.pk}" in out.getvalue()
+    assert f"Suchar #{clean.pk}" not in out.getvalue()
+    assert "Checked 2 suchary. Fixed 1 drifted tallies." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_reconcile_vote_counts_dry_run_changes_nothing(drifted):
+    suchar, _ = drifted
+    out = io.StringIO()
+
+    call_command("reconcile_vote_counts", "--dry-run", "--batch-size", "1", stdout=out)
+
+    suchar.refresh_from_db()
+    assert suchar.funny_count == 7  # noqa: PLR2004
+    assert "Found 1 drifted tallies." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_edited_vote_moves_the_tallies_and_hot_score_by_its_flag_change():
+    suchar = Suchar.objects.create(text="Joke", author=make_user("author"))
+    vote = Vote.objects.create(suchar=suchar, user=make_user("voter"), is_funny=True)
+
+    vote.is_funny, vote.is_dry = False, True
+    vote.save()
+    vote.save()  # unchanged flags move nothing
+
+    suchar.refresh_from_db()
+    assert (suchar.funny_count, suchar.dry_count, suchar.score) == (0, 1, 1)
+    assert SucharRank.objects.get(suchar=suchar).hot_score == pytest.approx(
+        ranking.score(suchar),
+    )
+
+
+@pytest.mark.django_db
+def test_deleting_a_voter_recounts_the_suchary_they_voted_on():
+    author = make_user("author")
+    voter = make_user("voter")
+    suchary = [Suchar.objects.create(text=f"Joke {i}", author=author) for i in range(3)]
+    for suchar in suchary:
+        Vote.objects.create(suchar=suchar, user=voter, is_funny=True)
+        Vote.objects.create(suchar=suchar, user=make_user(f"v{suchar.pk}"), is_dry=True)
+
+    voter.delete()
+
+    for suchar in suchary:
+        suchar.refresh_from_db()
+        assert (suchar.funny_count, suchar.dry_count, suchar.score) == (0, 1, 1)
+        assert SucharRank.objects.get(suchar=suchar).hot_score == pytest.approx(
+            ranking.score(suchar),
+        )
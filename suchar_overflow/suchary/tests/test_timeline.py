@@ -0,0 +1,98 @@
+"""Tests for the publication timeline and the list pages it expires."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary import timeline
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import Tag
+
+LIST_URL = reverse("suchary:list")
+
+
+def suchar_queries(client, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(LIST_URL, params or {})
+    return response, [q for q in ctx.captured_queries if "suchary_suchar" in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_next_publication_is_the_earliest_pending_and_follows_edits():
+    author = make_user("author")
+    now = timezone.now()
+    assert timeline.next_publication() is None
+
+    later = Suchar.objects.create(
+        text="Later",
+        author=author,
+        published_at=now + timedelta(hours=2),
+    )
+    assert timeline.next_publication() == later.published_at
+    sooner = Suchar.objects.create(
+        text="Sooner",
+        author=author,
+        published_at=now + timedelta(hours=1),
+    )
+    assert timeline.next_publication() == sooner.published_at
+
+    sooner.published_at = now + timedelta(hours=3)
+    sooner.save()
+    assert timeline.next_publication() == later.published_at
+    later.delete()
+    assert timeline.next_publication() == sooner.published_at
+
+
+@pytest.mark.django_db
+def test_next_publication_is_read_from_cache(django_assert_num_queries):
+    timeline.next_publication()
+    with django_assert_num_queries(0):
+        assert timeline.next_publication() is None
+
+
+@pytest.mark.django_db
+def test_cached_page_expires_when_a_scheduled_suchar_goes_public(client):
+    now = timezone.now()
+    Suchar.objects.create(
+        text="Scheduled joke",
+        author=make_user("author"),
+        published_at=now + timedelta(minutes=10),
+    )
+
+    suchar_queries(client)
+    response, queries = suchar_queries(client)
+    assert not queries
+    assert "Scheduled joke" not in response.content.decode()
+
+    with patch("django.utils.timezone.now", return_value=now + timedelta(minutes=11)):
+        response, queries = suchar_queries(client)
+    assert queries
+    assert "Scheduled joke" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_tick_warms_the_pages_of_newly_published_suchary(client):
+    now = timezone.now()
+    suchar = Suchar.objects.create(
+        text="Scheduled joke",
+        author=make_user("author"),
+        published_at=now + timedelta(seconds=30),
+    )
+    suchar.tags.add(Tag.objects.create(name="Koty", slug="koty"))
+
+    with patch("django.utils.timezone.now", return_value=now):
+        assert timeline.tick() == 0
+    published = now + timedelta(minutes=1)
+    with patch("django.utils.timezone.now", return_value=published):
+        assert timeline.tick() == 1
+        for params in ({}, {"sort": "top"}, {"author": "author"}, {"tag": "koty"}):
+            response, queries = suchar_queries(client, params)
+            assert not queries
+            assert "Scheduled joke" in response.content.decode()
+        assert timeline.tick() == 0
@@ -7,6 +7,7 @@ from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext
 
+from suchar_overflow.suchary import pagination
 from suchar_overflow.suchary.models import Suchar
 from suchar_overflow.suchary.models import Tag
 from suchar_overflow.suchary.models import Vote
@@ -177,3 +178,74 @@ def test_search_query_with_special_chars_is_urlencoded_in_links(
     # start of a new parameter, breaking the pagination/filter-removal links.
     assert "q=Fish & Chips" not in content
     assert "%26" in content
+
+
+def _make_suchary(user, count, created_at=None):
+    created_at = created_at or timezone.now()
+    suchary = Suchar.objects.bulk_create(
+        [Suchar(text=f"Joke {i}", author=user) for i in range(count)],
+    )
+    # Shared timestamps, so the id tie-breaker is what keeps pages apart.
+    Suchar.objects.update(created_at=created_at)
+    return sorted(suchary, key=lambda s: s.pk, reverse=True)
+
+
+@pytest.mark.django_db
+def test_deep_pages_switch_to_cursor_pagination(client, django_user_model):
+    user = django_user_model.objects.create_user(username="author")
+    expected = _make_suchary(user, 65)
+    url = reverse("suchary:list")
+
+    response = client.get(url, {"page": 5})
+    next_cursor = response.context["next_cursor"]
+    assert next_cursor
+    assert "cursor=" in response.content.decode()
+    assert list(response.context["page_range"]) == [1, 2, 3, 4, 5]
+
+    seen = list(response.context["suchary"])
+    while next_cursor:
+        response = client.get(url, {"cursor": next_cursor})
+        page = response.context["cursor_page"]
+        seen.extend(page.object_list)
+        next_cursor = page.next_cursor
+    assert seen == expected[40:]
+
+    # Walking back from the last page returns the previous one intact.
+    response = client.get(url, {"cursor": page.previous_cursor})
+    assert list(response.context["suchary"]) == expected[50:60]
+    assert response.context["cursor_page"].has_next()
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_top_sort(client, django_user_model):
+    user = django_user_model.objects.create_user(username="author")
+    suchary = _make_suchary(user, 12)
+    Suchar.objects.filter(pk=suchary[-1].pk).update(funny_count=3)
+    Suchar.objects.filter(pk=suchary[0].pk).update(dry_count=1)
+    url = reverse("suchary:list")
+
+    response = client.get(url, {"sort": "top"})
+    first_page = list(response.context["suchary"])
+    assert first_page == [suchary[-1], *suchary[:9]]
+
+    cursor = pagination.encode("top", first_page[-1])
+    response = client.get(url, {"sort": "top", "cursor": cursor})
+    page = response.context["cursor_page"]
+    assert page.object_list == suchary[9:11]
+    assert not page.has_next()
+
+    response = client.get(url, {"sort": "top", "cursor": page.previous_cursor})
+    assert response.context["suchary"] == first_page
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_404(client, django_user_model):
+    user = django_user_model.objects.create_user(username="author")
+    suchar = Suchar.objects.create(text="Joke", author=user)
+    url = reverse("suchary:list")
+
+    assert client.get(url, {"cursor": "garbage"}).status_code == HTTPStatus.NOT_FOUND
+    # A cursor is only valid for the sort it was made for.
+    cursor = pagination.encode("new", suchar)
+    response = client.get(url, {"sort": "top", "cursor": cursor})
+    assert response.status_code == HTTPStatus.NOT_FOUND
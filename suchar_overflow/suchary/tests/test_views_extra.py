@@ -5,6 +5,8 @@ from http import HTTPStatus
 
 import pytest
 from django.contrib.messages import get_messages
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext
@@ -109,6 +111,32 @@ def test_list_no_user_vote_annotations_for_anonymous(client, django_user_model):
     assert not hasattr(suchary[0], "user_is_funny") or suchary[0].user_is_funny is None
 
 
+@pytest.mark.django_db
+def test_list_loads_user_votes_for_the_page_in_one_query(client):
+    author = make_user("author")
+    voter = make_user("voter")
+    funny = set()
+    for i in range(12):
+        suchar = Suchar.objects.create(text=f"joke {i}", author=author)
+        Vote.objects.create(suchar=suchar, user=voter, is_funny=i % 2, is_dry=True)
+        if i % 2:
+            funny.add(suchar.pk)
+    client.force_login(voter)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse(LIST_URL))
+
+    vote_queries = [
+        q["sql"] for q in ctx.captured_queries if "suchary_vote" in q["sql"]
+    ]
+    assert len(vote_queries) == 1
+    assert " IN (" in vote_queries[0]
+    shown = response.context["suchary"]
+    assert len(shown) == 10  # noqa: PLR2004
+    assert {s.pk for s in shown if s.user_is_funny} == funny & {s.pk for s in shown}
+    assert all(s.user_is_dry for s in shown)
+
+
 # ===========================================================================
 # SucharListView — combined text + tag filter
 # ===========================================================================
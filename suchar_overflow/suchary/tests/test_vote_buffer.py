@@ -0,0 +1,270 @@
+"""Tests for the Redis-buffered vote tallies of ``SUCHARY_VOTE_BUFFER``."""
+
+import io
+import json
+from collections import defaultdict
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.urls import reverse
+
+from suchar_overflow.conftest import make_user
+from suchar_overflow.suchary import ranking
+from suchar_overflow.suchary import vote_buffer
+from suchar_overflow.suchary.models import Suchar
+from suchar_overflow.suchary.models import SucharRank
+from suchar_overflow.suchary.models import Vote
+
+
+class FakeRedis:
+    """The few Redis commands the buffer sends, replying with bytes like Redis."""
+
+    def __init__(self):
+        self.hashes = defaultdict(dict)
+        self.sets = defaultdict(set)
+        self.strings = {}
+
+    def pipeline(self, *, transaction=True):
+        return FakePipeline(self)
+
+    def set(self, key, value, *, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value.encode()
+        return True
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def exists(self, *keys):
+        return sum(key in self.hashes or key in self.strings for key in keys)
+
+    def expire(self, key, seconds):
+        return int(key in self.hashes)
+
+    def renamenx(self, key, new_key):
+        if new_key in self.hashes:
+            return False
+        self.hashes[new_key] = self.hashes.pop(key)
+        return True
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes[key]
+        value = int(fields.get(field.encode(), 0)) + amount
+        fields[field.encode()] = str(value).encode()
+        return value
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def delete(self, key):
+        found = self.hashes.pop(key, None) or self.strings.pop(key, None)
+        return int(found is not None)
+
+    def sadd(self, key, *members):
+        self.sets[key].update(str(member).encode() for member in members)
+
+    def spop(self, key, count):
+        members = sorted(self.sets[key])[:count]
+        self.sets[key].difference_update(members)
+        return members
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        replies = [getattr(self.client, name)(*args) for name, args in self.commands]
+        self.commands = []
+        return replies
+
+
+@pytest.fixture
+def redis(settings):
+    settings.SUCHARY_VOTE_BUFFER = True
+    client = FakeRedis()
+    with patch.object(vote_buffer, "get_redis_connection", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def suchar(db):
+    return Suchar.objects.create(text="Joke", author=make_user("author"))
+
+
+def vote(client, suchar, vote_type, capture):
+    with capture(execute=True):
+        response = client.post(
+            f"/api/suchary/{suchar.pk}/vote",
+            data=json.dumps({"vote_type": vote_type}),
+            content_type="application/json",
+        )
+    return response.json()
+
+
+def stored_tallies(suchar):
+    suchar.refresh_from_db()
+    return suchar.funny_count, suchar.dry_count, suchar.score
+
+
+@pytest.mark.django_db
+def test_votes_are_counted_in_redis_until_flushed(
+    client,
+    redis,
+    suchar,
+    django_capture_on_commit_callbacks,
+):
+    client.force_login(make_user("voter"))
+    data = vote(client, suchar, "funny", django_capture_on_commit_callbacks)
+    assert data["funny_count"] == 1
+    assert Vote.objects.filter(suchar=suchar, is_funny=True).exists()
+    assert stored_tallies(suchar) == (0, 0, 0)
+
+    data = vote(client, suchar, "dry", django_capture_on_commit_callbacks)
+    assert (data["funny_count"], data["dry_count"]) == (1, 1)
+    response = client.get(reverse("suchary:list"))
+    shown = response.context["suchary"][0]
+    assert (shown.funny_count, shown.dry_count, shown.score) == (1, 1, 1)
+
+    assert vote_buffer.flush() == 1
+    assert stored_tallies(suchar) == (1, 1, 1)
+    assert SucharRank.objects.get(suchar=suchar).hot_score == pytest.approx(
+        ranking.score(suchar),
+    )
+    assert vote_buffer.pending([suchar.pk]) == {}
+    assert vote_buffer.flush() == 0
+
+
+@pytest.mark.django_db
+def test_votes_taken_back_before_a_flush_write_nothing(
+    client,
+    redis,
+    suchar,
+    django_capture_on_commit_callbacks,
+):
+    client.force_login(make_user("voter"))
+    vote(client, suchar, "funny", django_capture_on_commit_callbacks)
+    data = vote(client, suchar, "funny", django_capture_on_commit_callbacks)
+    assert data["funny_count"] == 0
+    assert not Vote.objects.exists()
+
+    assert vote_buffer.flush() == 0
+    assert stored_tallies(suchar) == (0, 0, 0)
+
+
+@pytest.mark.django_db
+def test_failed_flush_puts_the_deltas_back(
+    client,
+    redis,
+    suchar,
+    django_capture_on_commit_callbacks,
+):
+    client.force_login(make_user("voter"))
+    vote(client, suchar, "funny", django_capture_on_commit_callbacks)
+
+    with (
+        patch.object(vote_buffer, "_write", side_effect=DatabaseError),
+        pytest.raises(DatabaseError),
+    ):
+        vote_buffer.flush()
+    assert vote_buffer.pending([suchar.pk]) == {suchar.pk: (1, 0, 1)}
+    assert not redis.hashes.get(vote_buffer.IN_FLIGHT_KEY.format(suchar.pk))
+
+    assert vote_buffer.flush() == 1
+    assert stored_tallies(suchar) == (1, 0, 1)
+
+
+@pytest.mark.django_db
+def test_flush_writes_every_batch(redis, suchar, monkeypatch):
+    monkeypatch.setattr(vote_buffer, "BATCH_SIZE", 2)
+    others = [
+        Suchar.objects.create(text=f"Joke {i}", author=suchar.author) for i in range(3)
+    ]
+    for each in [suchar, *others]:
+        vote_buffer.add(each.pk, dry=1, votes=1)
+
+    assert vote_buffer.flush() == 4  # noqa: PLR2004
+    assert all(stored_tallies(each) == (0, 1, 1) for each in [suchar, *others])
+
+
+@pytest.mark.django_db
+def test_deltas_being_written_still_count_as_pending(redis, suchar):
+    vote_buffer.add(suchar.pk, funny=1, votes=1)
+    seen = []
+
+    def write(taken):
+        seen.append(vote_buffer.pending([suchar.pk]))
+        vote_buffer.add(suchar.pk, dry=1, votes=1)  # a vote landing meanwhile
+
+    with patch.object(vote_buffer, "_write", side_effect=write):
+        assert vote_buffer.flush() == 1
+    assert seen == [{suchar.pk: (1, 0, 1)}]
+    assert vote_buffer.pending([suchar.pk]) == {suchar.pk: (0, 1, 1)}
+
+
+@pytest.mark.django_db
+def test_flush_waits_out_a_held_lease(redis, suchar):
+    vote_buffer.add(suchar.pk, funny=1, votes=1)
+    with vote_buffer.paused():
+        assert vote_buffer.flush() == 0
+    assert stored_tallies(suchar) == (0, 0, 0)
+
+    assert vote_buffer.flush() == 1
+    assert stored_tallies(suchar) == (1, 0, 1)
+
+
+@pytest.mark.django_db
+def test_flush_leaves_a_suchar_still_in_flight_for_the_next_run(redis, suchar):
+    redis.hincrby(vote_buffer.IN_FLIGHT_KEY.format(suchar.pk), "funny", 1)
+    vote_buffer.add(suchar.pk, dry=1, votes=1)
+
+    assert vote_buffer.flush() == 0
+    assert vote_buffer.pending([suchar.pk]) == {suchar.pk: (1, 1, 1)}
+    assert redis.sets[vote_buffer.DIRTY_KEY] == {str(suchar.pk).encode()}
+
+
+@pytest.mark.django_db
+def test_reconcile_skips_suchary_with_deltas_in_flight(redis, suchar):
+    Vote.objects.create(suchar=suchar, user=make_user("voter"), is_funny=True)
+    # The vote's deltas taken by a flush that hasn't committed yet.
+    Suchar.objects.filter(pk=suchar.pk).update(funny_count=0, score=0)
+    redis.hincrby(vote_buffer.IN_FLIGHT_KEY.format(suchar.pk), "funny", 1)
+
+    call_command("reconcile_vote_counts", stdout=io.StringIO())
+    assert stored_tallies(suchar)[:2] == (0, 0)
+
+
+@pytest.mark.django_db
+def test_reconcile_skips_a_vote_committed_before_its_deltas_are_added(
+    client,
+    redis,
+    suchar,
+    django_capture_on_commit_callbacks,
+):
+    client.force_login(make_user("voter"))
+    with django_capture_on_commit_callbacks() as callbacks:
+        client.post(
+            f"/api/suchary/{suchar.pk}/vote",
+            data=json.dumps({"vote_type": "funny"}),
+            content_type="application/json",
+        )
+
+    call_command("reconcile_vote_counts", stdout=io.StringIO())
+    for callback in callbacks:
+        callback()
+
+    assert vote_buffer.flush() == 1
+    assert stored_tallies(suchar) == (1, 0, 1)
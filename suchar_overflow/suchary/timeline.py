@@ -0,0 +1,95 @@
+"""When the next scheduled suchar goes public.
+
+Suchary with a future ``published_at`` stay hidden until then, so a cached
+page of published suchary is valid only up to the earliest pending
+publication. ``next_publication`` keeps that moment in the cache: it is
+forgotten whenever a suchar is created, edited or deleted (see
+``signals.py``) and recomputed, with one index lookup, once it has passed.
+``list_cache`` expires its entries at it.
+
+``tick`` runs every minute from the scheduler (``AchievementsConfig``). When
+suchary went public since the previous tick it retires the cached list and
+warms the first pages they appear on, so the first visitors after a
+publication don't all rebuild the same pages at once.
+"""
+
+import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Suchar
+from .models import Tag
+
+NEXT_KEY = "suchary:next_publication"
+TICK_KEY = "suchary:published_until"
+TICK_SECONDS = 60
+# Cached when nothing is scheduled, as ``None`` reads as a miss.
+_NOTHING = ""
+
+
+def next_publication(now: datetime.datetime | None = None, *, cached=None):
+    """Return the earliest ``published_at`` after ``now``, or None.
+
+    ``cached`` is the value of ``NEXT_KEY`` for a caller that has already
+    read it along with other keys.
+    """
+    now = now or timezone.now()
+    upcoming = cache.get(NEXT_KEY) if cached is None else cached
+    if upcoming == _NOTHING:
+        return None
+    if upcoming is not None and upcoming > now:
+        return upcoming
+    upcoming = Suchar.objects.filter(published_at__gt=now).aggregate(
+        next=Min("published_at"),
+    )["next"]
+    cache.set(NEXT_KEY, _NOTHING if upcoming is None else upcoming, timeout=None)
+    return upcoming
+
+
+def invalidate() -> None:
+    """Forget the next publication, after a suchar was saved or deleted.
+
+    Forgotten immediately and again on commit, so a value recomputed in
+    between from the old rows doesn't outlive the change.
+    """
+
+    def _forget():
+        cache.delete(NEXT_KEY)
+
+    _forget()
+    transaction.on_commit(_forget)
+
+
+def tick() -> int:
+    """Retire and warm the list pages of suchary published since the last tick.
+
+    Warms the default and "top" first pages and the first page of each
+    author and tag of those suchary. Returns how many suchary went public.
+    """
+    # list_cache reads this module, and the views read list_cache.
+    from . import list_cache  # noqa: PLC0415
+    from .views import warm_list_page  # noqa: PLC0415
+
+    now = timezone.now()
+    since = cache.get(TICK_KEY) or now - datetime.timedelta(seconds=TICK_SECONDS)
+    cache.set(TICK_KEY, now, timeout=None)
+
+    published = Suchar.objects.filter(published_at__gt=since, published_at__lte=now)
+    authors = set(published.values_list("author__username", flat=True))
+    if not authors:
+        return 0
+    count = published.count()
+    slugs = set(
+        Tag.objects.filter(suchary__in=published).values_list("slug", flat=True),
+    )
+
+    list_cache.invalidate()
+    pages = [{}, {"sort": "top"}]
+    pages += [{"author": username} for username in sorted(authors)]
+    pages += [{"tag": slug} for slug in sorted(slugs)]
+    for params in pages:
+        warm_list_page(params)
+    return count
@@ -1,98 +1,150 @@
+from functools import partial
+
 from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth.models import AnonymousUser
 from django.core.paginator import InvalidPage
 from django.core.paginator import Paginator
-from django.db.models import Count
-from django.db.models import OuterRef
-from django.db.models import Q
-from django.db.models import Subquery
 from django.http import Http404
+from django.http import HttpRequest
+from django.http import QueryDict
 from django.shortcuts import redirect
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.urls import reverse_lazy
-from django.utils import timezone
+from django.utils import translation
 from django.utils.translation import gettext
 from django.views import View
 
+from suchar_overflow import conditional
+from suchar_overflow.achievements import outbox
 from suchar_overflow.users.mixins import AsyncLoginRequiredMixin
 from suchar_overflow.users.mixins import AsyncUserPassesTestMixin
 
+from . import feed
+from . import list_cache
+from . import pagination
+from . import vote_buffer
+from . import votes
 from .forms import SucharForm
 from .models import Suchar
-from .models import Vote
 
 _PER_PAGE = 10
+# Pages reachable by number; deeper ones are browsed by cursor.
+_SHALLOW_PAGES = 5
+# Parts of the list page rendered apart, so anonymous pages can be cached.
+_FRAGMENTS = {
+    "list_cards": "suchary/_suchar_cards.html",
+    "list_pagination": "suchary/_suchar_pagination.html",
+}
 
 
 class SucharListView(View):
     template_name = "suchary/suchar_list.html"
 
     async def get(self, request, *args, **kwargs):
-        qs = (
-            Suchar.objects.select_related("author")
-            .prefetch_related("tags")
-            .filter(published_at__lte=timezone.now())
-            .annotate(
-                funny_count=Count("votes", filter=Q(votes__is_funny=True)),
-                dry_count=Count("votes", filter=Q(votes__is_dry=True)),
-            )
-        )
-
         user = await request.auser()
-        if user.is_authenticated:
-            qs = qs.annotate(
-                user_is_funny=Subquery(
-                    Vote.objects.filter(
-                        suchar=OuterRef("pk"),
-                        user=user,
-                    ).values("is_funny")[:1],
-                ),
-                user_is_dry=Subquery(
-                    Vote.objects.filter(
-                        suchar=OuterRef("pk"),
-                        user=user,
-                    ).values("is_dry")[:1],
-                ),
-            )
 
+        def _build():
+            fragments = self.get_fragments(request, user)
+            return render(request, self.template_name, fragments)
+
+        return await sync_to_async(conditional.respond)(request, user, _build)
+
+    def get_fragments(self, request, user):
+        """Return the rendered ``_FRAGMENTS``, cached for anonymous visitors."""
+        key = None
+        if not user.is_authenticated:
+            key = list_cache.key_for(request.GET, max_page=_SHALLOW_PAGES)
+        if key is None:
+            return self._build_fragments(request, user)
+        return list_cache.get_or_build(
+            key,
+            partial(self._build_fragments, request, user),
+        )
+
+    def _build_fragments(self, request, user):
         sort = request.GET.get("sort")
-        if sort == "top":
-            qs = qs.order_by("-funny_count", "-dry_count", "-created_at")
+        q = request.GET.get("q")
+        ranked = feed.is_ranked(q, sort)
+        qs = feed.queryset(
+            sort=sort,
+            q=q,
+            tag=request.GET.get("tag"),
+            author=request.GET.get("author"),
+        )
+
+        cursor = request.GET.get("cursor")
+        if cursor and not ranked:
+            context = self._cursor_context(qs, sort, cursor)
         else:
-            qs = qs.order_by("-created_at")
+            page_number = request.GET.get("page", 1)
+            context = self._page_context(qs, sort, page_number, keyset=not ranked)
+        # The page's IDs are known now: one IN query for the user's votes.
+        votes.attach_user_votes(context["suchary"], user)
+        vote_buffer.apply_pending(context["suchary"])
+        return {
+            name: render_to_string(template, context, request)
+            for name, template in _FRAGMENTS.items()
+        }
+
+    @staticmethod
+    def _page_context(qs, sort, page_number, *, keyset):
+        paginator = Paginator(qs, per_page=_PER_PAGE)
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise Http404 from exc
+        # Numbered links only cover the first pages; past them "Next"
+        # switches to a cursor, which costs no COUNT or OFFSET. Relevance has
+        # no stable key to resume from, so searches keep their page numbers.
+        # The feed cursor lets the infinite scroll (project.js) load the
+        # following pages from the JSON feed.
+        feed_cursor = None
+        if keyset and page.has_next():
+            feed_cursor = pagination.encode(sort, page[-1])
+        next_cursor = feed_cursor if page.number >= _SHALLOW_PAGES else None
+        # Evaluated once here, so the user's votes attach to the rendered rows.
+        page.object_list = list(page.object_list)
+        return {
+            "page_obj": page,
+            "suchary": page.object_list,
+            "paginator": paginator,
+            "page_range": range(1, min(paginator.num_pages, _SHALLOW_PAGES) + 1),
+            "next_cursor": next_cursor,
+            "feed_cursor": feed_cursor,
+            "is_paginated": page.has_other_pages(),
+        }
+
+    @staticmethod
+    def _cursor_context(qs, sort, cursor):
+        try:
+            page = pagination.paginate(qs, sort, cursor, _PER_PAGE)
+        except pagination.InvalidCursorError as exc:
+            raise Http404 from exc
+        return {
+            "cursor_page": page,
+            "suchary": page.object_list,
+            "feed_cursor": page.next_cursor,
+            "is_paginated": True,
+        }
 
-        q = request.GET.get("q")
-        if q:
-            qs = qs.filter(Q(text__icontains=q) | Q(tags__name__icontains=q)).distinct()
-
-        tag = request.GET.get("tag")
-        if tag:
-            qs = qs.filter(tags__slug=tag)
-
-        author = request.GET.get("author")
-        if author:
-            qs = qs.filter(author__username=author)
-
-        page_number = request.GET.get("page", 1)
-
-        def _paginate_and_render():
-            paginator = Paginator(qs, per_page=_PER_PAGE)
-            try:
-                page = paginator.page(page_number)
-            except InvalidPage as exc:
-                raise Http404 from exc
-            return render(
-                request,
-                self.template_name,
-                {
-                    "page_obj": page,
-                    "suchary": page.object_list,
-                    "paginator": paginator,
-                    "is_paginated": page.has_other_pages(),
-                },
-            )
 
-        return await sync_to_async(_paginate_and_render)()
+def warm_list_page(params) -> None:
+    """Rebuild the cached anonymous list page for the query ``params``.
+
+    Used by ``timeline.tick`` outside of any request, in the site language.
+    """
+    request = HttpRequest()
+    request.method = "GET"
+    request.path = request.path_info = reverse("suchary:list")
+    request.GET = QueryDict(mutable=True)
+    request.GET.update(params)
+    request.user = AnonymousUser()
+    with translation.override(settings.LANGUAGE_CODE):
+        SucharListView().get_fragments(request, request.user)
 
 
 class SucharCreateView(AsyncLoginRequiredMixin):
@@ -121,7 +173,8 @@ class SucharCreateView(AsyncLoginRequiredMixin):
             suchar.save()
             form.save_m2m()
 
-        await sync_to_async(_save)()
+        async with outbox.adeferred():
+            await sync_to_async(_save)()
         messages.success(request, gettext("Your suchar has been posted."))
         return redirect(self.success_url)
 
@@ -0,0 +1,312 @@
+"""Write-behind vote tallies in Redis, for the ``SUCHARY_VOTE_BUFFER`` mode.
+
+Every vote on a suchar updates its row, so while a joke goes viral its
+voters queue on that row's lock. With the buffer on, ``votes.toggle`` still
+writes the vote itself in the request, but the suchar's tally deltas are
+added to a Redis hash (``HINCRBY``) once the vote commits instead. ``flush``,
+run every ``FLUSH_INTERVAL`` by the scheduler, moves the pending deltas to
+their suchary and hot scores in batches of ``BATCH_SIZE``, one UPDATE each.
+
+Pages and the API add the deltas still pending to the tallies they show
+(``apply_pending``), so shown counts stay exact. Orderings and sums over
+the stored tallies (the top sort, the leaderboard, profile totals and the
+achievement rules reading them) catch up at the next flush.
+
+A flush holds a lease (``LEASE_KEY``), so one runs at a time across the
+processes. It moves each suchar's pending hash to an in-flight one
+(``RENAMENX``), writes those deltas and deletes them once committed, and
+``pending`` counts the in-flight deltas too, so they never drop out of the
+shown tallies meanwhile. ``reconcile_vote_counts`` checks its batches under
+the same lease (``paused``) and skips the ``unsettled`` suchary: those with
+deltas waiting or in flight, and those voted on in the last
+``RECENT_SECONDS``, whose committed votes may not have their deltas added
+yet. So it can't recount votes a flush is about to add again.
+
+The votes stay the record: should Redis lose pending deltas, or a flush
+die between taking them and committing (its in-flight hashes and lease
+expire after ``LEASE_SECONDS``), ``reconcile_vote_counts`` recounts the
+tallies from the votes.
+"""
+
+import time
+import uuid
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from . import list_cache
+from . import ranking
+
+FLUSH_INTERVAL = 5  # seconds
+BATCH_SIZE = 500
+# Hash of the pending "funny", "dry" and "votes" deltas of one suchar.
+PENDING_KEY = "suchary:pending_votes:{}"
+# Set of the suchary with pending deltas.
+DIRTY_KEY = "suchary:pending_votes"
+# The deltas of one suchar a flush has taken but not committed yet.
+IN_FLIGHT_KEY = "suchary:pending_votes:in_flight:{}"
+# Held by the flush running, or by a reconcile batch.
+LEASE_KEY = "suchary:pending_votes:lease"
+LEASE_SECONDS = 60
+# Set by ``record`` before the vote commits, so reconcile leaves the suchar
+# alone until its deltas have been added.
+RECENT_KEY = "suchary:pending_votes:recent:{}"
+RECENT_SECONDS = 30
+FIELDS = ("funny", "dry", "votes")
+
+_FLUSH_SQL = """
+UPDATE suchary_suchar AS s
+SET funny_count = s.funny_count + d.funny,
+    dry_count = s.dry_count + d.dry,
+    score = s.score + d.votes
+FROM unnest(%(suchar_ids)s::bigint[], %(funny)s::integer[], %(dry)s::integer[],
+        %(votes)s::integer[]) AS d (suchar_id, funny, dry, votes)
+WHERE s.id = d.suchar_id
+"""
+
+
+def enabled() -> bool:
+    return settings.SUCHARY_VOTE_BUFFER
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _key(suchar_id: int) -> str:
+    return PENDING_KEY.format(suchar_id)
+
+
+def _in_flight_key(suchar_id: int) -> str:
+    return IN_FLIGHT_KEY.format(suchar_id)
+
+
+def _recent_key(suchar_id: int) -> str:
+    return RECENT_KEY.format(suchar_id)
+
+
+def _deltas(row: dict) -> tuple[int, int, int]:
+    return tuple(int(row.get(field.encode(), 0)) for field in FIELDS)
+
+
+def add(suchar_id: int, *, funny: int = 0, dry: int = 0, votes: int = 0) -> None:
+    """Add tally deltas to a suchar's pending ones."""
+    deltas = dict(zip(FIELDS, (funny, dry, votes), strict=True))
+    with _redis().pipeline() as pipe:
+        for field, delta in deltas.items():
+            if delta:
+                pipe.hincrby(_key(suchar_id), field, delta)
+        pipe.sadd(DIRTY_KEY, suchar_id)
+        pipe.execute()
+
+
+def pending(suchar_ids) -> dict[int, tuple[int, int, int]]:
+    """Return ``{suchar_id: (funny, dry, votes)}`` of the deltas not flushed yet.
+
+    Deltas a flush is writing count until it commits. Suchary without
+    pending deltas are left out.
+    """
+    suchar_ids = list(suchar_ids)
+    if not suchar_ids:
+        return {}
+    with _redis().pipeline() as pipe:
+        for suchar_id in suchar_ids:
+            pipe.hgetall(_key(suchar_id))
+            pipe.hgetall(_in_flight_key(suchar_id))
+        rows = pipe.execute()
+    return {
+        suchar_id: tuple(
+            a + b for a, b in zip(_deltas(waiting), _deltas(in_flight), strict=True)
+        )
+        for suchar_id, waiting, in_flight in zip(
+            suchar_ids,
+            rows[::2],
+            rows[1::2],
+            strict=True,
+        )
+        if waiting or in_flight
+    }
+
+
+def unsettled(suchar_ids) -> set[int]:
+    """The suchary of ``suchar_ids`` whose stored tallies are still to move.
+
+    Those with deltas waiting or in flight, and those voted on in the last
+    ``RECENT_SECONDS``.
+    """
+    suchar_ids = list(suchar_ids)
+    with _redis().pipeline(transaction=False) as pipe:
+        for suchar_id in suchar_ids:
+            pipe.exists(
+                _key(suchar_id),
+                _in_flight_key(suchar_id),
+                _recent_key(suchar_id),
+            )
+        found = pipe.execute()
+    return {
+        suchar_id for suchar_id, keys in zip(suchar_ids, found, strict=True) if keys
+    }
+
+
+def record(suchar_id: int, *, funny: int = 0, dry: int = 0, votes: int = 0):
+    """Buffer a vote's tally deltas once the current transaction commits.
+
+    Returns the suchar's pending deltas including these ones, which the
+    voter is shown along with the stored tallies.
+    """
+    # Between the commit and ``add`` the vote is in the table but its deltas
+    # are nowhere, so the suchar is marked unsettled before the commit. The
+    # mark expires instead of being cleared, as other votes may be in the gap.
+    _redis().set(_recent_key(suchar_id), "1", ex=RECENT_SECONDS)
+    current = pending([suchar_id]).get(suchar_id, (0, 0, 0))
+    transaction.on_commit(
+        partial(add, suchar_id, funny=funny, dry=dry, votes=votes),
+    )
+    return tuple(a + b for a, b in zip(current, (funny, dry, votes), strict=True))
+
+
+def apply_pending(suchary):
+    """Add the pending deltas to the tallies of each of ``suchary``.
+
+    Call it once the page's cursors are encoded, as they must hold the
+    stored tallies the database orders by. Returns ``suchary`` as a list.
+    """
+    suchary = list(suchary)
+    if not enabled() or not suchary:
+        return suchary
+    deltas = pending(suchar.pk for suchar in suchary)
+    for suchar in suchary:
+        funny, dry, votes = deltas.get(suchar.pk, (0, 0, 0))
+        suchar.funny_count += funny
+        suchar.dry_count += dry
+        suchar.score += votes
+    return suchary
+
+
+@contextmanager
+def lease(*, wait: bool = False):
+    """Hold the flush lease for the block; yield whether it was acquired.
+
+    With ``wait``, wait for the holder to finish, at most ``LEASE_SECONDS``
+    as its lease expires by then.
+    """
+    client = _redis()
+    token = uuid.uuid4().hex
+    while not (held := client.set(LEASE_KEY, token, nx=True, ex=LEASE_SECONDS)):
+        if not wait:
+            break
+        time.sleep(0.05)
+    try:
+        yield bool(held)
+    finally:
+        if held and client.get(LEASE_KEY) == token.encode():
+            client.delete(LEASE_KEY)
+
+
+@contextmanager
+def paused():
+    """Hold off flushes for the block, so stored tallies and deltas keep still."""
+    with lease(wait=True):
+        yield
+
+
+def _take(client, suchar_ids) -> dict[int, tuple[int, int, int]]:
+    """Move the pending deltas of ``suchar_ids`` in flight and return them.
+
+    A suchar still in flight from a flush that outlived its lease keeps
+    its pending deltas, and is marked dirty again for the next run.
+    """
+    with client.pipeline(transaction=False) as pipe:
+        for suchar_id in suchar_ids:
+            pipe.exists(_key(suchar_id))
+        suchar_ids = [
+            suchar_id
+            for suchar_id, found in zip(suchar_ids, pipe.execute(), strict=True)
+            if found
+        ]
+    with client.pipeline() as pipe:
+        for suchar_id in suchar_ids:
+            pipe.renamenx(_key(suchar_id), _in_flight_key(suchar_id))
+            pipe.expire(_in_flight_key(suchar_id), LEASE_SECONDS)
+        moved = dict(zip(suchar_ids, pipe.execute()[::2], strict=True))
+    if busy := [suchar_id for suchar_id, done in moved.items() if not done]:
+        client.sadd(DIRTY_KEY, *busy)
+    taken = [suchar_id for suchar_id, done in moved.items() if done]
+    with client.pipeline(transaction=False) as pipe:
+        for suchar_id in taken:
+            pipe.hgetall(_in_flight_key(suchar_id))
+        rows = pipe.execute()
+    return {suchar_id: _deltas(row) for suchar_id, row in zip(taken, rows, strict=True)}
+
+
+def _land(client, taken, *, restore: bool) -> None:
+    """Drop the in-flight deltas of ``taken``, back into the pending ones
+    with ``restore``, in one transaction.
+    """
+    with client.pipeline() as pipe:
+        for suchar_id, deltas in taken.items():
+            if restore and any(deltas):
+                for field, delta in zip(FIELDS, deltas, strict=True):
+                    if delta:
+                        pipe.hincrby(_key(suchar_id), field, delta)
+                pipe.sadd(DIRTY_KEY, suchar_id)
+            pipe.delete(_in_flight_key(suchar_id))
+        pipe.execute()
+
+
+def _write(taken: dict[int, tuple[int, int, int]]) -> None:
+    funny, dry, votes = (list(column) for column in zip(*taken.values(), strict=True))
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _FLUSH_SQL,
+                {
+                    "suchar_ids": list(taken),
+                    "funny": funny,
+                    "dry": dry,
+                    "votes": votes,
+                },
+            )
+        ranking.rescore(
+            suchar_id for suchar_id, (funny, dry, _) in taken.items() if funny or dry
+        )
+
+
+def _flush_batch(client) -> tuple[int, int]:
+    """Write one batch; return the number of suchary taken and written."""
+    suchar_ids = [int(suchar_id) for suchar_id in client.spop(DIRTY_KEY, BATCH_SIZE)]
+    taken = _take(client, suchar_ids) if suchar_ids else {}
+    changed = {suchar_id: deltas for suchar_id, deltas in taken.items() if any(deltas)}
+    try:
+        if changed:
+            _write(changed)
+    except Exception:
+        _land(client, taken, restore=True)
+        raise
+    if taken:
+        _land(client, taken, restore=False)
+    return len(suchar_ids), len(changed)
+
+
+def flush() -> int:
+    """Write the pending deltas to the database; return the suchar count.
+
+    Each batch's deltas are moved in flight first, so votes landing
+    meanwhile start new ones. If the UPDATE fails they are put back for the
+    next run. Returns 0 at once while another flush holds the lease.
+    """
+    client = _redis()
+    written = 0
+    with lease() as held:
+        taken = BATCH_SIZE if held else 0
+        while taken == BATCH_SIZE:
+            taken, batch_written = _flush_batch(client)
+            written += batch_written
+    if written:
+        # The stored tallies order the top sort and the leaderboard.
+        list_cache.invalidate()
+    return written
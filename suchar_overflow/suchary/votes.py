@@ -0,0 +1,200 @@
+"""Toggling a user's vote on a suchar in one or two SQL statements.
+
+A click flips one flag of the (suchar, user) vote. The flip is an
+``INSERT ... ON CONFLICT DO UPDATE`` whose result feeds the ``UPDATE`` of the
+suchar's tallies and, from the new tallies, of its hot score (see
+``ranking.py``) in the same statement, returning the new counts; a vote
+left with neither flag set is removed by a second ``DELETE``. Both run in
+one transaction and the upsert keeps the vote row locked until it commits,
+so concurrent clicks on the same vote are applied one after another instead
+of racing on the unique constraint.
+
+The statements bypass the model signals, so ``vote_toggled`` is sent with the
+whole change for the receivers that keep metrics and achievements up to date.
+
+With ``SUCHARY_VOTE_BUFFER`` on, the upsert only reads the suchar's stored
+tallies, and the tally and hot score changes are buffered in Redis by
+``vote_buffer`` instead, so concurrent voters don't queue on the suchar row.
+"""
+
+from dataclasses import dataclass
+
+from django.db import IntegrityError
+from django.db import connection
+from django.db import transaction
+
+from . import ranking
+from . import vote_buffer
+from .models import Suchar
+from .models import Vote
+from .signals import vote_toggled
+
+FLAGS = {"funny": "is_funny", "dry": "is_dry"}
+
+# ``v.is_funny <> EXCLUDED.is_funny`` is an XOR with the inserted row, which
+# sets only the clicked flag: the clicked one flips, the other is kept.
+# ``xmax = 0`` holds only for a row this statement inserted.
+_TOGGLE_SQL = """
+WITH toggled AS (
+    INSERT INTO suchary_vote AS v (suchar_id, user_id, is_funny, is_dry)
+    VALUES (%(suchar_id)s, %(user_id)s, %(funny)s, %(dry)s)
+    ON CONFLICT (suchar_id, user_id) DO UPDATE
+    SET is_funny = v.is_funny <> EXCLUDED.is_funny,
+        is_dry = v.is_dry <> EXCLUDED.is_dry
+    RETURNING v.id, v.is_funny, v.is_dry, v.xmax = 0 AS created
+),
+counted AS (
+    UPDATE suchary_suchar AS s
+    SET funny_count = s.funny_count
+            + CASE WHEN %(funny)s THEN CASE WHEN t.is_funny THEN 1 ELSE -1 END
+              ELSE 0 END,
+        dry_count = s.dry_count
+            + CASE WHEN %(dry)s THEN CASE WHEN t.is_dry THEN 1 ELSE -1 END
+              ELSE 0 END,
+        score = s.score
+            + CASE WHEN t.created THEN 1
+              WHEN NOT (t.is_funny OR t.is_dry) THEN -1
+              ELSE 0 END
+    FROM toggled AS t
+    WHERE s.id = %(suchar_id)s
+    RETURNING s.author_id, s.funny_count, s.dry_count, s.published_at
+),
+ranked AS (
+    UPDATE suchary_sucharrank AS r
+    SET hot_score = log(1 + c.funny_count * %(funny_weight)s
+            + c.dry_count * %(dry_weight)s)
+        + extract(epoch FROM c.published_at - %(epoch)s)::double precision
+            / %(tenfold)s
+    FROM counted AS c
+    WHERE r.suchar_id = %(suchar_id)s
+)
+SELECT t.id, t.is_funny, t.is_dry, t.created, c.author_id,
+    c.funny_count, c.dry_count
+FROM toggled AS t, counted AS c
+"""
+
+# The same upsert, for the buffered mode: the suchar row is read, not locked.
+_RECORD_SQL = """
+WITH toggled AS (
+    INSERT INTO suchary_vote AS v (suchar_id, user_id, is_funny, is_dry)
+    VALUES (%(suchar_id)s, %(user_id)s, %(funny)s, %(dry)s)
+    ON CONFLICT (suchar_id, user_id) DO UPDATE
+    SET is_funny = v.is_funny <> EXCLUDED.is_funny,
+        is_dry = v.is_dry <> EXCLUDED.is_dry
+    RETURNING v.id, v.is_funny, v.is_dry, v.xmax = 0 AS created
+)
+SELECT t.id, t.is_funny, t.is_dry, t.created, s.author_id,
+    s.funny_count, s.dry_count
+FROM toggled AS t
+JOIN suchary_suchar AS s ON s.id = %(suchar_id)s
+"""
+
+_DELETE_SQL = "DELETE FROM suchary_vote WHERE id = %s AND NOT is_funny AND NOT is_dry"
+
+
+@dataclass(frozen=True)
+class VoteToggle:
+    vote: Vote
+    author_id: int
+    created: bool
+    deleted: bool
+    funny_delta: int
+    dry_delta: int
+    funny_count: int
+    dry_count: int
+
+
+def toggle(user, suchar_id: int, vote_type: str) -> VoteToggle:
+    """Flip ``user``'s ``vote_type`` flag on the suchar and return the result.
+
+    Raises ``Suchar.DoesNotExist`` when there is no such suchar.
+    """
+    flag = FLAGS[vote_type]
+    buffered = vote_buffer.enabled()
+    params = ranking.params(
+        suchar_id=suchar_id,
+        user_id=user.pk,
+        funny=flag == "is_funny",
+        dry=flag == "is_dry",
+    )
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(_RECORD_SQL if buffered else _TOGGLE_SQL, params)
+            row = cursor.fetchone()
+            if row is None:
+                # No such suchar. Django's foreign keys are checked at
+                # commit, so the orphan vote is rolled back with the block.
+                raise Suchar.DoesNotExist
+            vote_id, is_funny, is_dry, created, author_id, funny, dry = row
+            deleted = not (is_funny or is_dry)
+            if deleted:
+                cursor.execute(_DELETE_SQL, [vote_id])
+    except IntegrityError as e:
+        # The suchar was deleted before the deferred foreign key check.
+        raise Suchar.DoesNotExist from e
+
+    vote = Vote(
+        pk=None if deleted else vote_id,
+        suchar_id=suchar_id,
+        user=user,
+        is_funny=is_funny,
+        is_dry=is_dry,
+    )
+    value = getattr(vote, flag)
+    delta = 1 if value else -1
+    funny_delta = delta if flag == "is_funny" else 0
+    dry_delta = delta if flag == "is_dry" else 0
+    if buffered:
+        funny_pending, dry_pending, _ = vote_buffer.record(
+            suchar_id,
+            funny=funny_delta,
+            dry=dry_delta,
+            votes=int(created) - int(deleted),
+        )
+        funny += funny_pending
+        dry += dry_pending
+    result = VoteToggle(
+        vote=vote,
+        author_id=author_id,
+        created=created,
+        deleted=deleted,
+        funny_delta=funny_delta,
+        dry_delta=dry_delta,
+        funny_count=funny,
+        dry_count=dry,
+    )
+    vote_toggled.send(
+        sender=Vote,
+        vote=vote,
+        author_id=author_id,
+        created=created,
+        deleted=deleted,
+        funny_delta=result.funny_delta,
+        dry_delta=result.dry_delta,
+        funny_count=funny,
+        dry_count=dry,
+    )
+    return result
+
+
+def attach_user_votes(suchary, user):
+    """Set ``user_is_funny`` and ``user_is_dry`` on each of ``suchary``.
+
+    The flags of ``user``'s votes on exactly those suchary are loaded in one
+    ``IN`` query, so any page or card list of suchary can show the vote
+    buttons' state. Anonymous users have no votes and get no attributes.
+    Returns ``suchary`` as a list.
+    """
+    suchary = list(suchary)
+    if not user.is_authenticated or not suchary:
+        return suchary
+    flags = {
+        suchar_id: (is_funny, is_dry)
+        for suchar_id, is_funny, is_dry in Vote.objects.filter(
+            user=user,
+            suchar_id__in=[suchar.pk for suchar in suchary],
+        ).values_list("suchar_id", "is_funny", "is_dry")
+    }
+    for suchar in suchary:
+        suchar.user_is_funny, suchar.user_is_dry = flags.get(suchar.pk, (False, False))
+    return suchary
@@ -3,7 +3,7 @@ import datetime
 from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.db.models import Count
-from django.db.models import Q
+from django.db.models import Sum
 from django.db.models.functions import TruncDay
 from django.forms import modelform_factory
 from django.shortcuts import get_object_or_404
@@ -17,6 +17,7 @@ from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.views import View
 
+from suchar_overflow import conditional
 from suchar_overflow.users.mixins import AsyncLoginRequiredMixin
 from suchar_overflow.users.models import User
 
@@ -37,23 +38,30 @@ class UserDetailView(AsyncLoginRequiredMixin):
             current_user = await request.auser()
         else:
             current_user = request.user
-        context = await sync_to_async(self._build_context)(user, current_user == user)
-        context["object"] = user
-        return await sync_to_async(render)(request, self.template_name, context)
+
+        def _build():
+            context = self._build_context(user, current_user == user)
+            context["object"] = user
+            return render(request, self.template_name, context)
+
+        # The charts count suchary by day, so the page also changes at midnight.
+        return await sync_to_async(conditional.respond)(
+            request,
+            current_user,
+            _build,
+            users=[user.pk],
+            extra=[timezone.localdate().isoformat()],
+        )
 
     def _build_context(self, user, is_owner):
         context = {}
 
         # 1. Latest Suchary
-        context["latest_suchary"] = (
-            user.suchary.filter(published_at__lte=timezone.now())
-            .annotate(
-                score=Count("votes"),
-                funny_count=Count("votes", filter=Q(votes__is_funny=True)),
-                dry_count=Count("votes", filter=Q(votes__is_dry=True)),
-            )
-            .order_by("-created_at")[:5]
-        )
+        context["latest_suchary"] = user.suchary.filter(
+            published_at__lte=timezone.now(),
+        ).order_by(
+            "-created_at",
+        )[:5]
 
         # 1.5 Scheduled Suchary (Owner Only)
         if is_owner:
@@ -63,10 +71,10 @@ class UserDetailView(AsyncLoginRequiredMixin):
 
         # 2. Total Score & Count
         stats = user.suchary.aggregate(
-            total_score=Count("votes"),
-            funny_score=Count("votes", filter=Q(votes__is_funny=True)),
-            dry_score=Count("votes", filter=Q(votes__is_dry=True)),
-            total_count=Count("id", distinct=True),
+            total_score=Sum("score"),
+            funny_score=Sum("funny_count"),
+            dry_score=Sum("dry_count"),
+            total_count=Count("id"),
         )
         user.total_score = stats["total_score"] or 0
         context["total_funny_score"] = stats["funny_score"] or 0
@@ -75,20 +83,17 @@ class UserDetailView(AsyncLoginRequiredMixin):
 
         # Global Rank — count users with more funny votes than this user
         higher_ranking_users = (
-            User.objects.annotate(
-                score=Count("suchary__votes", filter=Q(suchary__votes__is_funny=True)),
-            )
+            User.objects.annotate(score=Sum("suchary__funny_count"))
             .filter(score__gt=user.total_score)
             .count()
         )
         context["global_rank"] = higher_ranking_users + 1
 
         # Best Joke (highest funny count)
-        context["best_joke"] = (
-            user.suchary.annotate(score=Count("votes", filter=Q(votes__is_funny=True)))
-            .order_by("-score", "-created_at")
-            .first()
-        )
+        context["best_joke"] = user.suchary.order_by(
+            "-funny_count",
+            "-created_at",
+        ).first()
 
         # 3. Dryness Chart (Activity over last 30 days)
         last_30_days = timezone.now() - datetime.timedelta(days=30)